@@ -0,0 +1,18 @@
+"""
+ASGI config for SORT project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "SORT.settings")
+
+# Create ASGI application object
+application = get_asgi_application()
+"https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/#the-application-object"
@@ -322,6 +322,20 @@ DEMOGRAPHY_TEMPLATES = {
     "Generic": "demography_only_config_generic.json",
 }
 CONSENT_TEMPLATE = "consent_only_config.json"
+SURVEY_CONFIG_SCHEMA = BASE_DIR / "data/schemas/survey_config.schema.json"
+READINESS_DESCRIPTIONS = BASE_DIR / "data/readiness_descriptions/matrix.json"
+
+# Participant submissions are stored in a staging table and returned straight away,
+# then validated and saved in batches by the drain_responses management command.
+SURVEY_RESPONSE_SPOOL = cast_to_boolean(os.getenv("DJANGO_SURVEY_RESPONSE_SPOOL", False))
+
+# New invitation links carry a token signed with SECRET_KEY, which is checked without
+# looking up the invitation in the database.
+SURVEY_SIGNED_INVITATIONS = cast_to_boolean(os.getenv("DJANGO_SURVEY_SIGNED_INVITATIONS", False))
+
+# Store the chosen options of valid survey responses as their position in the list of
+# options, which takes much less space than the text (see survey/answers_codec.py)
+SURVEY_ENCODE_ANSWERS = cast_to_boolean(os.getenv("DJANGO_SURVEY_ENCODE_ANSWERS", False))
 
 # Crispy enables Bootstrap styling on Django forms
 # https://django-crispy-forms.readthedocs.io/en/latest/install.html
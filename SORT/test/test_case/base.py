@@ -1,3 +1,4 @@
+import django.core.cache
 import django.test
 
 from ..model_factory import SuperUserFactory, UserFactory
@@ -9,5 +10,8 @@ class SORTTestCase(django.test.TestCase):
     """
 
     def setUp(self):
+        # Cached pages and report data are keyed by primary keys, which are reused
+        # between tests
+        django.core.cache.cache.clear()
         self.user = UserFactory()
         self.superuser = SuperUserFactory()
@@ -7,6 +7,9 @@ import os
 
 bind = os.getenv('GUNICORN_BIND', "127.0.0.1:8000")
 workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Use "uvicorn_worker.UvicornWorker" to serve SORT.asgi, where each worker can wait on
+# many slow connections at once instead of one request per worker
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
 capture_output = bool(os.getenv("GUNICORN_CAPTURE_OUTPUT", True))
 loglevel = os.getenv("GUNICORN_LOGLEVEL", "INFO")
 accesslog = os.getenv("GUNICORN_ACCESSLOG")
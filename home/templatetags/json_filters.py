@@ -0,0 +1,25 @@
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+#: The same escaping as Django's json_script filter, so the JSON can't close the script element
+JSON_SCRIPT_ESCAPES = {
+    ord(">"): "\\u003E",
+    ord("<"): "\\u003C",
+    ord("&"): "\\u0026",
+}
+
+
+@register.filter(is_safe=True)
+def serialised_json_script(value: str, element_id: str):
+    """
+    Output a string that is already JSON in a script tag, like json_script does
+    for Python objects, without decoding and encoding it again.
+    """
+    return format_html(
+        '<script id="{}" type="application/json">{}</script>',
+        element_id,
+        mark_safe(value.translate(JSON_SCRIPT_ESCAPES)),
+    )
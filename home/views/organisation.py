@@ -20,6 +20,9 @@ from django.views.generic import (
     UpdateView,
 )
 
+from survey import readiness
+from survey.models import ProjectReadiness, Survey, SurveyReadiness
+
 from ..constants import ROLE_ADMIN, ROLE_PROJECT_MANAGER
 from ..forms.add_existing_member import AddExistingMemberForm
 from ..forms.invite_member import InviteMemberForm
@@ -75,10 +78,29 @@ class MyOrganisationView(LoginRequiredMixin, OrganisationRequiredMixin, ListView
                 "is_admin": user_role == ROLE_ADMIN,
                 "is_project_manager": user_role == ROLE_PROJECT_MANAGER,
                 "current_search": self.request.GET.get("q", ""),
+                "readiness_heatmap": self.get_readiness_heatmap(),
             }
         )
         return context
 
+    def get_readiness_heatmap(self) -> dict:
+        """
+        The mean readiness score of each SORT section of every project in the
+        organisation that the user can see, from the rollup tables rather than the
+        responses. The "All projects" row only counts those projects too.
+        """
+        projects = list(
+            organisation_service.get_organisation_projects(
+                organisation=self.organisation, user=self.request.user, with_metrics=False
+            ).values_list("pk", "name")
+        )
+        project_ids = [pk for pk, _ in projects]
+        SurveyReadiness.refresh_stale(Survey.objects.filter(project__in=project_ids))
+        project_means = ProjectReadiness.means_for(project_ids)
+        rows = [(name, reverse("project", args=[pk]), project_means.get(pk, {})) for pk, name in projects]
+        rows.append(("All projects", None, ProjectReadiness.combined_means(project_ids)))
+        return readiness.heatmap(rows)
+
 
 class OrganisationCreateView(LoginRequiredMixin, CreateView):
     model = Organisation
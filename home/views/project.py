@@ -6,7 +6,8 @@ from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
-from survey.models import Survey
+from survey import readiness
+from survey.models import ProjectReadiness, Survey, SurveyReadiness
 from survey.services import survey_service
 
 from ..constants import ROLE_ADMIN, ROLE_PROJECT_MANAGER
@@ -70,11 +71,25 @@ class ProjectView(LoginRequiredMixin, ListView):
                 "can_create": project_service.can_edit(user, project),
                 "current_search": self.request.GET.get("q", ""),
                 "can_edit": can_edit,
+                "readiness_heatmap": self.get_readiness_heatmap(),
             }
         )
 
         return context
 
+    def get_readiness_heatmap(self) -> dict:
+        """
+        The mean readiness score of each SORT section of every survey in the project,
+        from the rollup tables rather than the responses.
+        """
+        SurveyReadiness.refresh_stale(Survey.objects.filter(project=self.project))
+        surveys = list(Survey.objects.filter(project=self.project).order_by("-id").values_list("pk", "name"))
+        survey_means = SurveyReadiness.means_for([pk for pk, _ in surveys])
+        project_means = ProjectReadiness.means_for([self.project.pk])
+        rows = [(name, reverse("survey_report", args=[pk]), survey_means.get(pk, {})) for pk, name in surveys]
+        rows.append(("All surveys", None, project_means.get(self.project.pk, {})))
+        return readiness.heatmap(rows)
+
 
 class ProjectCreateView(LoginRequiredMixin, CreateView):
     model = Project
@@ -3,10 +3,12 @@ from django.contrib import admin
 from .models import (
     Invitation,
     Survey,
+    SurveyConfig,
     SurveyEvidenceFile,
     SurveyEvidenceSection,
     SurveyFile,
     SurveyResponse,
+    SpooledSurveyResponse,
 )
 
 
@@ -36,6 +38,28 @@ class SurveyAdmin(admin.ModelAdmin):
         "project",
         "project__organisation",
     )
+    # Changing the configuration here would skip Survey.update(), which records the
+    # change so that the responses are validated against it again
+    readonly_fields = ("config",)
+
+
+@admin.register(SurveyConfig)
+class SurveyConfigAdmin(admin.ModelAdmin):
+    list_display = ("pk", "hash", "created_at")
+    search_fields = ("hash",)
+    ordering = ("created_at",)
+
+    # Configurations are shared, identified by their contents, and used to decode
+    # encoded answers, so they're only ever stored by SurveyConfig.get_for()
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        # Encoded survey response answers can only be decoded using their configuration
+        return False
 
 
 @admin.register(SurveyResponse)
@@ -52,6 +76,13 @@ class SurveyResponseAdmin(admin.ModelAdmin):
     list_filter = ("survey__project", "survey__project__organisation", "created_at")
 
 
+@admin.register(SpooledSurveyResponse)
+class SpooledSurveyResponseAdmin(admin.ModelAdmin):
+    list_display = ("pk", "survey", "created_at", "error")
+    ordering = ("created_at",)
+    list_filter = ("survey",)
+
+
 admin.site.register(SurveyEvidenceSection)
 admin.site.register(SurveyFile)
 admin.site.register(SurveyEvidenceFile)
@@ -0,0 +1,199 @@
+"""
+Corrections to stored survey response answers, applied by the migrate_answers
+management command.
+
+Each transform is a class registered in TRANSFORMS under the name used on the
+command line. It declares its own command-line arguments, and changes one response's
+answers at a time.
+"""
+
+import copy
+from typing import Any, Type
+
+from survey.models import Survey
+
+
+class AnswerTransform:
+    """
+    A change to the answers of survey responses.
+
+    Subclasses implement ``apply``, which may change the answers in place, and raise
+    ValueError for answers they can't safely change.
+    """
+
+    #: The name of the transform on the command line
+    name: str
+    help: str
+
+    @classmethod
+    def add_arguments(cls, parser):
+        pass
+
+    def __init__(self, **options):
+        self.options = options
+
+    def __call__(self, answers: list, survey: Survey) -> list:
+        """
+        :returns: Changed answers (the original answers are left unchanged)
+        """
+        answers = copy.deepcopy(answers)
+        self.apply(answers, survey)
+        return answers
+
+    def apply(self, answers: list, survey: Survey) -> None:
+        raise NotImplementedError
+
+
+def field_position(value: str) -> tuple[int, int]:
+    """
+    Parse the position of a field, written as "<section index>.<field index>" e.g. "2.0"
+    """
+    section_index, _, field_index = value.partition(".")
+    return int(section_index), int(field_index)
+
+
+def option_mapping(value: str) -> tuple[str, str]:
+    """
+    Parse a change to an answer, written as "<old value>=<new value>"
+    """
+    old, separator, new = value.partition("=")
+    if not separator:
+        raise ValueError(f"Expected OLD=NEW, not '{value}'")
+    return old, new
+
+
+class ShiftLikert(AnswerTransform):
+    """
+    Move numeric likert answers up or down the scale e.g. from 1-5 to 0-4.
+
+    This replaces scripts/survey_response_minus_one.py.
+    """
+
+    name = "shift_likert"
+    help = "Add a number to every numeric likert answer e.g. to move from a 1-5 to a 0-4 scale"
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("--by", type=int, default=-1, help="The number to add to each answer (default: -1)")
+        parser.add_argument(
+            "--scale",
+            default="1,2,3,4,5",
+            help="Comma-separated answers to change (default: 1,2,3,4,5)",
+        )
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.scale = set(options["scale"].split(","))
+        shifted_scale = {str(int(value) + options["by"]) for value in self.scale}
+        # Answers that are only on the new scale mean that the responses were already shifted
+        self.converted = shifted_scale - self.scale
+
+    def apply(self, answers: list, survey: Survey) -> None:
+        for section in answers:
+            for field in section:
+                # Likert answers are the lists of strings
+                if not isinstance(field, list):
+                    continue
+                for index, value in enumerate(field):
+                    if value in self.scale:
+                        field[index] = str(int(value) + self.options["by"])
+                    elif value in self.converted:
+                        raise ValueError(
+                            f"unexpected '{value}' value in list-typed field - "
+                            "survey may have been converted previously"
+                        )
+
+
+class RemapOptions(AnswerTransform):
+    """
+    Rename the options chosen for one field e.g. after fixing a typo in the configuration.
+    """
+
+    name = "remap_options"
+    help = "Replace answers to one field with other values"
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("field", type=field_position, help="Field position, as SECTION.FIELD e.g. 2.0")
+        parser.add_argument("mapping", type=option_mapping, nargs="+", help="Answers to change, as OLD=NEW")
+
+    def apply(self, answers: list, survey: Survey) -> None:
+        section_index, field_index = self.options["field"]
+        mapping = dict(self.options["mapping"])
+        try:
+            answer = answers[section_index][field_index]
+        except IndexError:
+            raise ValueError(f"there is no answer at {section_index}.{field_index}")
+        if isinstance(answer, list):
+            answers[section_index][field_index] = [mapping.get(value, value) for value in answer]
+        else:
+            answers[section_index][field_index] = mapping.get(answer, answer)
+
+
+class InsertField(AnswerTransform):
+    """
+    Add a blank answer for a field that has been added to the survey configuration.
+    """
+
+    name = "insert_field"
+    help = "Insert a blank answer for a new field, at its position in the survey configuration"
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("field", type=field_position, help="Field position, as SECTION.FIELD e.g. 2.0")
+
+    def blank_answer(self, survey: Survey) -> Any:
+        section_index, field_index = self.options["field"]
+        field = survey.layout.sections[section_index].fields[field_index]
+        if field.type == "likert":
+            return ["" for _ in field.sublabels]
+        if field.type == "checkbox":
+            return list()
+        return ""
+
+    def apply(self, answers: list, survey: Survey) -> None:
+        section_index, field_index = self.options["field"]
+        section = answers[section_index]
+        if len(section) >= len(survey.layout.sections[section_index].fields):
+            raise ValueError(f"section {section_index} already has an answer for every field")
+        section.insert(field_index, self.blank_answer(survey))
+
+
+class RemoveField(AnswerTransform):
+    """
+    Delete the answers to a field that has been removed from the survey configuration.
+    """
+
+    name = "remove_field"
+    help = "Remove the answers to a field that is no longer in the survey configuration"
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("field", type=field_position, help="Field position, as SECTION.FIELD e.g. 2.0")
+
+    def apply(self, answers: list, survey: Survey) -> None:
+        section_index, field_index = self.options["field"]
+        section = answers[section_index]
+        if len(section) <= len(survey.layout.sections[section_index].fields):
+            raise ValueError(f"section {section_index} has no more answers than fields")
+        del section[field_index]
+
+
+#: The available transforms, by name
+TRANSFORMS: dict[str, Type[AnswerTransform]] = {
+    transform.name: transform for transform in (ShiftLikert, RemapOptions, InsertField, RemoveField)
+}
+
+
+def diff_answers(old: Any, new: Any, path: tuple = ()) -> list[str]:
+    """
+    Describe the differences between two sets of answers.
+
+    :returns: One line per changed value, with its position e.g. "1.0.2: '5' -> '4'"
+    """
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        return [line for index, pair in enumerate(zip(old, new)) for line in diff_answers(*pair, path + (index,))]
+    if old == new:
+        return list()
+    position = ".".join(map(str, path)) or "answers"
+    return [f"{position}: {old!r} -> {new!r}"]
@@ -0,0 +1,123 @@
+"""
+A compact form of survey response answers, in which chosen options are stored as
+their position in the field's list of options rather than as text.
+
+Likert, radio and select answers become option indices, checkbox answers become a
+bitmask of the chosen options, and free text is kept as it is. Encoded answers are
+stored with the primary key of the survey configuration they were encoded against,
+as a JSON object rather than the usual list:
+
+    {"c": <SurveyConfig pk>, "a": [[0, [3, 4, 2], 5, "Free text"], ...]}
+
+Any answer that wouldn't decode to exactly the same value is left as it is, so
+decoding is always lossless.
+"""
+
+import functools
+from typing import Any, Optional
+
+from survey.layout import LAYOUT_CACHE_SIZE, FieldLayout, SurveyLayout, get_layout
+
+#: The key of the survey configuration in encoded answers
+CONFIG_KEY = "c"
+#: The key of the answers themselves
+ANSWERS_KEY = "a"
+
+#: Field types whose answers are a chosen option, or a list of them
+OPTION_FIELD_TYPES = {"radio", "select", "likert", "checkbox"}
+
+
+def encode_field(field: FieldLayout, answer: Any) -> Any:
+    if field.type not in OPTION_FIELD_TYPES or not field.options:
+        return answer
+
+    indexes = field.option_indexes
+    if field.type == "checkbox":
+        if isinstance(answer, list) and all(value in indexes for value in answer):
+            encoded = sum(1 << indexes[value] for value in set(answer))
+            # The options must have been chosen in order, and only once each
+            if decode_field(field, encoded) == answer:
+                return encoded
+        return answer
+
+    if field.type == "likert":
+        if isinstance(answer, list):
+            return [indexes.get(value, value) if isinstance(value, str) else value for value in answer]
+        return answer
+
+    return indexes.get(answer, answer) if isinstance(answer, str) else answer
+
+
+def decode_field(field: FieldLayout, encoded: Any) -> Any:
+    if field.type not in OPTION_FIELD_TYPES:
+        return encoded
+
+    options = field.options
+    if field.type == "checkbox":
+        if isinstance(encoded, int):
+            return [option for index, option in enumerate(options) if encoded & (1 << index)]
+        return encoded
+
+    if field.type == "likert":
+        if isinstance(encoded, list):
+            return [options[value] if isinstance(value, int) else value for value in encoded]
+        return encoded
+
+    return options[encoded] if isinstance(encoded, int) else encoded
+
+
+def encode(answers: list, layout: SurveyLayout) -> Optional[list]:
+    """
+    Encode answers that have the structure described by a survey layout.
+
+    :returns: The encoded answers, or None if they don't match the layout
+    """
+    if not isinstance(answers, list) or len(answers) != len(layout.sections):
+        return None
+    encoded = list()
+    for section, section_answers in zip(layout.sections, answers):
+        if not isinstance(section_answers, list) or len(section_answers) != len(section.fields):
+            return None
+        encoded.append([encode_field(field, answer) for field, answer in zip(section.fields, section_answers)])
+    return encoded
+
+
+def decode(encoded: list, layout: SurveyLayout) -> list:
+    return [
+        [decode_field(field, answer) for field, answer in zip(section.fields, section_answers)]
+        for section, section_answers in zip(layout.sections, encoded)
+    ]
+
+
+def is_encoded(value: Any) -> bool:
+    return isinstance(value, dict) and CONFIG_KEY in value
+
+
+def encode_stored(answers: list, config_pk: int, layout: SurveyLayout) -> Any:
+    """
+    The form of answers to store in the database: encoded if possible, otherwise as they are.
+    """
+    encoded = encode(answers, layout)
+    if encoded is None:
+        return answers
+    return {CONFIG_KEY: config_pk, ANSWERS_KEY: encoded}
+
+
+def decode_stored(value: Any) -> Any:
+    """
+    Turn answers from the database back into their usual form, whether or not they were encoded.
+    """
+    if not is_encoded(value):
+        return value
+    return decode(value[ANSWERS_KEY], config_layout(value[CONFIG_KEY]))
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def config_layout(config_pk: int) -> SurveyLayout:
+    """
+    The layout of a stored survey configuration. Stored configurations never change,
+    so this only needs loading once.
+    """
+    from survey.models import SurveyConfig
+
+    return get_layout(SurveyConfig.objects.values_list("value", flat=True).get(pk=config_pk))
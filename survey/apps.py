@@ -1,6 +1,24 @@
+import logging
+
 from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
 
 
 class SurveyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "survey"
+
+    def ready(self):
+        """
+        Initialise this app
+        """
+        from survey.registry import data_files
+
+        # Read the survey templates now rather than during the first request.
+        # Problems with the files are reported by the system checks.
+        try:
+            data_files.preload()
+        except (OSError, ImproperlyConfigured):
+            logger.warning("Could not load the survey template files", exc_info=True)
@@ -1,29 +1,37 @@
-import itertools
 from pathlib import Path
 from django.core.checks import Tags, Error
+from django.core.exceptions import ImproperlyConfigured
 from django.conf import settings
 import django.contrib.staticfiles.finders
 
-FILENAMES = itertools.chain(
-    settings.SURVEY_TEMPLATES.values(),
-    settings.DEMOGRAPHY_TEMPLATES.values(),
-    (settings.CONSENT_TEMPLATE,)
-)
+from survey.registry import data_files
 
 
 @django.core.checks.register(Tags.staticfiles)
 def check_survey_config(*args, **kwargs) -> list[Error]:
     """
-    Ensure that survey configuration files exist
+    Ensure that survey configuration files exist and are valid
     """
     errors = list()
 
     # Iterate over survey config files
-    for filename in FILENAMES:
+    for filename in data_files.survey_template_filenames:
         path = Path(settings.SURVEY_TEMPLATE_DIR).joinpath(filename).absolute()
         if not path.exists():
             errors.append(
                 Error(f"File not found: {path}", hint="Make sure the survey config file is present.")
             )
+            continue
+        try:
+            data_files.survey_template(filename)
+        except ImproperlyConfigured as error:
+            errors.append(
+                Error(str(error), hint=f"Check the file against {settings.SURVEY_CONFIG_SCHEMA}")
+            )
+
+    try:
+        _ = data_files.readiness_descriptions
+    except (OSError, ImproperlyConfigured) as error:
+        errors.append(Error(f"Readiness descriptions: {error}"))
 
     return errors
@@ -0,0 +1,159 @@
+"""
+The layout of a survey's questions as the columns of a table of responses, as used
+by the CSV and Excel exports.
+"""
+
+import functools
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+#: Number of distinct survey configurations to keep layouts for
+LAYOUT_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class FieldLayout:
+    """
+    One question, and where its answer goes in a row of data.
+    """
+
+    #: Position of the section in the survey
+    section_index: int
+    #: Position of the field in its section
+    index: int
+    type: str
+    label: Optional[str]
+    #: Likert sub-questions, each of which has its own column
+    sublabels: tuple[str, ...]
+    #: The first column of this field in a row of data
+    column: int
+    #: The (read-only) field configuration
+    config: Mapping[str, Any]
+
+    @property
+    def headers(self) -> tuple[str, ...]:
+        """
+        The column headers for this field: one per sub-label for likert fields.
+        """
+        if self.type == "likert":
+            return self.sublabels
+        return (self.label,)
+
+    @functools.cached_property
+    def options(self) -> tuple[str, ...]:
+        """
+        The options that can be chosen, as they appear in answers.
+        """
+        return tuple(str(option) for option in self.config.get("options", ()))
+
+    @functools.cached_property
+    def option_indexes(self) -> dict[str, int]:
+        """
+        The position of each option.
+        """
+        return {option: index for index, option in enumerate(self.options)}
+
+
+@dataclass(frozen=True)
+class SectionLayout:
+    index: int
+    title: Optional[str]
+    #: e.g. "consent" or "demographic"
+    type: Optional[str]
+    fields: tuple[FieldLayout, ...]
+
+
+@dataclass(frozen=True)
+class SurveyLayout:
+    """
+    The flattened structure of a survey configuration.
+
+    Layouts are immutable and shared by every survey with the same configuration, so
+    they are worked out once rather than for every response.
+    """
+
+    sections: tuple[SectionLayout, ...]
+    #: Every field of every section, in order
+    fields: tuple[FieldLayout, ...]
+    #: The column headers of a row of data
+    headers: tuple[str, ...]
+
+    @classmethod
+    def build(cls, survey_config: dict) -> "SurveyLayout":
+        sections = list()
+        fields = list()
+        headers = list()
+        for section_index, section in enumerate(survey_config["sections"]):
+            section_fields = list()
+            for field_index, field in enumerate(section.get("fields", [])):
+                field_layout = FieldLayout(
+                    section_index=section_index,
+                    index=field_index,
+                    type=field["type"],
+                    label=field.get("label"),
+                    sublabels=tuple(field.get("sublabels", [])),
+                    column=len(headers),
+                    config=_freeze(field),
+                )
+                section_fields.append(field_layout)
+                headers.extend(field_layout.headers)
+            sections.append(
+                SectionLayout(
+                    index=section_index,
+                    title=section.get("title"),
+                    type=section.get("type"),
+                    fields=tuple(section_fields),
+                )
+            )
+            fields.extend(section_fields)
+        return cls(sections=tuple(sections), fields=tuple(fields), headers=tuple(headers))
+
+    def describe_path(self, path) -> str:
+        """
+        Turn a path to part of a response (section index, field index, and for
+        likert fields a sublabel index) into a human-readable location, using the
+        section titles and field labels.
+        """
+        path = list(path)
+        if not path:
+            return "Response"
+
+        section = self.sections[path[0]]
+        title = section.title if section.title is not None else path[0] + 1
+        description = f"Section {path[0] + 1} '{title}'"
+        if len(path) == 1:
+            return description
+
+        field = section.fields[path[1]]
+        label = field.label if field.label is not None else path[1] + 1
+        description += f", field '{label}'"
+
+        if len(path) > 2 and field.type == "likert" and path[2] < len(field.sublabels):
+            description += f" ('{field.sublabels[path[2]]}')"
+
+        return description
+
+
+def get_layout(survey_config: dict) -> SurveyLayout:
+    """
+    Get the (shared) layout of a survey configuration.
+    """
+    return _get_layout_json(json.dumps(survey_config, sort_keys=True))
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _get_layout_json(survey_config_json: str) -> SurveyLayout:
+    return SurveyLayout.build(json.loads(survey_config_json))
+
+
+def _freeze(value):
+    """
+    A read-only copy of a JSON value, so a shared layout can't be changed by accident.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management import BaseCommand
+
+from survey.models import SpooledSurveyResponse
+
+
+class Command(BaseCommand):
+    """
+    Process spooled survey submissions.
+
+    When the SURVEY_RESPONSE_SPOOL setting is enabled, participants' submissions are
+    stored as they arrive and this command validates and saves them in batches.
+    """
+
+    help = "Validate and save spooled survey submissions in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Maximum number of submissions to save per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep running, checking for new submissions every this many seconds. "
+            "By default, exit once the spool is empty.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        interval = options["interval"]
+        total_accepted = total_rejected = total_duplicate = 0
+
+        while True:
+            accepted, rejected, duplicate = SpooledSurveyResponse.drain(batch_size=batch_size)
+            total_accepted += accepted
+            total_rejected += rejected
+            total_duplicate += duplicate
+            # A batch of nothing but repeated submissions still empties some of the spool
+            if accepted or rejected or duplicate:
+                self.stdout.write(
+                    f"Saved {accepted} response(s), rejected {rejected}, skipped {duplicate} already saved"
+                )
+                continue
+            if interval is None:
+                break
+            time.sleep(interval)
+
+        self.stdout.write(
+            f"Drained spool: {total_accepted} saved, {total_rejected} rejected, "
+            f"{total_duplicate} already saved"
+        )
+        if total_rejected:
+            self.stderr.write(
+                self.style.WARNING(
+                    "Rejected submissions are kept in the spool, see the Django admin site"
+                )
+            )
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from survey import answers_codec
+from survey.models import Survey, SurveyResponse
+
+
+class Command(BaseCommand):
+    """
+    Rewrite stored survey response answers in the compact form described in
+    survey.answers_codec, or back again.
+
+    New responses are encoded when they're saved if the SURVEY_ENCODE_ANSWERS setting
+    is on; this converts the responses that were saved before it was turned on.
+    """
+
+    help = "Encode (or decode) the stored answers of survey responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--survey",
+            type=int,
+            dest="survey_id",
+            help="Only convert the responses of this survey (by primary key)",
+        )
+        parser.add_argument(
+            "--decode",
+            action="store_true",
+            help="Store the answers as text again, e.g. before turning SURVEY_ENCODE_ANSWERS off",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=Survey.REVALIDATE_BATCH_SIZE,
+            help=f"Number of responses to convert at a time (default: {Survey.REVALIDATE_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        decode = options["decode"]
+        if not decode and not settings.SURVEY_ENCODE_ANSWERS:
+            raise CommandError("Answers are only encoded if DJANGO_SURVEY_ENCODE_ANSWERS is on")
+
+        surveys = Survey.objects.exclude(config=None).select_related("config").order_by("pk")
+        if options["survey_id"] is not None:
+            surveys = surveys.filter(pk=options["survey_id"])
+
+        total = 0
+        for survey in surveys.iterator():
+            # Only answers that are valid for the current configuration are encoded
+            survey.refresh_response_validation()
+            count = self.convert(survey, decode=decode, chunk_size=options["chunk_size"])
+            if count:
+                self.stdout.write(f"Survey {survey.pk}: {'decoded' if decode else 'encoded'} {count} responses")
+            total += count
+        self.stdout.write(f"Converted {total} responses")
+
+    @staticmethod
+    def convert(survey: Survey, decode: bool, chunk_size: int) -> int:
+        """
+        :returns: The number of responses whose stored form changed
+        """
+        count = 0
+        last_pk = 0
+        survey_responses = survey.survey_response.order_by("pk").only(
+            "pk", "answers", *SurveyResponse.VALIDATION_FIELDS
+        )
+        while batch := list(survey_responses.filter(pk__gt=last_pk)[:chunk_size]):
+            changed = list()
+            for survey_response in batch:
+                survey_response.survey = survey
+                # The answers are decoded when they're loaded, so they only need encoding
+                stored = survey_response.answers if decode else survey_response.stored_answers()
+                if decode or answers_codec.is_encoded(stored):
+                    survey_response.answers = stored
+                    changed.append(survey_response)
+            # Written as they are: bulk_update() doesn't encode the answers itself
+            with transaction.atomic():
+                SurveyResponse.objects.bulk_update(changed, fields=["answers"])
+            count += len(changed)
+            last_pk = batch[-1].pk
+        return count
@@ -0,0 +1,162 @@
+import csv
+import itertools
+from pathlib import Path
+from typing import Generator
+
+import openpyxl
+from django.core.management import BaseCommand, CommandError
+
+from survey.exceptions import SurveyInactiveError
+from survey.models import Survey
+
+
+class Command(BaseCommand):
+    """
+    Survey response import, the reverse of the csv and excel export commands.
+
+    This is for responses collected offline, such as paper forms that have been keyed
+    into a spreadsheet with the same columns as the survey's export.
+    """
+
+    help = "Import survey responses from a CSV file or Excel workbook"
+
+    def add_arguments(self, parser):
+        parser.add_argument("survey_id", type=int, help="Survey primary key (integer)")
+        parser.add_argument("path", type=Path, help="CSV (.csv) or Excel (.xlsx) file")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=Survey.BULK_CREATE_BATCH_SIZE,
+            help=f"Number of rows to validate and save at a time (default: {Survey.BULK_CREATE_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--rejects",
+            type=Path,
+            default=None,
+            help="CSV file for the rows that aren't valid (default: <path>_rejects.csv)",
+        )
+        parser.add_argument(
+            "--allow-inactive",
+            action="store_true",
+            help="Import into a survey that is no longer accepting responses",
+        )
+
+    def handle(self, *args, **options):
+        survey_id = options["survey_id"]
+        path: Path = options["path"]
+        rejects_path: Path = options["rejects"] or path.with_name(f"{path.stem}_rejects.csv")
+
+        try:
+            survey = Survey.objects.get(pk=survey_id)
+        except Survey.DoesNotExist:
+            raise CommandError(f"Survey with ID {survey_id} does not exist")
+
+        if path.suffix.lower() == ".csv":
+            rows = self.read_csv(path)
+        elif path.suffix.lower() == ".xlsx":
+            rows = self.read_excel(path)
+        else:
+            raise CommandError(f"Unsupported file type '{path.suffix}', expected .csv or .xlsx")
+
+        # The columns must match the export of this survey
+        fields = list(survey.fields)
+        header = next(rows, None)
+        if header is None:
+            raise CommandError(f"{path} is empty")
+        header = self.clean_row(header, len(header))
+        # Ignore empty cells at the end of the header row
+        while header and not header[-1]:
+            header.pop()
+        if header != fields:
+            raise CommandError(
+                f"The columns of {path} don't match the fields of survey '{survey}'. "
+                f"Use the survey's CSV export as a template."
+            )
+
+        accepted = rejected = 0
+        rejects_file = rejects_writer = None
+        try:
+            # Data rows are numbered from 1, after the header, and blank rows are skipped
+            numbered_rows = (
+                (row_number, row)
+                for row_number, row in enumerate(rows, start=1)
+                if any(value not in (None, "") for value in row)
+            )
+            while chunk := list(itertools.islice(numbered_rows, options["chunk_size"])):
+                row_numbers = [row_number for row_number, _ in chunk]
+                values = [self.clean_row(row, len(fields)) for _, row in chunk]
+
+                try:
+                    report = survey.accept_responses(
+                        (survey.answers_from_values(row) for row in values),
+                        allow_inactive=options["allow_inactive"],
+                    )
+                except SurveyInactiveError as error:
+                    raise CommandError(f"{error.message} Use --allow-inactive to import anyway.")
+
+                for result in report:
+                    if result["accepted"]:
+                        accepted += 1
+                        continue
+                    rejected += 1
+                    if rejects_writer is None:
+                        rejects_file = rejects_path.open("w", newline="", encoding="utf-8")
+                        rejects_writer = csv.writer(rejects_file)
+                        rejects_writer.writerow(["row", "errors", *fields])
+                    rejects_writer.writerow(
+                        [
+                            row_numbers[result["index"]],
+                            "; ".join(result["errors"]),
+                            *values[result["index"]],
+                        ]
+                    )
+                self.stdout.write(f"Imported {accepted} response(s), rejected {rejected}")
+        finally:
+            if rejects_file is not None:
+                rejects_file.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {accepted} response(s) from {path} into survey '{survey.name}'"
+            )
+        )
+        if rejected:
+            self.stderr.write(
+                self.style.WARNING(f"Rejected {rejected} row(s), see {rejects_path}")
+            )
+
+    @staticmethod
+    def clean_row(row: list, num_fields: int) -> list[str]:
+        """
+        Turn the cells of a row into text, one per survey field, treating empty cells
+        as blank.
+        """
+        values = list()
+        for value in itertools.islice(itertools.chain(row, itertools.repeat(None)), num_fields):
+            if value is None:
+                value = ""
+            # Spreadsheets store whole numbers typed into a cell as decimals
+            elif isinstance(value, float) and value.is_integer():
+                value = str(int(value))
+            values.append(str(value).strip())
+        return values
+
+    @staticmethod
+    def read_csv(path: Path) -> Generator[list, None, None]:
+        """
+        Iterate over the rows of a CSV file without loading it all into memory.
+        """
+        with path.open(newline="", encoding="utf-8-sig") as file:
+            yield from csv.reader(file)
+
+    @staticmethod
+    def read_excel(path: Path) -> Generator[tuple, None, None]:
+        """
+        Iterate over the rows of the first worksheet of an Excel workbook without
+        loading it all into memory.
+        """
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
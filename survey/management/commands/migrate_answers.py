@@ -0,0 +1,206 @@
+import concurrent.futures
+import multiprocessing
+import os
+from typing import Optional
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from survey.answer_transforms import TRANSFORMS, AnswerTransform, diff_answers
+from survey.models import Survey, SurveyAnswer, SurveyResponse
+
+
+def migrate_survey(
+    survey_id: int,
+    transform: AnswerTransform,
+    commit: bool = False,
+    chunk_size: int = 500,
+    min_pk: Optional[int] = None,
+    max_pk: Optional[int] = None,
+    max_diffs: int = 0,
+) -> dict:
+    """
+    Apply a transform to the answers of one survey's responses, a chunk at a time in
+    primary key order. Each chunk is saved in its own transaction.
+
+    :param commit: Save the changes (otherwise, only report what would change)
+    :param max_diffs: Number of changed responses to describe
+    :returns: A summary of the changes, including the first response that wasn't
+        processed if a transform failed.
+    """
+    survey = Survey.objects.select_related("config").get(pk=survey_id)
+    survey_responses = survey.survey_response.order_by("pk").only("pk", "answers")
+    if max_pk is not None:
+        survey_responses = survey_responses.filter(pk__lte=max_pk)
+    last_pk = min_pk - 1 if min_pk is not None else 0
+
+    result = dict(survey_id=survey_id, responses=0, modified=0, diffs=list(), error=None, resume_pk=None)
+    while batch := list(survey_responses.filter(pk__gt=last_pk)[:chunk_size]):
+        changed = list()
+        for survey_response in batch:
+            survey_response.survey = survey
+            try:
+                answers = transform(survey_response.answers, survey)
+            except (ValueError, IndexError) as exc:
+                # Nothing in this chunk has been saved
+                result.update(error=f"response pk={survey_response.pk}: {exc}", resume_pk=batch[0].pk)
+                return result
+            if answers != survey_response.answers:
+                if len(result["diffs"]) < max_diffs:
+                    result["diffs"].append((survey_response.pk, diff_answers(survey_response.answers, answers)))
+                survey_response.answers = answers
+                survey_response.record_validation()
+                changed.append(survey_response)
+
+        if commit and changed:
+            # bulk_update() doesn't encode the answers itself, so write them as
+            # save() would, then put the decoded answers back for SurveyAnswer
+            decoded = [survey_response.answers for survey_response in changed]
+            for survey_response in changed:
+                survey_response.answers = survey_response.stored_answers()
+            with transaction.atomic():
+                SurveyResponse.objects.bulk_update(
+                    changed, fields=("answers",) + SurveyResponse.VALIDATION_FIELDS
+                )
+                for survey_response, answers in zip(changed, decoded):
+                    survey_response.answers = answers
+                SurveyAnswer.replace_for(changed)
+                # A closed survey's report must be worked out again
+                survey.report_snapshots.all().delete()
+        result["responses"] += len(batch)
+        result["modified"] += len(changed)
+        last_pk = batch[-1].pk
+
+    return result
+
+
+class Command(BaseCommand):
+    """
+    Correct stored survey response answers, for example after a change to the survey
+    configuration.
+
+    The available corrections are the transforms in survey.answer_transforms. Without
+    --commit, nothing is saved and the changes that would be made are described.
+    """
+
+    help = "Apply a correction to the answers of survey responses"
+
+    #: Number of responses changed and saved at a time
+    CHUNK_SIZE = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--survey",
+            type=int,
+            action="append",
+            dest="survey_ids",
+            required=True,
+            help="Survey primary key (may be given more than once)",
+        )
+        parser.add_argument(
+            "--commit",
+            action="store_true",
+            help="Save the changes. Without this flag the command only reports what would change.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=self.CHUNK_SIZE,
+            help=f"Number of responses to change and save at a time (default: {self.CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--min-pk",
+            type=int,
+            help="Only change responses with a primary key greater than or equal to this value, "
+            "e.g. to resume an interrupted run",
+        )
+        parser.add_argument(
+            "--max-pk",
+            type=int,
+            help="Only change responses with a primary key less than or equal to this value",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of surveys to change at once, each in its own process (default: 1)",
+        )
+        parser.add_argument(
+            "--max-diffs",
+            type=int,
+            default=10,
+            help="Number of changed responses to describe per survey in a dry run (default: 10)",
+        )
+        subparsers = parser.add_subparsers(dest="transform", required=True, title="transforms")
+        for name, transform in TRANSFORMS.items():
+            transform.add_arguments(subparsers.add_parser(name, help=transform.help))
+
+    def handle(self, *args, **options):
+        try:
+            transform = TRANSFORMS[options["transform"]](**options)
+        except ValueError as exc:
+            raise CommandError(exc)
+        commit = options["commit"]
+        survey_ids = list(dict.fromkeys(options["survey_ids"]))
+        missing = set(survey_ids) - set(Survey.objects.filter(pk__in=survey_ids).values_list("pk", flat=True))
+        if missing:
+            raise CommandError(f"Survey with ID {', '.join(map(str, sorted(missing)))} does not exist")
+
+        kwargs = dict(
+            transform=transform,
+            commit=commit,
+            chunk_size=options["chunk_size"],
+            min_pk=options["min_pk"],
+            max_pk=options["max_pk"],
+            max_diffs=0 if commit else options["max_diffs"],
+        )
+        failed = False
+        for result in self.run(survey_ids, options["workers"], **kwargs):
+            failed |= self.report(result, commit)
+
+        if failed:
+            raise CommandError("Some responses could not be changed")
+        if not commit:
+            self.stdout.write("Dry run: re-run with --commit to save the changes")
+
+    def run(self, survey_ids: list[int], workers: int, **kwargs):
+        """
+        Migrate each survey, in this process or shared between worker processes.
+        """
+        if workers <= 1 or len(survey_ids) == 1:
+            for survey_id in survey_ids:
+                yield migrate_survey(survey_id, **kwargs)
+            return
+
+        # Worker processes mustn't share this process's database connections
+        connections.close_all()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(survey_ids), os.cpu_count()),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = [executor.submit(migrate_survey, survey_id, **kwargs) for survey_id in survey_ids]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+
+    def report(self, result: dict, commit: bool) -> bool:
+        """
+        Write the outcome for one survey.
+
+        :returns: Whether the survey's responses couldn't all be changed
+        """
+        survey_id = result["survey_id"]
+        for pk, lines in result["diffs"]:
+            self.stdout.write(f"Survey {survey_id} response {pk}:")
+            for line in lines:
+                self.stdout.write(f"  {line}")
+        verb = "Modified" if commit else "Would modify"
+        self.stdout.write(f"Survey {survey_id}: {verb} {result['modified']}/{result['responses']} responses")
+        if result["error"] is None:
+            return False
+        self.stderr.write(
+            self.style.ERROR(
+                f"Survey {survey_id}: {result['error']}. "
+                f"Once it's fixed, resume with --survey {survey_id} --min-pk {result['resume_pk']}"
+            )
+        )
+        return True
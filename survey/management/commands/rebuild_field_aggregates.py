@@ -0,0 +1,39 @@
+from django.core.management import BaseCommand
+
+from survey.models import Survey, SurveyFieldAggregate, SurveyReadiness
+
+
+class Command(BaseCommand):
+    """
+    Count the options chosen in each survey again, from the SurveyAnswer table, along
+    with the readiness totals of each survey, project and organisation.
+
+    The counts are changed whenever responses are saved or deleted, so this is only
+    needed if they've drifted, for example after the tables were changed by hand.
+    """
+
+    help = "Rebuild the counts of survey answers used for report statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--survey",
+            type=int,
+            dest="survey_id",
+            help="Only rebuild the counts of this survey (by primary key)",
+        )
+
+    def handle(self, *args, **options):
+        surveys = Survey.objects.exclude(config=None).select_related("config").order_by("pk")
+        if options["survey_id"] is not None:
+            surveys = surveys.filter(pk=options["survey_id"])
+
+        total = 0
+        for survey in surveys.iterator():
+            # Counts are only kept for valid responses
+            survey.refresh_response_validation()
+            count = SurveyFieldAggregate.rebuild(survey)
+            self.stdout.write(f"Survey {survey.pk}: {count} counts")
+            total += count
+        self.stdout.write(f"Stored {total} counts")
+        if options["survey_id"] is None:
+            self.stdout.write(f"Stored {SurveyReadiness.rebuild_rollups()} project and organisation readiness totals")
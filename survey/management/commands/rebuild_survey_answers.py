@@ -0,0 +1,50 @@
+from django.core.management import BaseCommand
+
+from survey.models import Survey, SurveyAnswer
+
+
+class Command(BaseCommand):
+    """
+    Fill the SurveyAnswer table from the answers of survey responses.
+
+    Answers are added to the table when responses are saved, so this is needed for
+    responses saved before it existed, or if the table has been changed by hand.
+    """
+
+    help = "Rebuild the table of individual survey answers used for statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--survey",
+            type=int,
+            dest="survey_id",
+            help="Only rebuild the answers of this survey (by primary key)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=Survey.REVALIDATE_BATCH_SIZE,
+            help=f"Number of responses to rebuild at a time (default: {Survey.REVALIDATE_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        surveys = Survey.objects.exclude(config=None).select_related("config").order_by("pk")
+        if options["survey_id"] is not None:
+            surveys = surveys.filter(pk=options["survey_id"])
+        chunk_size = options["chunk_size"]
+
+        total = 0
+        for survey in surveys.iterator():
+            # Only valid responses have answers in the table
+            survey.refresh_response_validation()
+            count = 0
+            last_pk = 0
+            survey_responses = survey.survey_response.order_by("pk").only("pk", "answers", "is_valid")
+            while batch := list(survey_responses.filter(pk__gt=last_pk)[:chunk_size]):
+                for survey_response in batch:
+                    survey_response.survey = survey
+                count += SurveyAnswer.replace_for(batch)
+                last_pk = batch[-1].pk
+            self.stdout.write(f"Survey {survey.pk}: {count} answers")
+            total += count
+        self.stdout.write(f"Stored {total} answers")
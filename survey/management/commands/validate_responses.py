@@ -1,10 +1,98 @@
-from django.core.exceptions import ValidationError
-from django.core.management import BaseCommand
+import collections
+import concurrent.futures
+import itertools
+import json
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Generator, Iterable, NamedTuple, Optional
 
-from survey.models import Survey
+from django.core.management import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from survey.models import Survey, SurveyAnswer, SurveyResponse
+
+
+class Chunk(NamedTuple):
+    """
+    Some of one survey's responses, in primary key order.
+    """
+
+    survey_id: int
+    primary_keys: tuple[int, ...]
+
+    @property
+    def last_pk(self) -> int:
+        return self.primary_keys[-1]
+
+
+class ChunkValidator:
+    """
+    Validate chunks of responses and record the outcome on each response.
+
+    Each survey is kept for the following chunks, so its compiled response schema is
+    built once rather than for every chunk.
+    """
+
+    #: Number of surveys to keep between chunks
+    SURVEY_CACHE_SIZE = 16
+
+    def __init__(self):
+        self.surveys: dict[int, Survey] = dict()
+
+    def get_survey(self, survey_id: int) -> Survey:
+        if survey_id not in self.surveys:
+            if len(self.surveys) >= self.SURVEY_CACHE_SIZE:
+                self.surveys.clear()
+            self.surveys[survey_id] = Survey.objects.select_related("config").get(pk=survey_id)
+        return self.surveys[survey_id]
+
+    def __call__(self, chunk: Chunk) -> dict:
+        survey = self.get_survey(chunk.survey_id)
+        survey_responses = list(
+            SurveyResponse.objects.filter(pk__in=chunk.primary_keys).only("pk", "answers")
+        )
+        messages = list()
+        invalid = 0
+        for survey_response in survey_responses:
+            survey_response.survey = survey
+            errors = survey_response.record_validation()
+            if errors:
+                invalid += 1
+                messages.extend(f"Survey {survey.pk} / Response {survey_response.pk}: {error}" for error in errors)
+        with transaction.atomic():
+            SurveyResponse.objects.bulk_update(survey_responses, fields=SurveyResponse.VALIDATION_FIELDS)
+            SurveyAnswer.replace_for(survey_responses)
+        return dict(chunk=chunk, count=len(survey_responses), invalid=invalid, messages=messages)
+
+
+# The validator of each worker process
+_worker_validator: Optional[ChunkValidator] = None
+
+
+def _init_worker():
+    global _worker_validator
+    _worker_validator = ChunkValidator()
+
+
+def _validate_in_worker(chunk: Chunk) -> dict:
+    return _worker_validator(chunk)
 
 
 class Command(BaseCommand):
+    """
+    Validate survey responses and record whether each one is valid.
+
+    Responses are read in chunks, which may be shared between several worker
+    processes. Besides the validation fields of each response, the stored answers
+    of the responses in each chunk are replaced (see SurveyAnswer.replace_for()),
+    which updates their surveys' answer counts and marks their readiness totals to
+    be worked out again, because only valid responses are counted.
+
+    With --checkpoint, the last response validated in each survey is saved as the
+    command goes, so an interrupted run can be resumed where it stopped.
+    """
+
     help = "Validate all survey response answers against their survey's JSON Schema"
 
     def add_arguments(self, parser):
@@ -14,25 +102,150 @@ class Command(BaseCommand):
             dest="survey_id",
             help="Only validate the responses of this survey (by primary key)",
         )
+        parser.add_argument(
+            "--stale",
+            action="store_true",
+            help="Only validate responses that haven't been checked against the current survey configuration",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=Survey.REVALIDATE_BATCH_SIZE,
+            help=f"Number of responses to validate at a time (default: {Survey.REVALIDATE_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes to validate responses in (default: 1, 0 for one per CPU)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            default=None,
+            help="JSON file to record progress in, and to resume from if it exists",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write a JSON summary to stdout",
+        )
 
     def handle(self, *args, **options):
-        errors = 0
-        total = 0
-        surveys = Survey.objects.prefetch_related("survey_response")
-        survey_id = options.get("survey_id")
-        if survey_id is not None:
-            surveys = surveys.filter(pk=survey_id)
-        for survey in surveys.iterator(chunk_size=100):
-            for response in survey.survey_response.all():
-                total += 1
-                try:
-                    response.validate()
-                except ValidationError as exc:
-                    errors += 1
-                    for message in exc.messages:
-                        self.stderr.write(
-                            f"Survey {survey.pk} / Response {response.pk}: {message}"
-                        )
-        self.stdout.write(f"Validated {total} responses - {errors} error(s)")
-        if errors:
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        workers = options["workers"] or os.cpu_count()
+        self.stale = options["stale"]
+        self.chunk_size = options["chunk_size"]
+        self.checkpoint_path: Optional[Path] = options["checkpoint"]
+        # The last response validated in each survey, before which every response has been validated
+        self.checkpoint: dict[int, int] = self.load_checkpoint()
+        # The chunks of each survey that haven't been validated yet, in order
+        self.pending: dict[int, collections.deque] = collections.defaultdict(collections.deque)
+        self.finished: set[Chunk] = set()
+
+        surveys = Survey.objects.exclude(config=None).order_by("pk")
+        if options["survey_id"] is not None:
+            surveys = surveys.filter(pk=options["survey_id"])
+        summary = dict(responses=0, invalid=0, surveys=dict())
+        chunks = self.chunks(list(surveys.values_list("pk", "config_version")))
+        for result in self.run(chunks, workers=workers):
+            chunk = result["chunk"]
+            for message in result["messages"]:
+                self.stderr.write(message)
+            survey_summary = summary["surveys"].setdefault(str(chunk.survey_id), dict(responses=0, invalid=0))
+            for totals in (summary, survey_summary):
+                totals["responses"] += result["count"]
+                totals["invalid"] += result["invalid"]
+            self.finish(chunk)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+        else:
+            self.stdout.write(f"Validated {summary['responses']} responses - {summary['invalid']} error(s)")
+        if summary["invalid"]:
             exit(1)
+
+    def chunks(self, surveys: Iterable[tuple[int, int]]) -> Generator[Chunk, None, None]:
+        """
+        Split the responses of each survey into chunks, skipping those before the checkpoint.
+
+        Only the primary keys are read here, a chunk at a time, so no survey's
+        responses are ever held in memory all at once.
+
+        :param surveys: The primary key and configuration version of each survey
+        """
+        for survey_id, config_version in surveys:
+            survey_responses = SurveyResponse.objects.filter(survey_id=survey_id).order_by("pk")
+            if self.stale:
+                survey_responses = survey_responses.exclude(validated_config_version=config_version)
+            last_pk = self.checkpoint.get(survey_id, 0)
+            while primary_keys := tuple(
+                survey_responses.filter(pk__gt=last_pk).values_list("pk", flat=True)[: self.chunk_size]
+            ):
+                chunk = Chunk(survey_id=survey_id, primary_keys=primary_keys)
+                self.pending[survey_id].append(chunk)
+                yield chunk
+                last_pk = chunk.last_pk
+
+    def run(self, chunks: Iterable[Chunk], workers: int) -> Generator[dict, None, None]:
+        """
+        Validate each chunk, in this process or shared between worker processes.
+
+        :returns: The result of each chunk, in the order they finish
+        """
+        if workers <= 1:
+            validator = ChunkValidator()
+            yield from map(validator, chunks)
+            return
+
+        # The pool forks all of its workers when the first chunk is submitted, and they
+        # mustn't share this process's database connections. Reading a chunk opens one,
+        # so the first chunk is read before the connections are closed.
+        chunks = iter(chunks)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return
+        connections.close_all()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+        ) as executor:
+            running = set()
+            for chunk in itertools.chain([first_chunk], chunks):
+                running.add(executor.submit(_validate_in_worker, chunk))
+                # Don't read ahead of the workers by more than a few chunks each
+                if len(running) >= workers * 2:
+                    done, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in concurrent.futures.as_completed(running):
+                yield future.result()
+
+    def finish(self, chunk: Chunk):
+        """
+        Move the survey's checkpoint past every chunk that has been validated, in order.
+        """
+        self.finished.add(chunk)
+        pending = self.pending[chunk.survey_id]
+        while pending and pending[0] in self.finished:
+            done = pending.popleft()
+            self.finished.remove(done)
+            self.checkpoint[chunk.survey_id] = done.last_pk
+        self.save_checkpoint()
+
+    def load_checkpoint(self) -> dict[int, int]:
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return dict()
+        with self.checkpoint_path.open() as file:
+            return {int(survey_id): last_pk for survey_id, last_pk in json.load(file)["surveys"].items()}
+
+    def save_checkpoint(self):
+        if self.checkpoint_path is None:
+            return
+        # Replace the file in one step, so it's never left half-written
+        temporary_path = self.checkpoint_path.with_name(f"{self.checkpoint_path.name}.tmp")
+        with temporary_path.open("w") as file:
+            json.dump(dict(surveys={str(key): value for key, value in self.checkpoint.items()}), file)
+        temporary_path.replace(self.checkpoint_path)
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0030_merge_20260217_1045"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SpooledSurveyResponse",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("value", models.TextField(help_text="Submitted answers (JSON)")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("error", models.TextField(blank=True, help_text="Why the submission was rejected", null=True)),
+                (
+                    "survey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="spooled_responses",
+                        to="survey.survey",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0031_spooledsurveyresponse"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="spooledsurveyresponse",
+            name="submission_key",
+            field=models.UUIDField(
+                blank=True,
+                editable=False,
+                help_text="Generated by the participant's browser so that a repeated submission isn't saved twice",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="surveyresponse",
+            name="submission_key",
+            field=models.UUIDField(
+                blank=True,
+                editable=False,
+                help_text="Generated by the participant's browser so that a repeated submission isn't saved twice",
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="spooledsurveyresponse",
+            constraint=models.UniqueConstraint(
+                fields=("survey", "submission_key"), name="unique_spooled_response_submission_key"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="surveyresponse",
+            constraint=models.UniqueConstraint(
+                fields=("survey", "submission_key"), name="unique_survey_response_submission_key"
+            ),
+        ),
+    ]
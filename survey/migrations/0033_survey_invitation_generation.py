@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0032_surveyresponse_submission_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="invitation_generation",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Incremented for each new invitation, which revokes older signed invitation tokens",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0033_survey_invitation_generation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="config_version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Incremented whenever the survey configuration changes"
+            ),
+        ),
+    ]
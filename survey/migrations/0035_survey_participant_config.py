@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0034_survey_config_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="participant_config",
+            field=models.TextField(
+                editable=False,
+                help_text="Minified JSON of the survey configuration, with only what the participant form uses",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def canonical_json(value) -> str:
+    # The same as SurveyConfig.canonical_json
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def move_survey_configs(apps, schema_editor):
+    """
+    Store each distinct survey configuration once, with surveys pointing at it.
+    """
+    Survey = apps.get_model("survey", "Survey")
+    SurveyConfig = apps.get_model("survey", "SurveyConfig")
+
+    for survey in Survey.objects.exclude(survey_config=None).only("pk", "survey_config").iterator():
+        digest = hashlib.sha256(canonical_json(survey.survey_config).encode()).hexdigest()
+        config, _ = SurveyConfig.objects.get_or_create(hash=digest, defaults=dict(value=survey.survey_config))
+        Survey.objects.filter(pk=survey.pk).update(config=config)
+
+
+def restore_survey_configs(apps, schema_editor):
+    Survey = apps.get_model("survey", "Survey")
+
+    for survey in Survey.objects.exclude(config=None).select_related("config").iterator():
+        Survey.objects.filter(pk=survey.pk).update(survey_config=survey.config.value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0035_survey_participant_config"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveyConfig",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "hash",
+                    models.CharField(
+                        editable=False,
+                        help_text="SHA-256 hash of the canonical JSON of the configuration",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                ("value", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="survey",
+            name="config",
+            field=models.ForeignKey(
+                help_text="Question structure",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="surveys",
+                to="survey.surveyconfig",
+            ),
+        ),
+        migrations.RunPython(move_survey_configs, restore_survey_configs),
+        migrations.RemoveField(
+            model_name="survey",
+            name="survey_config",
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0036_surveyconfig"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="surveyresponse",
+            name="error_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="The number of validation errors when the answers were last validated",
+            ),
+        ),
+        migrations.AddField(
+            model_name="surveyresponse",
+            name="is_valid",
+            field=models.BooleanField(
+                editable=False,
+                help_text="Whether the answers matched the survey configuration when they were last validated",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="surveyresponse",
+            name="validated_config_version",
+            field=models.PositiveIntegerField(
+                editable=False,
+                help_text="The survey configuration version the answers were last validated against",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:31
+
+import survey.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0037_surveyresponse_validation"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="surveyresponse",
+            name="answers",
+            field=survey.models.AnswersField(),
+        ),
+    ]
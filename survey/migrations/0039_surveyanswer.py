@@ -0,0 +1,43 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0038_surveyresponse_answers_field"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveyAnswer",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("column", models.PositiveIntegerField(help_text="Position of the question in a row of data")),
+                ("option", models.PositiveIntegerField(help_text="Position of the chosen option", null=True)),
+                ("value", models.FloatField(help_text="The answer, if it's a number", null=True)),
+                (
+                    "response",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="answer_facts",
+                        to="survey.surveyresponse",
+                    ),
+                ),
+                (
+                    "survey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="answer_facts", to="survey.survey"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["survey", "column", "option"], name="survey_surv_survey__699628_idx"),
+                    models.Index(fields=["survey", "column", "value"], name="survey_surv_survey__43cdf5_idx"),
+                ],
+            },
+        ),
+    ]
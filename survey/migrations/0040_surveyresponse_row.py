@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:44
+
+from django.db import migrations, models
+
+
+def mark_responses_for_validation(apps, schema_editor):
+    """
+    The rows of existing responses are filled in the next time they're validated.
+    """
+    SurveyResponse = apps.get_model("survey", "SurveyResponse")
+    SurveyResponse.objects.update(validated_config_version=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0039_surveyanswer"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="surveyresponse",
+            name="row",
+            field=models.JSONField(
+                editable=False,
+                help_text="The answers as a row of data, in the order of the survey's fields when they were last validated",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(mark_responses_for_validation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def count_answers(apps, schema_editor):
+    """
+    Count the options chosen in existing responses.
+    """
+    SurveyAnswer = apps.get_model("survey", "SurveyAnswer")
+    SurveyFieldAggregate = apps.get_model("survey", "SurveyFieldAggregate")
+    totals = (
+        SurveyAnswer.objects.exclude(option=None)
+        .values("survey", "column", "option")
+        .annotate(count=models.Count("pk"))
+        .order_by()
+    )
+    SurveyFieldAggregate.objects.bulk_create(
+        (
+            SurveyFieldAggregate(survey_id=row["survey"], column=row["column"], option=row["option"], count=row["count"])
+            for row in totals.iterator()
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0040_surveyresponse_row"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveyFieldAggregate",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("column", models.PositiveIntegerField(help_text="Position of the question in a row of data")),
+                ("option", models.PositiveIntegerField(help_text="Position of the option")),
+                ("count", models.IntegerField(default=0, help_text="Number of times the option was chosen")),
+                (
+                    "survey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="field_aggregates", to="survey.survey"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("survey", "column", "option"), name="unique_survey_field_aggregate")
+                ],
+            },
+        ),
+        migrations.RunPython(count_answers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0041_surveyfieldaggregate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveyReportSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "config_hash",
+                    models.CharField(help_text="Hash of the survey configuration the figures are for", max_length=64),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        help_text="Statistics, response counts and filter options, as Survey.report_data()"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "survey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="report_snapshots", to="survey.survey"
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from survey.layout import get_layout
+from survey.readiness import readiness_totals
+
+
+def add_up_readiness(apps, schema_editor):
+    """
+    Work out the readiness totals of existing surveys, projects and organisations.
+    """
+    Survey = apps.get_model("survey", "Survey")
+    SurveyFieldAggregate = apps.get_model("survey", "SurveyFieldAggregate")
+    rollup_models = {
+        "survey": apps.get_model("survey", "SurveyReadiness"),
+        "project": apps.get_model("survey", "ProjectReadiness"),
+        "organisation": apps.get_model("survey", "OrganisationReadiness"),
+    }
+    totals = {owner: dict() for owner in rollup_models}
+    for survey in Survey.objects.exclude(config=None).select_related("config", "project").iterator():
+        counts = {
+            (column, option): count
+            for column, option, count in SurveyFieldAggregate.objects.filter(survey=survey).values_list(
+                "column", "option", "count"
+            )
+        }
+        owners = dict(survey=survey.pk)
+        if survey.project is not None:
+            owners.update(project=survey.project_id, organisation=survey.project.organisation_id)
+        for title, (score_total, answer_count) in readiness_totals(get_layout(survey.config.value), counts).items():
+            for owner, owner_id in owners.items():
+                old_score_total, old_answer_count = totals[owner].get((owner_id, title), (0.0, 0))
+                totals[owner][(owner_id, title)] = (old_score_total + score_total, old_answer_count + answer_count)
+
+    for owner, model in rollup_models.items():
+        model.objects.bulk_create(
+            (
+                model(**{f"{owner}_id": owner_id}, title=title, score_total=score_total, answer_count=answer_count)
+                for (owner_id, title), (score_total, answer_count) in totals[owner].items()
+            ),
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0015_add_rectification_event_type"),
+        ("survey", "0042_surveyreportsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrganisationReadiness",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("title", models.CharField(help_text="SORT section title", max_length=200)),
+                ("score_total", models.FloatField(default=0, help_text="Sum of the answers")),
+                ("answer_count", models.IntegerField(default=0, help_text="Number of answers")),
+                (
+                    "organisation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="readiness", to="home.organisation"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("organisation", "title"), name="unique_organisation_readiness")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProjectReadiness",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("title", models.CharField(help_text="SORT section title", max_length=200)),
+                ("score_total", models.FloatField(default=0, help_text="Sum of the answers")),
+                ("answer_count", models.IntegerField(default=0, help_text="Number of answers")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="readiness", to="home.project"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("project", "title"), name="unique_project_readiness")],
+            },
+        ),
+        migrations.CreateModel(
+            name="SurveyReadiness",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("title", models.CharField(help_text="SORT section title", max_length=200)),
+                ("score_total", models.FloatField(default=0, help_text="Sum of the answers")),
+                ("answer_count", models.IntegerField(default=0, help_text="Number of answers")),
+                (
+                    "survey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="readiness", to="survey.survey"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("survey", "title"), name="unique_survey_readiness")],
+            },
+        ),
+        migrations.RunPython(add_up_readiness, migrations.RunPython.noop),
+    ]
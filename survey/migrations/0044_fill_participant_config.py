@@ -0,0 +1,82 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:06
+
+import json
+
+from django.db import migrations
+
+# The participant configuration as Survey.participant_config_for() serialised it
+# when this migration was written. It's copied here so that later changes to the
+# model don't change what this migration does.
+PARTICIPANT_FIELD_KEYS = {
+    "text": ("enforceValueConstraints", "maxNumChar", "minNumValue", "maxNumValue", "textType"),
+    "textarea": ("enforceValueConstraints", "maxNumChar", "minNumValue", "maxNumValue", "textType"),
+    "radio": ("options", "hasOtherOption"),
+    "checkbox": ("options",),
+    "select": ("options",),
+    "likert": ("options", "sublabels"),
+}
+PARTICIPANT_COMMON_FIELD_KEYS = ("type", "label", "description", "required")
+PARTICIPANT_FIELD_DEFAULTS = {
+    "description": "",
+    "required": True,
+    "sublabels": [],
+    "options": [],
+    "enforceValueConstraints": False,
+    "maxNumChar": 500,
+    "minNumValue": 0,
+    "maxNumValue": 100,
+    "textType": "PLAIN_TEXT",
+    "hasOtherOption": False,
+}
+
+
+def participant_config_for(survey_config):
+    sections = list()
+    for section in (survey_config or {}).get("sections", []):
+        fields = list()
+        for field in section["fields"]:
+            if field.get("disabled"):
+                fields.append(dict(type=field["type"], disabled=True))
+                continue
+            keys = PARTICIPANT_COMMON_FIELD_KEYS + PARTICIPANT_FIELD_KEYS.get(field["type"], ())
+            participant_field = {key: field[key] for key in keys if key in field}
+            for key, default in PARTICIPANT_FIELD_DEFAULTS.items():
+                if participant_field.get(key) == default:
+                    del participant_field[key]
+            fields.append(participant_field)
+        sections.append(
+            dict(
+                title=section.get("title", ""),
+                type=section.get("type", ""),
+                description=section.get("description", ""),
+                fields=fields,
+            )
+        )
+    return json.dumps(dict(sections=sections), separators=(",", ":"), ensure_ascii=False)
+
+
+def fill_participant_config(apps, schema_editor):
+    """
+    Store the participant configuration of surveys configured before it was stored.
+    """
+    Survey = apps.get_model("survey", "Survey")
+    surveys = Survey.objects.filter(participant_config=None).select_related("config")
+    batch = list()
+    for survey in surveys.iterator(chunk_size=500):
+        survey.participant_config = participant_config_for(None if survey.config is None else survey.config.value)
+        batch.append(survey)
+        if len(batch) >= 500:
+            Survey.objects.bulk_update(batch, fields=["participant_config"])
+            batch = list()
+    Survey.objects.bulk_update(batch, fields=["participant_config"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0043_readiness_rollups"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_participant_config, migrations.RunPython.noop),
+    ]
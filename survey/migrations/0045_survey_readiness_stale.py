@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0044_fill_participant_config"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="readiness_stale",
+            field=models.BooleanField(
+                default=True,
+                editable=False,
+                help_text="Have the answers or configuration changed since the readiness totals were worked out?",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0045_survey_readiness_stale"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="responses_version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Incremented whenever a response is added, changed or removed"
+            ),
+        ),
+    ]
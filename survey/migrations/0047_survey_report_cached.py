@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0046_survey_responses_version"),
+    ]
+
+    operations = [
+        # Existing surveys may have figures cached already
+        migrations.AddField(
+            model_name="survey",
+            name="report_cached",
+            field=models.BooleanField(
+                default=True,
+                editable=False,
+                help_text="Have report figures been cached for the current responses_version?",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="survey",
+            name="report_cached",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Have report figures been cached for the current responses_version?",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="survey",
+            name="responses_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Incremented when a response is added, changed or removed while report figures are cached",
+            ),
+        ),
+    ]
@@ -1,29 +1,46 @@
+import collections
+import copy
 import csv
+import hashlib
 import io
 import json
 import logging
+import math
 import random
 import re
 import itertools
 import secrets
 import tempfile
+import uuid
 from functools import cached_property
 from pathlib import Path
-from typing import Generator, ContextManager
+from typing import Generator, ContextManager, Iterable, Optional
 from contextlib import contextmanager
 
 import jsonschema
 import xlsxwriter
 
 from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models.fields.json import KT
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
 from django.http import HttpRequest
 from django.urls import reverse
 import django.core.validators
 
-from home.models import Project
-from survey.schema import field_schema
+from home.models import Organisation, Project
+from survey import answers_codec
+from survey.exceptions import SurveyInactiveError
+from survey.layout import FieldLayout, SurveyLayout, get_layout
+from survey.readiness import readiness_totals
+from survey.registry import data_files
+from survey.response_index import NUMERIC_TEXT_TYPES, OPTION_FIELD_TYPES, ResponseIndex
+from survey.schema import compile_schema, field_schema
+from survey.stats import counted_stats
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +58,47 @@ class Profession(models.TextChoices):
     GENERIC = "Generic", "Generic (Other Professional Groups)"
 
 
+class SurveyConfig(models.Model):
+    """
+    A survey question configuration, stored once however many surveys use it.
+
+    Most surveys use the unmodified questions for their profession, so they share a
+    configuration. Each configuration is identified by a hash of its contents, which
+    is also a stable key for anything derived from it.
+    """
+
+    hash = models.CharField(
+        max_length=64,
+        unique=True,
+        editable=False,
+        help_text="SHA-256 hash of the canonical JSON of the configuration",
+    )
+    value = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.hash
+
+    @staticmethod
+    def canonical_json(value) -> str:
+        """
+        Serialise a configuration so that equal configurations always give the same text.
+        """
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def digest(cls, value) -> str:
+        return hashlib.sha256(cls.canonical_json(value).encode()).hexdigest()
+
+    @classmethod
+    def get_for(cls, value) -> "SurveyConfig":
+        """
+        Get the stored configuration with these contents, storing it if it's new.
+        """
+        config, _ = cls.objects.get_or_create(hash=cls.digest(value), defaults=dict(value=value))
+        return config
+
+
 class Survey(models.Model):
     """
     Represents a survey that will be sent out to a participant
@@ -48,7 +106,13 @@ class Survey(models.Model):
 
     name = models.CharField(max_length=200, help_text="Survey title")
     description = models.TextField(blank=True, null=True)
-    survey_config = models.JSONField(null=True)
+    config = models.ForeignKey(
+        SurveyConfig,
+        on_delete=models.PROTECT,
+        null=True,
+        related_name="surveys",
+        help_text="Question structure",
+    )
     project = models.ForeignKey(
         Project, on_delete=models.CASCADE, null=True, related_name="survey"
     )
@@ -73,10 +137,110 @@ class Survey(models.Model):
         "between your organisation and the University of Sheffield?",
         null=False,
     )
+    config_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Incremented whenever the survey configuration changes",
+    )
+    invitation_generation = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Incremented for each new invitation, which revokes older signed invitation tokens",
+    )
+    participant_config = models.TextField(
+        null=True,
+        editable=False,
+        help_text="Minified JSON of the survey configuration, with only what the participant form uses",
+    )
+    responses_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Incremented when a response is added, changed or removed while report figures are cached",
+    )
+    report_cached = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Have report figures been cached for the current responses_version?",
+    )
+    readiness_stale = models.BooleanField(
+        default=True,
+        editable=False,
+        help_text="Have the answers or configuration changed since the readiness totals were worked out?",
+    )
+
+    #: Field settings the participant form uses for each type of field
+    PARTICIPANT_FIELD_KEYS = {
+        "text": ("enforceValueConstraints", "maxNumChar", "minNumValue", "maxNumValue", "textType"),
+        "textarea": ("enforceValueConstraints", "maxNumChar", "minNumValue", "maxNumValue", "textType"),
+        "radio": ("options", "hasOtherOption"),
+        "checkbox": ("options",),
+        "select": ("options",),
+        "likert": ("options", "sublabels"),
+    }
+    #: Field settings the participant form uses for every type of field
+    PARTICIPANT_COMMON_FIELD_KEYS = ("type", "label", "description", "required")
+    #: Field settings the participant form fills in when they're missing (getDefaultFieldConfig in the UI)
+    PARTICIPANT_FIELD_DEFAULTS = {
+        "description": "",
+        "required": True,
+        "sublabels": [],
+        "options": [],
+        "enforceValueConstraints": False,
+        "maxNumChar": 500,
+        "minNumValue": 0,
+        "maxNumValue": 100,
+        "textType": "PLAIN_TEXT",
+        "hasOtherOption": False,
+    }
 
     def __str__(self):
         return self.name
 
+    @property
+    def survey_config(self) -> Optional[dict]:
+        """
+        The question structure of this survey, stored in a shared SurveyConfig.
+
+        Changes, including to the dictionary in place, are stored when the survey is saved.
+        """
+        return None if self.config is None else self.config.value
+
+    @survey_config.setter
+    def survey_config(self, value: Optional[dict]):
+        self.config = None if value is None else SurveyConfig(value=value)
+        # Forget anything worked out from the previous configuration
+        for name in self.CONFIG_CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+
+    @property
+    def config_hash(self) -> Optional[str]:
+        """
+        Identifies the question structure, for caching things derived from it.
+        """
+        return None if self.config is None else self.config.hash
+
+    def save(self, *args, **kwargs):
+        # Point at the shared configuration with the same contents, if it has changed
+        if Survey.config.is_cached(self) and self.config is not None:
+            digest = SurveyConfig.digest(self.config.value)
+            if self.config.pk is None or self.config.hash != digest:
+                self.config = SurveyConfig.get_for(self.config.value)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # These are changed by UPDATE queries as responses are saved (see
+            # responses_changed()) and invitations are sent (see
+            # Invitation.signed_token()), so don't let a copy loaded earlier undo them,
+            # e.g. bring back revoked invitation tokens. Only SurveyReadiness.refresh()
+            # clears the flag.
+            skipped = {"responses_version", "report_cached", "invitation_generation"}
+            if not self.readiness_stale:
+                skipped.add("readiness_stale")
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def organisation(self):
         return self.project.organisation
@@ -103,10 +267,9 @@ class Survey(models.Model):
     @property
     def consent_config_default(self) -> dict:
         """
-        Survey consent question configuration
+        Survey consent question configuration (shared, so don't modify it)
         """
-        with self.consent_config_path.open() as file:
-            return json.load(file)
+        return data_files.survey_template(settings.CONSENT_TEMPLATE)
 
     @property
     def consent_config(self) -> dict:
@@ -127,10 +290,9 @@ class Survey(models.Model):
     @property
     def demography_config_default(self) -> dict:
         """
-        The default demographics questions configuration
+        The default demographics questions configuration (shared, so don't modify it)
         """
-        with self.demography_config_path.open() as file:
-            return json.load(file)
+        return data_files.survey_template(self.demography_config_filename)
 
     def initialise(self):
         """
@@ -169,16 +331,10 @@ class Survey(models.Model):
         """
         Generate a dummy survey submission based on the questions in this survey.
         """
-        output_data = list()
-
-        for section in self.sections:
-            section_data_output = list()
-            for field in section["fields"]:
-                section_data_output.append(self._generate_random_field_value(field))
-
-            output_data.append(section_data_output)
-
-        return output_data
+        return [
+            [self._generate_random_field_value(field.config) for field in section.fields]
+            for section in self.layout.sections
+        ]
 
     @property
     def sections(self) -> tuple[dict]:
@@ -189,29 +345,23 @@ class Survey(models.Model):
         # survey_config field
         return tuple(self.survey_config["sections"])
 
+    #: Cached properties worked out from survey_config
+    CONFIG_CACHED_PROPERTIES = ("layout", "response_schema", "response_validator", "response_check")
+
+    @cached_property
+    def layout(self) -> SurveyLayout:
+        """
+        The flattened structure of the questions, shared by surveys with the same configuration.
+        """
+        return get_layout(self.survey_config)
+
     def describe_error_path(self, path) -> str:
         """
         Turn a response_schema validation error path (section index, field index,
         and for likert fields a sublabel index) into a human-readable location,
         using this survey's section titles and field labels.
         """
-        path = list(path)
-        if not path:
-            return "Response"
-
-        section = self.sections[path[0]]
-        description = f"Section {path[0] + 1} '{section.get('title', path[0] + 1)}'"
-        if len(path) == 1:
-            return description
-
-        field = section["fields"][path[1]]
-        description += f", field '{field.get('label', path[1] + 1)}'"
-
-        sublabels = field.get("sublabels", [])
-        if len(path) > 2 and field.get("type") == "likert" and path[2] < len(sublabels):
-            description += f" ('{sublabels[path[2]]}')"
-
-        return description
+        return self.layout.describe_path(path)
 
     @cached_property
     def response_schema(self) -> dict:
@@ -241,6 +391,45 @@ class Survey(models.Model):
             "maxItems": len(section_schemas),
         }
 
+    @cached_property
+    def response_validator(self) -> jsonschema.protocols.Validator:
+        """
+        A JSON Schema validator for response answers, compiled once per survey instance
+        so that validating many responses does not rebuild it for each one.
+        """
+        schema = self.response_schema
+        validator_cls = jsonschema.validators.validator_for(schema)
+        return validator_cls(schema)
+
+    @cached_property
+    def response_check(self):
+        """
+        A compiled check that says whether response answers are valid, shared by every
+        survey with the same question configuration (or None if it can't be compiled).
+        """
+        return compile_schema(self.response_schema)
+
+    def response_errors(self, answers) -> list[str]:
+        """
+        Check response answers against this survey's JSON Schema.
+
+        Valid answers are accepted by the compiled check alone; the full JSON Schema
+        validator only runs to describe what is wrong with invalid answers.
+
+        :returns: One human-readable message per failing field (empty if the answers are valid)
+        """
+        if self.response_check is not None and self.response_check(answers):
+            return list()
+
+        errors = sorted(
+            self.response_validator.iter_errors(answers),
+            key=lambda exc: list(exc.absolute_path),
+        )
+        return [
+            f"{self.describe_error_path(exc.absolute_path)}: {exc.message}"
+            for exc in errors
+        ]
+
     @classmethod
     def _generate_random_field_value(cls, field_config):
         field_type = field_config["type"]
@@ -305,6 +494,308 @@ class Survey(models.Model):
         survey_response.save()
         return survey_response
 
+    #: Number of rows inserted per query when accepting a batch of responses
+    BULK_CREATE_BATCH_SIZE = 500
+
+    def accept_responses(
+        self,
+        batch: Iterable[list],
+        allow_inactive: bool = False,
+        submission_keys: Optional[Iterable[Optional[uuid.UUID]]] = None,
+    ) -> list[dict]:
+        """
+        Enter many survey submissions at once.
+
+        Every set of answers is checked against the same compiled response schema, and
+        the valid ones are inserted together in a single transaction. Invalid answers
+        are reported and skipped rather than rejecting the whole batch.
+
+        :param batch: The answers of each submission
+        :param allow_inactive: Accept submissions that were received before the survey was paused
+        :param submission_keys: The submission key of each submission, if any. Submissions
+            that have already been saved are reported as duplicates without being checked.
+        :returns: One report per submission, in order, saying whether it was accepted
+        """
+        if not self.is_active and not allow_inactive:
+            raise SurveyInactiveError("Cannot submit response to an inactive survey")
+
+        batch = list(batch)
+        submission_keys = list(submission_keys) if submission_keys is not None else [None] * len(batch)
+        # Keys of the submissions that have already been saved
+        seen_keys = set(
+            self.survey_response.filter(
+                submission_key__in=[key for key in submission_keys if key is not None]
+            ).values_list("submission_key", flat=True)
+        )
+
+        report = list()
+        survey_responses = list()
+        for index, (answers, submission_key) in enumerate(zip(batch, submission_keys)):
+            if submission_key is not None and submission_key in seen_keys:
+                report.append(dict(index=index, accepted=True, duplicate=True, errors=list()))
+                continue
+
+            errors = self.response_errors(answers)
+            report.append(dict(index=index, accepted=not errors, duplicate=False, errors=errors))
+            if not errors:
+                survey_response = SurveyResponse(survey=self, answers=answers, submission_key=submission_key)
+                survey_response.record_validation(errors)
+                survey_responses.append(survey_response)
+                if submission_key is not None:
+                    seen_keys.add(submission_key)
+
+        with transaction.atomic():
+            SurveyResponse.objects.bulk_create(
+                survey_responses, batch_size=self.BULK_CREATE_BATCH_SIZE
+            )
+            SurveyAnswer.replace_for(survey_responses, new=True)
+            # Submissions received before the survey closed change its report
+            if survey_responses and not self.is_active:
+                self.report_snapshots.all().delete()
+
+        return report
+
+    #: Number of responses re-validated per query when the survey configuration has changed
+    REVALIDATE_BATCH_SIZE = 500
+
+    def refresh_response_validation(self) -> int:
+        """
+        Validate the responses that haven't yet been checked against the current
+        survey configuration, and record the outcome on each of them.
+
+        Responses are validated when they're saved, so this only has work to do after
+        the configuration changes or for responses saved before validation was recorded.
+
+        :returns: The number of responses that were validated
+        """
+        stale = self.survey_response.exclude(validated_config_version=self.config_version).order_by("pk")
+        count = 0
+        last_pk = 0
+        while batch := list(stale.filter(pk__gt=last_pk).only("pk", "answers")[: self.REVALIDATE_BATCH_SIZE]):
+            for survey_response in batch:
+                # Use this survey, so its compiled schema is shared rather than loaded per response
+                survey_response.survey = self
+                survey_response.record_validation()
+            SurveyResponse.objects.bulk_update(batch, fields=SurveyResponse.VALIDATION_FIELDS)
+            SurveyAnswer.replace_for(batch)
+            count += len(batch)
+            last_pk = batch[-1].pk
+        if count:
+            logger.info("Validated %s responses to survey %s", count, self.pk)
+        return count
+
+    def response_stats(self) -> Optional[dict]:
+        """
+        Summary statistics of the answers of valid responses to each question, as shown
+        in the report.
+
+        Options are counted as responses are saved (see SurveyFieldAggregate), so only
+        the answers to free text questions are read.
+
+        :returns: The statistics, or None if there are no valid responses
+        """
+        self.refresh_response_validation()
+        valid_responses = self.survey_response.filter(is_valid=True)
+        if not valid_responses.exists():
+            return None
+
+        counts = {
+            (column, option): count
+            for column, option, count in self.field_aggregates.values_list("column", "option", "count")
+        }
+        text_columns = [field.column for field in self.layout.fields if field.type in {"text", "textarea"}]
+        text_values = {column: list() for column in text_columns}
+        if text_columns:
+            rows = valid_responses.order_by("pk").values_list(*(KT(f"row__{column}") for column in text_columns))
+            for row in rows.iterator(chunk_size=self.REVALIDATE_BATCH_SIZE):
+                for column, value in zip(text_columns, row):
+                    if value is not None:
+                        text_values[column].append(value)
+        return counted_stats(self.layout, counts, text_values)
+
+    #: How long to keep data worked out from a survey's responses, in seconds
+    REPORT_CACHE_TIMEOUT = 60 * 60
+
+    def report_cache_key(self, name: str) -> str:
+        """
+        A cache key for something worked out from this survey's responses, which
+        changes when any response is added, changed or removed, or the questions change.
+        """
+        # Marked before the responses are read, so that any change saved from now on
+        # moves on to a new version (see responses_changed())
+        Survey.objects.filter(pk=self.pk, report_cached=False).update(report_cached=True)
+        # Read again, in case responses have changed since this survey was loaded
+        responses_version = Survey.objects.filter(pk=self.pk).values_list("responses_version", flat=True).first()
+        return f"{name}:{self.pk}:{self.config_hash}:{responses_version}"
+
+    @staticmethod
+    def responses_changed(survey_ids: Iterable[int]):
+        """
+        Record that responses to some surveys have been added, changed or removed, so
+        that their cached report figures (see report_cache_key()) and their readiness
+        totals (see SurveyReadiness) are worked out again.
+
+        Surveys are only written to if something has been worked out since they last
+        changed, so that a busy survey's row isn't locked by every submission.
+        """
+        Survey.objects.filter(
+            models.Q(report_cached=True) | models.Q(readiness_stale=False), pk__in=survey_ids
+        ).update(
+            responses_version=models.Case(
+                models.When(report_cached=True, then=models.F("responses_version") + 1),
+                default=models.F("responses_version"),
+                output_field=models.PositiveIntegerField(),
+            ),
+            report_cached=False,
+            readiness_stale=True,
+        )
+
+    def report_data(self) -> dict:
+        """
+        The figures shared by the report, evidence gathering and improvement plan
+        pages: the statistics of the valid responses (see response_stats()), and the
+        number of responses that are and aren't valid.
+
+        These are cached, so moving between the pages doesn't work them out again, and
+        kept for good once the survey is closed (see report_snapshot()).
+        """
+        snapshot = self.report_snapshot()
+        if snapshot is not None:
+            return snapshot.data
+        return self.live_report_data()
+
+    def report_filter_options(self) -> list[dict]:
+        """
+        The demographic questions that the report can be filtered by (see live_filter_options()).
+        """
+        snapshot = self.report_snapshot()
+        if snapshot is not None:
+            return snapshot.data["filter_options"]
+        return self.live_filter_options()
+
+    def live_filter_options(self) -> list[dict]:
+        """
+        The demographic questions that responses can be filtered by (see
+        ResponseIndex.select()), with the options to choose from, or the range of
+        numbers given.
+
+        These are read from the SurveyAnswer table, and the rows of data of any
+        questions with an "other" option, so the report page doesn't need the whole
+        ResponseIndex to be built.
+        """
+        self.refresh_response_validation()
+        filters = list()
+        for section in self.layout.sections:
+            if section.type != "demographic":
+                continue
+            for field in section.fields:
+                if field.config.get("disabled"):
+                    continue
+                filter_ = dict(section=section.index, field=field.index, label=field.label)
+                if field.type in OPTION_FIELD_TYPES:
+                    options = list(field.config.get("options", ()))
+                    if field.config.get("hasOtherOption"):
+                        options.extend(sorted(self.other_answers(field) - set(options)))
+                    filters.append(dict(filter_, options=options))
+                elif field.type == "text" and field.config.get("textType") in NUMERIC_TEXT_TYPES:
+                    numbers = self.answer_facts.filter(column=field.column).aggregate(
+                        min=models.Min("value"), max=models.Max("value")
+                    )
+                    filters.append(dict(filter_, min=numbers["min"] or 0, max=numbers["max"] or 0))
+        return filters
+
+    def other_answers(self, field: FieldLayout) -> set[str]:
+        """
+        The different answers given to a multiple-choice question by valid responses,
+        including those typed in as "other".
+        """
+        values = (
+            self.survey_response.filter(is_valid=True)
+            .values_list(KT(f"row__{field.column}"), flat=True)
+            .order_by()
+            .distinct()
+        )
+        answers = set()
+        for value in values:
+            # The options chosen in a checkbox field are joined into one value
+            answers.update(value.split(", ") if field.type == "checkbox" else [value])
+        answers.discard("")
+        answers.discard(None)
+        return answers
+
+    def report_snapshot(self) -> Optional["SurveyReportSnapshot"]:
+        """
+        The stored report figures of a closed survey, which can't change until it's
+        reopened. They're stored again if the questions have changed since.
+
+        :returns: The snapshot, or None if the survey is collecting responses
+        """
+        if self.is_active:
+            return None
+        snapshot = self.report_snapshots.filter(config_hash=self.config_hash).first()
+        if snapshot is None:
+            snapshot = self.freeze_report()
+        return snapshot
+
+    def freeze_report(self) -> "SurveyReportSnapshot":
+        """
+        Store the report figures of this survey, replacing any stored before.
+        """
+        data = dict(self.live_report_data(), filter_options=self.live_filter_options())
+        with transaction.atomic():
+            self.report_snapshots.all().delete()
+            return self.report_snapshots.create(config_hash=self.config_hash, data=data)
+
+    def live_report_data(self) -> dict:
+        """
+        The report figures of the responses as they are now (see report_data()).
+        """
+        key = self.report_cache_key("survey_report_data")
+        data = cache.get(key)
+        if data is None:
+            survey_stats = self.response_stats()
+            counts = dict(
+                self.survey_response.values_list("is_valid").annotate(count=models.Count("pk")).order_by()
+            )
+            data = dict(
+                survey_stats=survey_stats,
+                response_count=sum(counts.values()),
+                invalid_response_count=counts.get(False, 0),
+            )
+            cache.set(key, data, timeout=self.REPORT_CACHE_TIMEOUT)
+        return data
+
+    def response_index(self) -> ResponseIndex:
+        """
+        Bitmap indexes of the answers of valid responses, for filtering the report.
+
+        The index is cached, and built again when responses are added or the survey
+        configuration changes.
+        """
+        key = self.report_cache_key("survey_response_index")
+        index = cache.get(key)
+        if index is None:
+            self.refresh_response_validation()
+            index = ResponseIndex(
+                self.layout,
+                self.survey_response.filter(is_valid=True)
+                .order_by("pk")
+                .values_list("answers", flat=True)
+                .iterator(chunk_size=self.REVALIDATE_BATCH_SIZE),
+            )
+            cache.set(key, index, timeout=self.REPORT_CACHE_TIMEOUT)
+        else:
+            index.layout = self.layout
+        return index
+
+    @property
+    def invalid_responses_count(self) -> int:
+        """
+        The number of responses that don't match the survey configuration, as
+        recorded when they were last validated.
+        """
+        return self.survey_response.filter(is_valid=False).count()
+
     @property
     def responses_count(self) -> int:
         """
@@ -323,34 +814,75 @@ class Survey(models.Model):
         """
         Iterate over all field (and sub-field) labels.
         """
-        for section in self.sections:
-            for field in section["fields"]:
-                if field["type"] == "likert":
-                    yield from field["sublabels"]
-                else:
-                    yield field["label"]
+        yield from self.layout.headers
 
     @property
     def fields(self) -> tuple[str]:
         """
         Survey questions/field names
         """
-        return tuple(self.fields_iter())
+        return self.layout.headers
+
+    def answers_from_values(self, values: Iterable[str]) -> list[list]:
+        """
+        Rebuild the nested answers of a response from a flat row of values, such as a
+        row of the CSV export, aligned column-for-column with fields_iter().
+
+        This reverses SurveyResponse.answers_values, so likert fields take one value
+        per sub-label, and checkbox fields split their selected options apart.
+        Missing values are blank.
+        """
+        values = iter(values)
+        answers = list()
+        for section in self.layout.sections:
+            section_answers = list()
+            for field in section.fields:
+                if field.type == "likert":
+                    section_answers.append([next(values, "") for _ in field.sublabels])
+                elif field.type == "checkbox":
+                    section_answers.append(
+                        self._split_options(next(values, ""), field.config.get("options", []))
+                    )
+                else:
+                    section_answers.append(next(values, ""))
+            answers.append(section_answers)
+        return answers
+
+    @staticmethod
+    def _split_options(value: str, options: list[str]) -> list[str]:
+        """
+        Split the selected options of a checkbox field that were joined with ", ",
+        matching the field's options first because they may contain ", " too.
+        """
+        options = sorted(options, key=len, reverse=True)
+        selected = list()
+        while value:
+            option = next(
+                (option for option in options if value == option or value.startswith(f"{option}, ")),
+                value.split(", ", 1)[0],
+            )
+            selected.append(option)
+            value = value[len(option) + 2:]
+        return selected
 
     def responses_iter_values(self):
         """
         Iterate over all responses, with the answers flattened to a row of data
         """
-        # Iterate over survey response answer fields
-        for survey_response in self.survey_response.all():
-            yield survey_response.answers_values
+        # Each response's row is stored when it's validated, so only the responses saved
+        # before the configuration last changed need flattening again
+        self.refresh_response_validation()
+        yield from self.survey_response.values_list("row", flat=True).iterator(
+            chunk_size=self.REVALIDATE_BATCH_SIZE
+        )
 
     def responses_iter(self) -> Generator[dict[str, str], None, None]:
         """
         Generate an iterable of flat dictionaries, each with questions and answers for this survey.
         """
+        fields = self.fields
         for answers_values in self.responses_iter_values():
-            yield dict(itertools.zip_longest(self.fields, answers_values))
+            yield dict(itertools.zip_longest(fields, answers_values))
 
     def to_csv(self, **kwargs) -> str:
         """
@@ -432,10 +964,9 @@ class Survey(models.Model):
     @property
     def sort_config(self) -> dict:
         """
-        The SORT section configuration for this profession.
+        The SORT section configuration for this profession (shared, so don't modify it)
         """
-        with self.template_path.open() as file:
-            return json.load(file)
+        return data_files.survey_template(self.template_filename)
 
     def reset(self):
         """
@@ -452,12 +983,64 @@ class Survey(models.Model):
 
         The consent and demographics fields may be overridden by the user, while the SORT questions are hard-coded.
         """
-        self.survey_config = {
+        # Copy the sections, because the templates are shared
+        self.survey_config = copy.deepcopy({
             # Merge sections by concatenating all questions
             "sections": consent_config["sections"]
             + self.sort_config["sections"]
             + demography_config["sections"]
-        }
+        })
+        self.config_version += 1
+        self.participant_config = self.build_participant_config()
+        self.readiness_stale = True
+
+    def build_participant_config(self) -> str:
+        """
+        Serialise the survey configuration for participants (see participant_config_for()).
+        """
+        return self.participant_config_for(self.survey_config)
+
+    @classmethod
+    def participant_config_for(cls, survey_config: Optional[dict]) -> str:
+        """
+        Serialise a survey configuration for participants, leaving out settings that
+        only survey managers use.
+
+        Disabled fields are kept as placeholders so that each answer stays at the
+        same position as its field.
+        """
+        sections = list()
+        for section in (survey_config or {}).get("sections", []):
+            fields = list()
+            for field in section["fields"]:
+                if field.get("disabled"):
+                    fields.append(dict(type=field["type"], disabled=True))
+                    continue
+                keys = cls.PARTICIPANT_COMMON_FIELD_KEYS + cls.PARTICIPANT_FIELD_KEYS.get(field["type"], ())
+                participant_field = {key: field[key] for key in keys if key in field}
+                for key, default in cls.PARTICIPANT_FIELD_DEFAULTS.items():
+                    if participant_field.get(key) == default:
+                        del participant_field[key]
+                fields.append(participant_field)
+            sections.append(
+                dict(
+                    title=section.get("title", ""),
+                    type=section.get("type", ""),
+                    description=section.get("description", ""),
+                    fields=fields,
+                )
+            )
+        return json.dumps(dict(sections=sections), separators=(",", ":"), ensure_ascii=False)
+
+    @property
+    def participant_config_json(self) -> str:
+        """
+        The participant view of the survey configuration, for surveys configured
+        before it was stored.
+        """
+        if self.participant_config is None:
+            return self.build_participant_config()
+        return self.participant_config
 
 
 class SurveyEvidenceSection(models.Model):
@@ -522,6 +1105,41 @@ class SurveyEvidenceFile(models.Model):
     )
 
 
+class AnswersField(models.JSONField):
+    """
+    Survey response answers, which may be stored in the compact form described in
+    survey.answers_codec. They're always the usual nested lists in Python.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return answers_codec.decode_stored(super().from_db_value(value, expression, connection))
+
+    def pre_save(self, model_instance, add):
+        return model_instance.stored_answers()
+
+
+class SurveyReportSnapshot(models.Model):
+    """
+    The report figures of a closed survey, stored when it's closed so that looking
+    at its report again doesn't work them out again. See Survey.report_snapshot().
+    """
+
+    survey = models.ForeignKey(Survey, on_delete=models.CASCADE, related_name="report_snapshots")
+    config_hash = models.CharField(max_length=64, help_text="Hash of the survey configuration the figures are for")
+    data = models.JSONField(help_text="Statistics, response counts and filter options, as Survey.report_data()")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Survey {self.survey_id} report snapshot {self.pk}"
+
+    @property
+    def etag(self) -> str:
+        """
+        Identifies this snapshot, for conditional requests.
+        """
+        return hashlib.sha256(f"{self.pk}:{self.created_at.isoformat()}".encode()).hexdigest()[:32]
+
+
 class SurveyResponse(models.Model):
     """
     Represents a single response to the survey from a participant
@@ -530,8 +1148,44 @@ class SurveyResponse(models.Model):
     survey = models.ForeignKey(
         Survey, related_name="survey_response", on_delete=models.CASCADE
     )  # Many questions belong to one survey
-    answers = models.JSONField()
+    answers = AnswersField()
     created_at = models.DateTimeField(auto_now_add=True)
+    submission_key = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Generated by the participant's browser so that a repeated submission isn't saved twice",
+    )
+    is_valid = models.BooleanField(
+        null=True,
+        editable=False,
+        help_text="Whether the answers matched the survey configuration when they were last validated",
+    )
+    error_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="The number of validation errors when the answers were last validated",
+    )
+    validated_config_version = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        help_text="The survey configuration version the answers were last validated against",
+    )
+    row = models.JSONField(
+        null=True,
+        editable=False,
+        help_text="The answers as a row of data, in the order of the survey's fields when they were last validated",
+    )
+
+    #: The fields that record the outcome of validation, and the row of data prepared at the same time
+    VALIDATION_FIELDS = ("is_valid", "error_count", "validated_config_version", "row")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["survey", "submission_key"], name="unique_survey_response_submission_key"
+            ),
+        ]
 
     def __str__(self):
         return f"Survey {self.survey.pk} response {self.pk}"
@@ -539,6 +1193,40 @@ class SurveyResponse(models.Model):
     def get_absolute_url(self, token):
         return reverse("survey", kwargs={"pk": self.survey.pk})
 
+    def record_validation(self, errors: Optional[list[str]] = None) -> list[str]:
+        """
+        Validate response answers against this survey's JSON Schema, and record the
+        outcome on this response (without saving it). The answers are also flattened
+        into a row of data for exports, which depends on the same survey configuration.
+
+        :param errors: The validation errors, if the answers have already been checked
+        :returns: One human-readable message per failing field (empty if the answers are valid)
+        """
+        if errors is None:
+            errors = self.survey.response_errors(self.answers)
+        self.is_valid = not errors
+        self.error_count = len(errors)
+        self.validated_config_version = self.survey.config_version
+        self.row = list(self.answers_values)
+        self._validated_answers = copy.deepcopy(self.answers)
+        return errors
+
+    #: The answers as they were when record_validation() was last called on this object
+    _validated_answers = None
+
+    def is_validated(self) -> bool:
+        """
+        Have these answers been checked against the current survey configuration?
+
+        Only answers checked by this object count: answers loaded from the database
+        may have been changed since, e.g. in the admin site.
+        """
+        return (
+            self.validated_config_version == self.survey.config_version
+            and self._validated_answers is not None
+            and self._validated_answers == self.answers
+        )
+
     def validate(self) -> None:
         """
         Validate response answers against this survey's JSON Schema.
@@ -546,19 +1234,33 @@ class SurveyResponse(models.Model):
         Raises django.core.exceptions.ValidationError, with one message per
         failing field, if the answers do not match.
         """
-        schema = self.survey.response_schema
-        validator_cls = jsonschema.validators.validator_for(schema)
-        errors = sorted(
-            validator_cls(schema).iter_errors(self.answers),
-            key=lambda exc: list(exc.absolute_path),
-        )
+        errors = self.record_validation()
         if errors:
-            raise ValidationError(
-                [
-                    f"{self.survey.describe_error_path(exc.absolute_path)}: {exc.message}"
-                    for exc in errors
-                ]
-            )
+            raise ValidationError(errors)
+
+    def save(self, *args, **kwargs):
+        # Record whether the answers are valid, unless they've just been checked or
+        # there's no survey configuration to check them against yet. The stored answers
+        # and row of data depend on it.
+        if self.survey.survey_config is not None and not self.is_validated():
+            self.record_validation()
+        new = self._state.adding
+        super().save(*args, **kwargs)
+        SurveyAnswer.replace_for([self], new=new)
+
+    def stored_answers(self):
+        """
+        The answers as they're written to the database. If the SURVEY_ENCODE_ANSWERS
+        setting is on, valid answers are encoded against the survey configuration.
+        """
+        if (
+            not settings.SURVEY_ENCODE_ANSWERS
+            or not self.is_valid
+            or self.validated_config_version != self.survey.config_version
+            or self.survey.config_id is None
+        ):
+            return self.answers
+        return answers_codec.encode_stored(self.answers, self.survey.config_id, self.survey.layout)
 
     def clean(self):
         super().clean()
@@ -586,25 +1288,21 @@ class SurveyResponse(models.Model):
         so every row still lines up with the header, rather than silently dropping the
         remaining columns.
         """
-        for section_index, section in enumerate(self.survey.sections):
-            section_answers = self._section_answers(section_index)
-            for field_index, field in enumerate(section["fields"]):
-                answer = (
-                    section_answers[field_index]
-                    if field_index < len(section_answers)
-                    else None
-                )
-                if field["type"] == "likert":
-                    sublabels = field.get("sublabels", [])
+        for section in self.survey.layout.sections:
+            section_answers = self._section_answers(section.index)
+            num_answers = len(section_answers)
+            for field in section.fields:
+                answer = section_answers[field.index] if field.index < num_answers else None
+                if field.type == "likert":
                     selected = self._as_list(answer)
-                    for sublabel_index in range(len(sublabels)):
+                    for sublabel_index in range(len(field.sublabels)):
                         yield (
                             selected[sublabel_index]
                             if sublabel_index < len(selected)
                             else ""
                         )
-                elif field["type"] == "checkbox":
-                    yield ", ".join(self._as_list(answer))
+                elif field.type == "checkbox":
+                    yield ", ".join(map(str, self._as_list(answer)))
                 else:
                     yield "" if answer is None else answer
 
@@ -631,6 +1329,567 @@ class SurveyResponse(models.Model):
         return answer if isinstance(answer, list) else [answer]
 
 
+class SurveyAnswerQuerySet(models.QuerySet):
+    def histogram(self):
+        """
+        The number of times each option was chosen, for each column.
+        """
+        return (
+            self.exclude(option=None)
+            .values("column", "option")
+            .annotate(count=models.Count("pk"))
+            .order_by("column", "option")
+        )
+
+    def means(self):
+        """
+        The mean numeric answer of each column.
+        """
+        return (
+            self.exclude(value=None)
+            .values("column")
+            .annotate(mean=models.Avg("value"), count=models.Count("value"))
+            .order_by("column")
+        )
+
+    def for_respondents_who_chose(self, column: int, option: int):
+        """
+        Only the answers of responses that chose an option in a column, for example
+        a demographic group.
+        """
+        return self.filter(
+            response__in=SurveyAnswer.objects.filter(column=column, option=option).values("response")
+        )
+
+
+class SurveyAnswer(models.Model):
+    """
+    One answer of a valid survey response, in a form that can be counted and averaged
+    in the database.
+
+    There is one row per column of the response's row of data (see
+    Survey.fields_iter()), with the position of the chosen option and the answer as a
+    number where it has one, and one row per chosen option of checkbox fields. Free
+    text that isn't a number is left out. These are derived from
+    SurveyResponse.answers, and rebuilt whenever they may have changed.
+    """
+
+    response = models.ForeignKey(SurveyResponse, on_delete=models.CASCADE, related_name="answer_facts")
+    survey = models.ForeignKey(Survey, on_delete=models.CASCADE, related_name="answer_facts")
+    column = models.PositiveIntegerField(help_text="Position of the question in a row of data")
+    option = models.PositiveIntegerField(null=True, help_text="Position of the chosen option")
+    value = models.FloatField(null=True, help_text="The answer, if it's a number")
+
+    objects = SurveyAnswerQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["survey", "column", "option"]),
+            models.Index(fields=["survey", "column", "value"]),
+        ]
+
+    @classmethod
+    def from_response(cls, survey_response: SurveyResponse) -> Generator["SurveyAnswer", None, None]:
+        """
+        The answers of a response, which must be valid for its survey's configuration.
+        """
+        layout = survey_response.survey.layout
+        for field in layout.fields:
+            answer = survey_response.answers[field.section_index][field.index]
+            if field.type == "likert":
+                values = enumerate(answer, start=field.column)
+            elif field.type == "checkbox":
+                values = ((field.column, value) for value in answer)
+            else:
+                values = ((field.column, answer),)
+            for column, value in values:
+                option = field.option_indexes.get(value)
+                number = cls.as_number(value)
+                if option is None and number is None:
+                    continue
+                yield cls(
+                    response_id=survey_response.pk,
+                    survey_id=survey_response.survey_id,
+                    column=column,
+                    option=option,
+                    value=number,
+                )
+
+    @staticmethod
+    def as_number(value) -> Optional[float]:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        # Not a number, or infinity, can't be averaged
+        return number if math.isfinite(number) else None
+
+    #: Number of rows inserted per query
+    BULK_CREATE_BATCH_SIZE = 2000
+
+    @classmethod
+    def replace_for(cls, survey_responses: Iterable[SurveyResponse], new: bool = False) -> int:
+        """
+        Replace the stored answers of some responses with their current answers.
+        Invalid responses have no stored answers.
+
+        :param new: The responses have just been created, so have no stored answers yet
+        :returns: The number of answers stored
+        """
+        survey_responses = list(survey_responses)
+        answers = [
+            answer
+            for survey_response in survey_responses
+            if survey_response.is_valid
+            for answer in cls.from_response(survey_response)
+        ]
+        changes = collections.Counter(
+            (answer.survey_id, answer.column, answer.option) for answer in answers if answer.option is not None
+        )
+        with transaction.atomic():
+            if not new:
+                old_answers = cls.objects.filter(
+                    response__in=[survey_response.pk for survey_response in survey_responses]
+                )
+                changes.subtract(SurveyFieldAggregate.counts_of(old_answers))
+                old_answers.delete()
+            cls.objects.bulk_create(answers, batch_size=cls.BULK_CREATE_BATCH_SIZE)
+            SurveyFieldAggregate.add(changes)
+            Survey.responses_changed({survey_response.survey_id for survey_response in survey_responses})
+        return len(answers)
+
+
+class SurveyFieldAggregate(models.Model):
+    """
+    The number of valid responses to a survey that chose each option of each column,
+    so that report statistics can be worked out without reading every response.
+
+    These are totals of the SurveyAnswer table, which are changed in the same
+    transaction as it is (see SurveyAnswer.replace_for()). Every option has a single
+    value, so the mean, minimum and maximum of each column follow from these counts.
+    Free text isn't counted.
+    """
+
+    survey = models.ForeignKey(Survey, on_delete=models.CASCADE, related_name="field_aggregates")
+    column = models.PositiveIntegerField(help_text="Position of the question in a row of data")
+    option = models.PositiveIntegerField(help_text="Position of the option")
+    count = models.IntegerField(default=0, help_text="Number of times the option was chosen")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["survey", "column", "option"], name="unique_survey_field_aggregate"),
+        ]
+
+    #: Number of counts changed per query
+    UPDATE_BATCH_SIZE = 200
+
+    @staticmethod
+    def counts_of(survey_answers: models.QuerySet) -> dict[tuple[int, int, int], int]:
+        """
+        Count some answers, by survey, column and option.
+        """
+        return {
+            (row["survey"], row["column"], row["option"]): row["count"]
+            for row in survey_answers.exclude(option=None)
+            .values("survey", "column", "option")
+            .annotate(count=models.Count("pk"))
+            .order_by()
+        }
+
+    @classmethod
+    def add(cls, changes: dict[tuple[int, int, int], int]):
+        """
+        Change the counts of some options.
+
+        :param changes: The number to add to each count, by survey, column and option
+        """
+        changes = {key: change for key, change in changes.items() if change}
+        for batch in itertools.batched(changes.items(), cls.UPDATE_BATCH_SIZE):
+            with transaction.atomic():
+                # Make sure there's a row for every count, then change them all at once
+                cls.objects.bulk_create(
+                    [cls(survey_id=key[0], column=key[1], option=key[2]) for key, _ in batch],
+                    ignore_conflicts=True,
+                )
+                cls.objects.filter(
+                    survey__in={survey_id for (survey_id, _, _), _ in batch},
+                    column__in={column for (_, column, _), _ in batch},
+                    option__in={option for (_, _, option), _ in batch},
+                ).update(
+                    count=models.F("count")
+                    + models.Case(
+                        *(
+                            models.When(survey=survey_id, column=column, option=option, then=change)
+                            for (survey_id, column, option), change in batch
+                        ),
+                        default=0,
+                    )
+                )
+
+    @classmethod
+    def rebuild(cls, survey: Survey) -> int:
+        """
+        Count the answers to a survey again, from the SurveyAnswer table.
+
+        :returns: The number of counts stored
+        """
+        aggregates = [
+            cls(survey_id=survey_id, column=column, option=option, count=count)
+            for (survey_id, column, option), count in cls.counts_of(survey.answer_facts.all()).items()
+        ]
+        with transaction.atomic():
+            survey.field_aggregates.all().delete()
+            cls.objects.bulk_create(aggregates, batch_size=SurveyAnswer.BULK_CREATE_BATCH_SIZE)
+            SurveyReadiness.refresh(survey)
+        return len(aggregates)
+
+
+@receiver(pre_delete, sender=SurveyResponse)
+def _uncount_survey_response(sender, instance, origin=None, **kwargs):
+    # Take a deleted response's answers out of the counts, unless its whole survey is
+    # being deleted along with them
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin_model is not SurveyResponse:
+        return
+    changes = collections.Counter()
+    changes.subtract(SurveyFieldAggregate.counts_of(instance.answer_facts.all()))
+    SurveyFieldAggregate.add(changes)
+    Survey.responses_changed({instance.survey_id})
+
+
+class ReadinessRollup(models.Model):
+    """
+    The sum and number of the answers to the scored question of each SORT section (see
+    survey.readiness.readiness_columns()), for working out mean readiness scores
+    without reading any responses.
+
+    Sections are identified by their title, so that the same section of different
+    surveys is added up together.
+    """
+
+    title = models.CharField(max_length=200, help_text="SORT section title")
+    score_total = models.FloatField(default=0, help_text="Sum of the answers")
+    answer_count = models.IntegerField(default=0, help_text="Number of answers")
+
+    #: The survey, project or organisation that the totals are for
+    OWNER_FIELD: str
+
+    class Meta:
+        abstract = True
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.score_total / self.answer_count if self.answer_count else None
+
+    @classmethod
+    def add(cls, changes: dict[tuple[int, str], tuple[float, int]]):
+        """
+        Change some totals.
+
+        :param changes: The amount to add to the sum and number of answers, by owner and section title
+        """
+        changes = {key: change for key, change in changes.items() if any(change)}
+        for batch in itertools.batched(changes.items(), SurveyFieldAggregate.UPDATE_BATCH_SIZE):
+            with transaction.atomic():
+                # Make sure there's a row for every total, then change them all at once
+                cls.objects.bulk_create(
+                    [cls(**{f"{cls.OWNER_FIELD}_id": owner_id, "title": title}) for (owner_id, title), _ in batch],
+                    ignore_conflicts=True,
+                )
+
+                def changed(index: int, field_name: str) -> models.Case:
+                    return models.Case(
+                        *(
+                            models.When(**{cls.OWNER_FIELD: owner_id, "title": title}, then=change[index])
+                            for (owner_id, title), change in batch
+                        ),
+                        default=0,
+                        output_field=cls._meta.get_field(field_name),
+                    )
+
+                cls.objects.filter(
+                    **{
+                        f"{cls.OWNER_FIELD}__in": {owner_id for (owner_id, _), _ in batch},
+                        "title__in": {title for (_, title), _ in batch},
+                    }
+                ).update(
+                    score_total=models.F("score_total") + changed(0, "score_total"),
+                    answer_count=models.F("answer_count") + changed(1, "answer_count"),
+                )
+
+    @classmethod
+    def means_for(cls, owner_ids: Iterable[int]) -> dict[int, dict[str, float]]:
+        """
+        The mean score of each section, for some surveys, projects or organisations.
+
+        :returns: The means by owner, then section title
+        """
+        means = collections.defaultdict(dict)
+        rollups = cls.objects.filter(**{f"{cls.OWNER_FIELD}__in": owner_ids}).exclude(answer_count__lte=0)
+        for rollup in rollups:
+            means[getattr(rollup, f"{cls.OWNER_FIELD}_id")][rollup.title] = rollup.mean
+        return means
+
+    @classmethod
+    def combined_means(cls, owner_ids: Iterable[int]) -> dict[str, float]:
+        """
+        The mean score of each section over all the answers of some surveys, projects
+        or organisations together, e.g. only the projects that a user can see.
+
+        :returns: The means by section title
+        """
+        totals = (
+            cls.objects.filter(**{f"{cls.OWNER_FIELD}__in": owner_ids})
+            .values("title")
+            .annotate(score_total=models.Sum("score_total"), answer_count=models.Sum("answer_count"))
+            .filter(answer_count__gt=0)
+        )
+        return {total["title"]: total["score_total"] / total["answer_count"] for total in totals}
+
+
+class SurveyReadiness(ReadinessRollup):
+    """
+    The readiness totals of one survey's valid responses, worked out from its
+    SurveyFieldAggregate counts. Any change is added to the totals of its project
+    and organisation, so that those are never added up again.
+
+    Saving a response only marks its survey as stale (see Survey.responses_changed());
+    the totals are worked out again when they're next read (see refresh_stale()), so
+    that participants' submissions don't wait on, or queue behind, the rollups.
+    """
+
+    survey = models.ForeignKey(Survey, on_delete=models.CASCADE, related_name="readiness")
+
+    OWNER_FIELD = "survey"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["survey", "title"], name="unique_survey_readiness"),
+        ]
+
+    @classmethod
+    def refresh_stale(cls, surveys: models.QuerySet) -> int:
+        """
+        Work out the totals of those surveys whose answers have changed since they were last worked out.
+
+        :returns: The number of surveys refreshed
+        """
+        stale = list(surveys.filter(readiness_stale=True).select_related("config"))
+        for survey in stale:
+            cls.refresh(survey)
+        return len(stale)
+
+    @classmethod
+    def refresh(cls, survey: Survey):
+        """
+        Work out the totals of a survey again, and update its project and organisation.
+        """
+        with transaction.atomic():
+            # Lock the survey before reading its counts, so that a refresh running at
+            # the same time waits for this one and then reads the totals it wrote,
+            # rather than adding the same changes twice
+            Survey.objects.filter(pk=survey.pk).update(readiness_stale=False)
+            totals = dict()
+            if survey.config is not None:
+                counts = {
+                    (column, option): count
+                    for column, option, count in survey.field_aggregates.values_list("column", "option", "count")
+                }
+                totals = readiness_totals(survey.layout, counts)
+            old_totals = {
+                rollup.title: (rollup.score_total, rollup.answer_count) for rollup in survey.readiness.all()
+            }
+            changes = dict()
+            for title in old_totals.keys() | totals.keys():
+                score_total, answer_count = totals.get(title, (0.0, 0))
+                old_score_total, old_answer_count = old_totals.get(title, (0.0, 0))
+                if (score_total, answer_count) != (old_score_total, old_answer_count):
+                    changes[title] = (score_total - old_score_total, answer_count - old_answer_count)
+            if not changes:
+                return
+            survey.readiness.all().delete()
+            cls.objects.bulk_create(
+                cls(survey=survey, title=title, score_total=score_total, answer_count=answer_count)
+                for title, (score_total, answer_count) in totals.items()
+            )
+            cls.add_to_rollups(survey, changes)
+
+    @staticmethod
+    def add_to_rollups(survey: Survey, changes: dict[str, tuple[float, int]]):
+        """
+        Add changes to a survey's totals to those of its project and organisation.
+        """
+        if survey.project_id is None:
+            return
+        organisation_id = Project.objects.filter(pk=survey.project_id).values_list("organisation", flat=True).first()
+        ProjectReadiness.add({(survey.project_id, title): change for title, change in changes.items()})
+        if organisation_id is not None:
+            OrganisationReadiness.add({(organisation_id, title): change for title, change in changes.items()})
+
+    @classmethod
+    def rebuild_rollups(cls) -> int:
+        """
+        Add up the totals of every project and organisation again, from those of their surveys.
+
+        :returns: The number of totals stored
+        """
+        rollups = list()
+        owners = ((ProjectReadiness, "survey__project"), (OrganisationReadiness, "survey__project__organisation"))
+        for rollup_class, owner in owners:
+            rollups.extend(
+                rollup_class(
+                    **{f"{rollup_class.OWNER_FIELD}_id": row[owner], "title": row["title"]},
+                    score_total=row["score_total"],
+                    answer_count=row["answer_count"],
+                )
+                for row in cls.objects.exclude(**{owner: None})
+                .values(owner, "title")
+                .annotate(score_total=models.Sum("score_total"), answer_count=models.Sum("answer_count"))
+                .order_by()
+            )
+        with transaction.atomic():
+            ProjectReadiness.objects.all().delete()
+            OrganisationReadiness.objects.all().delete()
+            for rollup_class in (ProjectReadiness, OrganisationReadiness):
+                rollup_class.objects.bulk_create(
+                    [rollup for rollup in rollups if isinstance(rollup, rollup_class)],
+                    batch_size=SurveyAnswer.BULK_CREATE_BATCH_SIZE,
+                )
+        return len(rollups)
+
+
+@receiver(pre_delete, sender=Survey)
+def _remove_survey_readiness(sender, instance, **kwargs):
+    # Take a deleted survey's answers out of its project's and organisation's totals
+    changes = {
+        rollup.title: (-rollup.score_total, -rollup.answer_count) for rollup in instance.readiness.all()
+    }
+    if changes:
+        SurveyReadiness.add_to_rollups(instance, changes)
+
+
+class ProjectReadiness(ReadinessRollup):
+    """
+    The readiness totals of all the surveys in a project.
+    """
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="readiness")
+
+    OWNER_FIELD = "project"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["project", "title"], name="unique_project_readiness"),
+        ]
+
+
+class OrganisationReadiness(ReadinessRollup):
+    """
+    The readiness totals of all the surveys in an organisation's projects.
+    """
+
+    organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, related_name="readiness")
+
+    OWNER_FIELD = "organisation"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["organisation", "title"], name="unique_organisation_readiness"),
+        ]
+
+
+class SpooledSurveyResponse(models.Model):
+    """
+    A participant's submission that has been received but not yet validated and saved
+    as a SurveyResponse.
+
+    When settings.SURVEY_RESPONSE_SPOOL is enabled, submissions are stored here as they
+    arrive and processed in batches by the drain_responses management command.
+    Submissions that fail validation are kept, with the reason, for inspection.
+    """
+
+    survey = models.ForeignKey(
+        Survey, related_name="spooled_responses", on_delete=models.CASCADE
+    )
+    value = models.TextField(help_text="Submitted answers (JSON)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    error = models.TextField(
+        blank=True, null=True, help_text="Why the submission was rejected"
+    )
+    submission_key = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Generated by the participant's browser so that a repeated submission isn't saved twice",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["survey", "submission_key"], name="unique_spooled_response_submission_key"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Survey {self.survey_id} spooled response {self.pk}"
+
+    @classmethod
+    def drain(cls, batch_size: int = 500) -> tuple[int, int, int]:
+        """
+        Validate and save the oldest pending submissions.
+
+        Valid submissions become SurveyResponse rows and are removed from the spool in
+        the same transaction, so each one is saved exactly once.
+
+        :param batch_size: Maximum number of submissions to process
+        :returns: The number of submissions accepted, rejected, and removed because
+            they had already been saved
+        """
+        accepted = duplicate = 0
+        with transaction.atomic():
+            spooled = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(error__isnull=True)
+                .select_related("survey")
+                .order_by("pk")[:batch_size]
+            )
+
+            # Group submissions by survey, so each survey's schema is compiled once
+            for _, group in itertools.groupby(
+                sorted(spooled, key=lambda row: row.survey_id),
+                key=lambda row: row.survey_id,
+            ):
+                group = list(group)
+                survey = group[0].survey
+                parsed = list()
+                for row in group:
+                    try:
+                        parsed.append((row, json.loads(row.value)))
+                    except json.JSONDecodeError:
+                        row.error = "Submission is not valid JSON"
+
+                report = survey.accept_responses(
+                    [answers for _, answers in parsed],
+                    allow_inactive=True,
+                    submission_keys=[row.submission_key for row, _ in parsed],
+                )
+                for (row, _), result in zip(parsed, report):
+                    if not result["accepted"]:
+                        row.error = "\n".join(result["errors"])
+
+                accepted += sum(1 for result in report if result["accepted"] and not result["duplicate"])
+                duplicate += sum(1 for result in report if result["duplicate"])
+
+            rejected_rows = [row for row in spooled if row.error is not None]
+            rejected = len(rejected_rows)
+            cls.objects.bulk_update(rejected_rows, ["error"])
+            cls.objects.filter(
+                pk__in=[row.pk for row in spooled if row.error is None]
+            ).delete()
+
+        return accepted, rejected, duplicate
+
+
 class Invitation(models.Model):
     """
     An invitation to submit a response to a survey.
@@ -644,8 +1903,15 @@ class Invitation(models.Model):
     def __str__(self):
         return f"Invitation for {self.survey.name}"
 
+    #: Namespace for signed invitation tokens, so other signed values can't be used as one
+    TOKEN_SALT = "survey.invitation"
+    #: Separates the value and signature of a signed token; never in a random token
+    TOKEN_SEPARATOR = ":"
+
     def save(self, *args, **kwargs):
-        if not self.token:
+        if not self.token and settings.SURVEY_SIGNED_INVITATIONS:
+            self.token = self.signed_token(self.survey)
+        elif not self.token:
             # Try a new token until it doesn't clash with an existing one
             num_token_tries = 0
             max_token_tries = 50
@@ -658,6 +1924,44 @@ class Invitation(models.Model):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def signed_token(cls, survey: Survey) -> str:
+        """
+        Create a token for a new invitation to this survey, revoking older signed tokens.
+
+        The token holds the survey ID and its invitation generation, signed with the
+        SECRET_KEY e.g. "42.3:<signature>"
+        """
+        Survey.objects.filter(pk=survey.pk).update(
+            invitation_generation=models.F("invitation_generation") + 1
+        )
+        survey.refresh_from_db(fields=["invitation_generation"])
+        return signing.Signer(sep=cls.TOKEN_SEPARATOR, salt=cls.TOKEN_SALT).sign(
+            f"{survey.pk}.{survey.invitation_generation}"
+        )
+
+    @classmethod
+    def is_signed_token(cls, token: str) -> bool:
+        """
+        Signed tokens contain a separator that randomly-generated tokens never do.
+        """
+        return cls.TOKEN_SEPARATOR in token
+
+    @classmethod
+    def unsign_token(cls, token: str) -> tuple[int, int]:
+        """
+        Check a signed invitation token without using the database.
+
+        :returns: The survey ID and invitation generation
+        :raises django.core.signing.BadSignature: If the token is invalid
+        """
+        value = signing.Signer(sep=cls.TOKEN_SEPARATOR, salt=cls.TOKEN_SALT).unsign(token)
+        try:
+            survey_id, generation = (int(part) for part in value.split("."))
+        except ValueError:
+            raise signing.BadSignature("Malformed invitation token")
+        return survey_id, generation
+
     @classmethod
     def recipient_list(cls, text: str) -> set[str]:
         """
@@ -0,0 +1,99 @@
+"""
+SORT readiness scores: the mean answer to the scored question of each SORT section,
+and how they're labelled and coloured, as in the survey report (see
+getSortMaturityLabel() and getColourForMeanValue() in ui_components/src/lib/misc.svelte.ts).
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Optional
+
+from survey.layout import SectionLayout, SurveyLayout
+from survey.stats import as_number
+
+#: The upper bound (exclusive), label, background and text colour of each maturity level
+MATURITY_LEVELS = (
+    (0.5, "Not yet planned", "#ccccdd", "#000"),
+    (1.5, "Planned", "#aa99cc", "#000"),
+    (2.5, "Early progress", "#abd9e9", "#000"),
+    (3.5, "Substantial progress", "#74add1", "#000"),
+    (float("inf"), "Established", "#440099", "#FFF"),
+)
+#: Shown in place of a maturity label when there is no score
+MATURITY_LABEL_UNKNOWN = "Not available"
+
+
+def section_title(section: SectionLayout) -> str:
+    """
+    The name a SORT section's scores are kept under, so that the same section of
+    different surveys is rolled up together.
+    """
+    return section.title or f"Section {section.index + 1}"
+
+
+def readiness_columns(layout: SurveyLayout) -> dict[int, tuple[str, tuple[Optional[float], ...]]]:
+    """
+    The columns of the scored question of each SORT section: the first whose options
+    are all numbers, as the report's summary matrix.
+
+    :returns: The section title and the value of each option, by column
+    """
+    columns = dict()
+    for section in layout.sections:
+        if section.type != "sort":
+            continue
+        for field in section.fields:
+            values = tuple(as_number(option) for option in field.config.get("options", ()))
+            if field.type not in {"likert", "radio", "select"} or not values or None in values:
+                continue
+            width = len(field.sublabels) if field.type == "likert" else 1
+            for column in range(field.column, field.column + width):
+                columns[column] = (section_title(section), values)
+            break
+    return columns
+
+
+def readiness_totals(layout: SurveyLayout, counts: Mapping[tuple[int, int], int]) -> dict[str, tuple[float, int]]:
+    """
+    Add up the answers to the scored question of each SORT section.
+
+    :param counts: The number of times each option was chosen, by column and option position
+    :returns: The sum and number of the answers, by section title
+    """
+    columns = readiness_columns(layout)
+    totals = dict()
+    for (column, option), count in counts.items():
+        if column not in columns or option >= len(columns[column][1]) or not count:
+            continue
+        title, values = columns[column]
+        score_total, answer_count = totals.get(title, (0.0, 0))
+        totals[title] = (score_total + values[option] * count, answer_count + count)
+    return totals
+
+
+def maturity(mean: Optional[float]) -> dict:
+    """
+    The maturity level of a mean score, and the colours it's shown in.
+    """
+    if mean is None:
+        return dict(mean=None, label=MATURITY_LABEL_UNKNOWN, colour="transparent", text_colour="inherit")
+    for upper, label, colour, text_colour in MATURITY_LEVELS:
+        if mean < upper:
+            return dict(mean=mean, label=label, colour=colour, text_colour=text_colour)
+
+
+def heatmap(rows: Iterable[tuple[str, Optional[str], Mapping[str, float]]]) -> dict:
+    """
+    A table of the mean score of each SORT section, for several surveys or projects.
+
+    :param rows: The name and link of each row, and its mean scores by section title
+    :returns: The section titles, and the maturity level of each section of each row
+    """
+    rows = list(rows)
+    titles = sorted({title for _, _, means in rows for title in means})
+    return dict(
+        titles=titles,
+        rows=[
+            dict(name=name, url=url, cells=[maturity(means.get(title)) for title in titles])
+            for name, url, means in rows
+        ],
+    )
@@ -0,0 +1,106 @@
+"""
+Survey question templates and readiness descriptions, loaded from the data files
+once per process and reloaded only when a file changes.
+"""
+
+import itertools
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+import jsonschema
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+#: The shape of the readiness descriptions: one list of descriptions per section
+READINESS_DESCRIPTIONS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "array", "items": {"type": "string"}},
+}
+
+
+class DataFileRegistry:
+    """
+    JSON data files, parsed and validated when first used and kept in memory.
+
+    A file is read again only if its modification time changes. The values are shared
+    by everything in the process, so they must not be modified.
+    """
+
+    def __init__(self):
+        # The modification time and contents of each file
+        self._files: dict[Path, tuple[int, Any]] = dict()
+        self._lock = threading.Lock()
+
+    def load(self, path: Path, schema: Optional[dict] = None) -> Any:
+        """
+        Get the contents of a JSON file.
+
+        :param schema: A JSON Schema the contents must match
+        :raises ImproperlyConfigured: If the file doesn't match the schema
+        """
+        path = Path(path)
+        modified = path.stat().st_mtime_ns
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == modified:
+            return cached[1]
+
+        with self._lock:
+            with path.open() as file:
+                value = json.load(file)
+            if schema is not None:
+                validator = jsonschema.validators.validator_for(schema)(schema)
+                error = jsonschema.exceptions.best_match(validator.iter_errors(value))
+                if error is not None:
+                    raise ImproperlyConfigured(f"{path} is not valid: {error.message}")
+            self._files[path] = (modified, value)
+            logger.debug("Loaded %s", path)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+
+    @property
+    def survey_config_schema(self) -> dict:
+        return self.load(settings.SURVEY_CONFIG_SCHEMA)
+
+    def survey_template(self, filename: str) -> dict:
+        """
+        A survey question configuration file e.g. "consent_only_config.json"
+        """
+        return self.load(
+            Path(settings.SURVEY_TEMPLATE_DIR).joinpath(filename),
+            schema=self.survey_config_schema,
+        )
+
+    @property
+    def survey_template_filenames(self):
+        return itertools.chain(
+            settings.SURVEY_TEMPLATES.values(),
+            settings.DEMOGRAPHY_TEMPLATES.values(),
+            (settings.CONSENT_TEMPLATE,),
+        )
+
+    @property
+    def readiness_descriptions(self) -> list[list[str]]:
+        """
+        The description of each readiness level of each section of the SORT questions.
+        """
+        return self.load(settings.READINESS_DESCRIPTIONS, schema=READINESS_DESCRIPTIONS_SCHEMA)
+
+    def preload(self):
+        """
+        Load every file, so that it's ready for the first request.
+        """
+        for filename in self.survey_template_filenames:
+            self.survey_template(filename)
+        _ = self.readiness_descriptions
+
+
+#: The files used by this process
+data_files = DataFileRegistry()
@@ -0,0 +1,219 @@
+"""
+Bitmap indexes of survey responses, so that the report can be filtered by the
+respondents' answers without sending every response to the browser.
+
+Each response has a position, and each answer a bitmap (a Python int) with a bit
+set for every response that gave it: one per option of each question, and one per
+whole-number bucket of numeric answers. A filter is a few bitwise operations on
+these, and the statistics of the chosen responses are counted from the same bitmaps,
+giving the same results as generateStatsFromSurveyResponses() in the browser
+(see survey.stats).
+"""
+
+import collections
+import math
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from survey.layout import FieldLayout, SurveyLayout
+from survey.stats import as_list, as_number, counted_numeric_stats, get_answer
+
+#: Field types whose answers are indexed by option
+OPTION_FIELD_TYPES = {"select", "radio", "checkbox"}
+#: Field types whose answers are listed in full
+FREE_TEXT_FIELD_TYPES = {"text", "textarea"}
+#: Free text fields whose answers are numbers
+NUMERIC_TEXT_TYPES = {"INTEGER_TEXT", "DECIMALS_TEXT"}
+
+
+def to_bitmap(positions: Iterable[int], size: int) -> int:
+    """
+    A bitmap with a bit set at each position.
+    """
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+class ResponseIndex:
+    """
+    Which responses gave each answer to a survey.
+    """
+
+    def __init__(self, layout: SurveyLayout, responses: Iterable[list]):
+        """
+        :param responses: The answers of each response
+        """
+        self.layout = layout
+        positions = collections.defaultdict(lambda: collections.defaultdict(list))
+        numbers = collections.defaultdict(lambda: collections.defaultdict(dict))
+        text = collections.defaultdict(list)
+
+        self.count = 0
+        for position, answers in enumerate(responses):
+            self.count += 1
+            for field in layout.fields:
+                answer = get_answer(answers, field)
+                if field.type == "likert":
+                    for sublabel_index, value in enumerate(as_list(answer)[: len(field.sublabels)]):
+                        if value is not None:
+                            positions[field.column + sublabel_index][self.key(value)].append(position)
+                elif field.type in OPTION_FIELD_TYPES:
+                    for value in as_list(answer) if field.type == "checkbox" else [answer]:
+                        if value is not None:
+                            positions[field.column][self.key(value)].append(position)
+                elif field.type in FREE_TEXT_FIELD_TYPES and answer is not None:
+                    text[field.column].append((position, answer))
+                    number = as_number(answer)
+                    if number is not None:
+                        numbers[field.column][math.floor(number)][position] = number
+
+        # Plain dictionaries from here on, so that the index can be cached
+        #: Responses that gave each answer, by column then answer
+        self.answers: dict[int, dict[Any, int]] = {
+            column: {value: to_bitmap(value_positions, self.count) for value, value_positions in values.items()}
+            for column, values in positions.items()
+        }
+        #: Numeric free text answers, by column, whole-number bucket then position
+        self.numbers: dict[int, dict[int, dict[int, float]]] = {
+            column: dict(buckets) for column, buckets in numbers.items()
+        }
+        #: Responses with a number in each bucket, by column then bucket
+        self.buckets: dict[int, dict[int, int]] = {
+            column: {bucket: to_bitmap(bucket_numbers, self.count) for bucket, bucket_numbers in buckets.items()}
+            for column, buckets in self.numbers.items()
+        }
+        #: Free text answers, by column, with the position of their response
+        self.text: dict[int, list[tuple[int, Any]]] = dict(text)
+
+    def __getstate__(self) -> dict:
+        # Layouts can't be pickled, so the layout must be set again when the index is
+        # loaded from a cache
+        state = self.__dict__.copy()
+        state["layout"] = None
+        return state
+
+    @staticmethod
+    def key(value: Any) -> Any:
+        """
+        How an answer is counted: as it is if it's text or a number, otherwise as text
+        """
+        return value if isinstance(value, (str, int, float)) else str(value)
+
+    @property
+    def everyone(self) -> int:
+        return (1 << self.count) - 1
+
+    def get_field(self, section_index: Any, field_index: Any) -> FieldLayout:
+        for position in (section_index, field_index):
+            # Negative positions would count from the end
+            if not isinstance(position, int) or isinstance(position, bool) or position < 0:
+                raise ValueError("Filter section and field must be positions")
+        try:
+            return self.layout.sections[section_index].fields[field_index]
+        except IndexError:
+            raise ValueError(f"There is no field {field_index} in section {section_index}")
+
+    def select(self, filters: list[dict]) -> int:
+        """
+        The responses that match every filter, where each filter is either
+
+            {"section": 2, "field": 0, "options": ["Nurse", "Midwife"]}
+
+        for the responses that chose any of the options, or
+
+            {"section": 2, "field": 3, "min": 5, "max": 10}
+
+        for the responses with a number in that range.
+
+        :returns: A bitmap of the chosen responses
+        :raises ValueError: If a filter doesn't describe an answer that can be filtered
+        """
+        if not isinstance(filters, list):
+            raise ValueError("Filters must be a list")
+        selection = self.everyone
+        for filter_ in filters:
+            if not isinstance(filter_, dict):
+                raise ValueError("Each filter must be an object")
+            field = self.get_field(filter_.get("section"), filter_.get("field"))
+            if "options" in filter_ and field.type in OPTION_FIELD_TYPES:
+                if not isinstance(filter_["options"], list):
+                    raise ValueError("Filter options must be a list")
+                answers = self.answers.get(field.column, dict())
+                bits = 0
+                for option in filter_["options"]:
+                    bits |= answers.get(self.key(option), 0)
+            elif field.type in FREE_TEXT_FIELD_TYPES:
+                low, high = as_number(filter_.get("min")), as_number(filter_.get("max"))
+                if low is None or high is None:
+                    raise ValueError("Filter minimum and maximum must be numbers")
+                bits = self.in_range(field.column, low, high)
+            else:
+                raise ValueError(f"Can't filter by field {field.index} of section {field.section_index}")
+            selection &= bits
+        return selection
+
+    def in_range(self, column: int, low: float, high: float) -> int:
+        """
+        The responses with a number between low and high (inclusive) in a column.
+        """
+        bits = 0
+        for bucket, bucket_bits in self.buckets.get(column, dict()).items():
+            if bucket >= low and bucket + 1 <= high:
+                bits |= bucket_bits
+            elif bucket <= high and bucket + 1 > low:
+                # Only some of the bucket is in range
+                numbers = self.numbers[column][bucket]
+                bits |= to_bitmap(
+                    (position for position, number in numbers.items() if low <= number <= high), self.count
+                )
+        return bits
+
+    def stats(self, selection: int) -> Optional[dict]:
+        """
+        The statistics of each field, as survey.stats.counted_stats(), for some of the responses.
+
+        :param selection: A bitmap of responses, from select()
+        :returns: The statistics, or None if no responses are chosen
+        """
+        if not selection:
+            return None
+        # Each response's bit, as a character, for looking up free text answers
+        selected = bin(selection)[:1:-1]
+
+        sections = list()
+        for section in self.layout.sections:
+            fields = list()
+            for field in section.fields:
+                if field.type == "likert":
+                    histograms = [
+                        self.histogram(field, field.column + i, selection) for i in range(len(field.sublabels))
+                    ]
+                    fields.append(dict(histograms=histograms, **counted_numeric_stats(histograms)))
+                elif field.type in OPTION_FIELD_TYPES:
+                    histogram = self.histogram(field, field.column, selection)
+                    fields.append(dict(histogram=histogram, **counted_numeric_stats([histogram])))
+                elif field.type in FREE_TEXT_FIELD_TYPES:
+                    values = [
+                        answer
+                        for position, answer in self.text.get(field.column, ())
+                        if selected[position:position + 1] == "1"
+                    ]
+                    fields.append(dict(values=values))
+                else:
+                    fields.append(dict())
+            sections.append(dict(fields=fields))
+        return dict(sections=sections)
+
+    def histogram(self, field: FieldLayout, column: int, selection: int) -> list[dict]:
+        """
+        The number of chosen responses that gave each answer, in the order of the
+        options, followed by any other answers.
+        """
+        counts = dict.fromkeys(field.config.get("options", ()), 0)
+        for value, bits in self.answers.get(column, dict()).items():
+            count = (bits & selection).bit_count()
+            if count:
+                counts[value] = counts.get(value, 0) + count
+        return [dict(option=option, count=count) for option, count in counts.items()]
@@ -2,6 +2,16 @@
 Generate JSON Schema from survey configuration for validating response answers.
 """
 
+import functools
+import json
+from typing import Any, Callable, Optional
+
+#: A compiled check that returns True if a value matches its schema
+Check = Callable[[Any], bool]
+
+#: Number of distinct response schemas to keep compiled checks for
+COMPILED_SCHEMA_CACHE_SIZE = 64
+
 
 def field_schema(field_config: dict) -> dict:
     """Return a JSON Schema for one field's answer value."""
@@ -61,3 +71,97 @@ def _text_schema(field_config: dict) -> dict:
     if field_config.get("required"):
         schema["minLength"] = 1
     return schema
+
+
+def compile_schema(schema: dict) -> Optional[Check]:
+    """
+    Compile a response schema into a fast check that says whether a value is valid.
+
+    Only the JSON Schema keywords produced by the field builders in this module are
+    supported, with enums turned into set lookups and item counts into length checks.
+    The compiled check doesn't describe what is wrong; use a full JSON Schema validator
+    for that once a value is known to be invalid.
+
+    The compiled checks are shared by every survey with the same schema, such as
+    surveys created from the same profession template.
+
+    :returns: The check, or None if the schema uses keywords that can't be compiled
+    """
+    return _compile_schema_json(json.dumps(schema, sort_keys=True))
+
+
+@functools.lru_cache(maxsize=COMPILED_SCHEMA_CACHE_SIZE)
+def _compile_schema_json(schema_json: str) -> Optional[Check]:
+    try:
+        return _compile(json.loads(schema_json))
+    except NotImplementedError:
+        return None
+
+
+def _compile(schema: dict | bool) -> Check:
+    """
+    Build a check for one (sub)schema, raising NotImplementedError for unsupported keywords.
+    """
+    if schema is True or schema == {}:
+        return lambda value: True
+    if schema is False:
+        return lambda value: False
+
+    schema = dict(schema)
+    checks = list()
+
+    schema_type = schema.pop("type", None)
+    if schema_type == "array":
+        checks.append(lambda value: isinstance(value, list))
+    elif schema_type == "string":
+        checks.append(lambda value: isinstance(value, str))
+    elif schema_type is not None:
+        raise NotImplementedError(f"type: {schema_type}")
+
+    if "enum" in schema:
+        options = schema.pop("enum")
+        if not all(isinstance(option, str) for option in options):
+            raise NotImplementedError("enum of non-string values")
+        options = frozenset(options)
+        checks.append(lambda value: not isinstance(value, str) or value in options)
+
+    if "minLength" in schema:
+        min_length = schema.pop("minLength")
+        checks.append(lambda value: not isinstance(value, str) or len(value) >= min_length)
+
+    if "minItems" in schema:
+        min_items = schema.pop("minItems")
+        checks.append(lambda value: not isinstance(value, list) or len(value) >= min_items)
+
+    if "maxItems" in schema:
+        max_items = schema.pop("maxItems")
+        checks.append(lambda value: not isinstance(value, list) or len(value) <= max_items)
+
+    if "prefixItems" in schema or "items" in schema:
+        prefix_checks = tuple(_compile(item) for item in schema.pop("prefixItems", []))
+        items_check = _compile(schema.pop("items", True))
+        checks.append(_array_items_check(prefix_checks, items_check))
+
+    if schema:
+        raise NotImplementedError(", ".join(schema))
+
+    checks = tuple(checks)
+    return lambda value: all(check(value) for check in checks)
+
+
+def _array_items_check(prefix_checks: tuple[Check, ...], items_check: Check) -> Check:
+    """
+    Check each item of an array against its positional schema, or the items schema
+    for any items beyond those.
+    """
+    num_prefix = len(prefix_checks)
+
+    def check(value) -> bool:
+        if not isinstance(value, list):
+            return True
+        for item, prefix_check in zip(value, prefix_checks):
+            if not prefix_check(item):
+                return False
+        return all(items_check(item) for item in value[num_prefix:])
+
+    return check
@@ -0,0 +1,60 @@
+"""
+A small in-process cache for values that are looked up on every participant request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class ExpiringLRUCache:
+    """
+    A bounded, least-recently-used cache whose entries expire after a time limit.
+
+    Each worker process has its own cache, so an entry removed in one process may still
+    be used by another process until it expires.
+    """
+
+    def __init__(self, max_size: int, timeout: float):
+        """
+        :param max_size: Maximum number of entries to keep
+        :param timeout: Number of seconds an entry may be used for
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        The cached value, or None if it is missing or has expired.
+        """
+        with self._lock:
+            try:
+                expires_at, value = self._entries[key]
+            except KeyError:
+                return None
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
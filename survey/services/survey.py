@@ -1,10 +1,13 @@
 import logging
+import uuid
 from typing import Dict, Optional
 
 from django.conf import settings
+from django.core import signing
 from django.core.exceptions import PermissionDenied
 from django.core.files.uploadedfile import UploadedFile
 from django.core.files.uploadhandler import UploadFileException
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 
 from home.constants import ROLE_ADMIN, ROLE_PROJECT_MANAGER
@@ -19,8 +22,11 @@ from survey.models import (
     SurveyFile,
     SurveyImprovementPlanSection,
     SurveyResponse,
+    SpooledSurveyResponse,
 )
 
+from .cache import ExpiringLRUCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +35,23 @@ class InvalidInviteTokenException(Exception):
 
 
 class SurveyService(BasePermissionService):
+    #: Number of valid invitation tokens to remember the survey of, per worker process
+    TOKEN_CACHE_SIZE = 1024
+    #: Seconds to remember a valid token for. Tokens replaced by create_invitation() in
+    #: another worker process may still be accepted by this one for this long.
+    TOKEN_CACHE_TIMEOUT = 60
+    #: Number of unknown or used tokens to remember, per worker process
+    INVALID_TOKEN_CACHE_SIZE = 4096
+    #: Seconds to remember an unknown or used token for
+    INVALID_TOKEN_CACHE_TIMEOUT = 300
+
+    def __init__(self):
+        # Invitation token -> survey ID
+        self._token_cache = ExpiringLRUCache(self.TOKEN_CACHE_SIZE, self.TOKEN_CACHE_TIMEOUT)
+        # Tokens that don't belong to a current invitation
+        self._invalid_token_cache = ExpiringLRUCache(
+            self.INVALID_TOKEN_CACHE_SIZE, self.INVALID_TOKEN_CACHE_TIMEOUT
+        )
 
     def get_user_role(self, user: User, survey: Survey) -> Optional[str]:
         """Get user's role in the project's organisation"""
@@ -60,7 +83,7 @@ class SurveyService(BasePermissionService):
         return role in [ROLE_ADMIN, ROLE_PROJECT_MANAGER]
 
     def get_survey(self, user: User, survey_id: int) -> Survey:
-        survey = get_object_or_404(Survey, pk=survey_id)
+        survey = get_object_or_404(Survey.objects.select_related("config"), pk=survey_id)
         if self.can_view(user, survey):
             return survey
         else:
@@ -170,22 +193,177 @@ class SurveyService(BasePermissionService):
         improve_section.save()
 
     def get_survey_from_token(self, token: str) -> Survey:
-        invitations = Invitation.objects.filter(token=token)
+        """
+        Get the survey that an invitation token gives access to.
+
+        Recently seen tokens are cached by this worker process, so that repeat visits
+        and link scanners don't need to look up the invitation in the database.
+        """
+        if self._invalid_token_cache.get(token):
+            raise InvalidInviteTokenException("Token is invalid")
+
+        if Invitation.is_signed_token(token):
+            survey_id, generation = self._unsign_token(token)
+            survey = Survey.objects.filter(pk=survey_id).first()
+            return self._check_signed_token_survey(token, survey, generation)
+
+        survey_id = self._token_cache.get(token)
+        if survey_id is not None:
+            survey = Survey.objects.filter(pk=survey_id).first()
+            if survey is not None:
+                return survey
+            self._token_cache.delete(token)
+
+        invitation = (
+            Invitation.objects.select_related("survey").filter(token=token).first()
+        )
+        return self._check_invitation(token, invitation)
+
+    async def aget_survey_from_token(self, token: str) -> Survey:
+        """
+        Get the survey that an invitation token gives access to, using the
+        asynchronous ORM. See get_survey_from_token.
+        """
+        if self._invalid_token_cache.get(token):
+            raise InvalidInviteTokenException("Token is invalid")
 
-        # Checks that token is valid
-        if not invitations.exists():
+        if Invitation.is_signed_token(token):
+            survey_id, generation = self._unsign_token(token)
+            survey = await Survey.objects.select_related("config").filter(pk=survey_id).afirst()
+            return self._check_signed_token_survey(token, survey, generation)
+
+        survey_id = self._token_cache.get(token)
+        if survey_id is not None:
+            survey = await Survey.objects.select_related("config").filter(pk=survey_id).afirst()
+            if survey is not None:
+                return survey
+            self._token_cache.delete(token)
+
+        # The configuration can't be loaded lazily once the page is being rendered
+        invitation = (
+            await Invitation.objects.select_related("survey__config").filter(token=token).afirst()
+        )
+        return self._check_invitation(token, invitation)
+
+    def _check_invitation(self, token: str, invitation: Optional[Invitation]) -> Survey:
+        """
+        Check that the invitation for a token exists and is still in use.
+        """
+        if invitation is None:
             logger.warning("Trying to get token that does not exist")
+            self._invalid_token_cache.set(token, True)
             raise InvalidInviteTokenException("Token does not exist")
 
-        invitation = invitations.first()
         if invitation.used is True:
             logger.warning("Trying to use an invalid token")
+            self._invalid_token_cache.set(token, True)
             raise InvalidInviteTokenException("Token is invalid")
 
+        self._token_cache.set(token, invitation.survey_id)
         return invitation.survey
 
-    def accept_response(self, survey: Survey, responseValues):
-        SurveyResponse.objects.create(survey=survey, answers=responseValues)
+    def _unsign_token(self, token: str) -> tuple[int, int]:
+        """
+        Check the signature of a signed token, without using the database.
+
+        :returns: The survey ID and invitation generation
+        """
+        try:
+            return Invitation.unsign_token(token)
+        except signing.BadSignature:
+            logger.warning("Trying to use an invitation token with a bad signature")
+            self._invalid_token_cache.set(token, True)
+            raise InvalidInviteTokenException("Token is invalid")
+
+    def _check_signed_token_survey(self, token: str, survey: Optional[Survey], generation: int) -> Survey:
+        """
+        Check that a signed token hasn't been replaced by a newer invitation.
+        """
+        if survey is None or survey.invitation_generation != generation:
+            logger.warning("Trying to use an invalid token")
+            self._invalid_token_cache.set(token, True)
+            raise InvalidInviteTokenException("Token is invalid")
+        return survey
+
+    @staticmethod
+    def _parse_submission_key(submission_key: Optional[str]) -> Optional[uuid.UUID]:
+        """
+        Read the key generated by the participant's browser to identify a submission.
+        """
+        if not submission_key:
+            return None
+        try:
+            return uuid.UUID(submission_key)
+        except ValueError:
+            logger.warning("Ignoring malformed submission key: %s", submission_key)
+            return None
+
+    def accept_response(
+            self, survey: Survey, responseValues, submission_key: Optional[str] = None
+    ) -> SurveyResponse:
+        """
+        Save a participant's submission.
+
+        If the submission key matches a response that was already saved, for example
+        because the participant clicked submit twice or their browser retried the
+        request, that response is returned instead of saving a duplicate.
+        """
+        submission_key = self._parse_submission_key(submission_key)
+        if submission_key is not None:
+            survey_response = SurveyResponse.objects.filter(
+                survey=survey, submission_key=submission_key
+            ).first()
+            if survey_response is not None:
+                logger.info("Ignoring repeated submission to survey %s", survey.pk)
+                return survey_response
+
+        try:
+            with transaction.atomic():
+                return SurveyResponse.objects.create(
+                    survey=survey, answers=responseValues, submission_key=submission_key
+                )
+        except IntegrityError:
+            # A simultaneous request saved the same submission first
+            if submission_key is None:
+                raise
+            return SurveyResponse.objects.get(survey=survey, submission_key=submission_key)
+
+    def spool_response(
+            self, survey: Survey, value: str, submission_key: Optional[str] = None
+    ) -> Optional[SpooledSurveyResponse]:
+        """
+        Store a participant's submission as received, to be validated and saved later
+        by the drain_responses management command.
+
+        Repeated submissions with the same submission key are ignored.
+        """
+        submission_key = self._parse_submission_key(submission_key)
+        if submission_key is not None and (
+                SpooledSurveyResponse.objects.filter(survey=survey, submission_key=submission_key).exists()
+                or SurveyResponse.objects.filter(survey=survey, submission_key=submission_key).exists()
+        ):
+            logger.info("Ignoring repeated submission to survey %s", survey.pk)
+            return None
+
+        try:
+            with transaction.atomic():
+                return SpooledSurveyResponse.objects.create(
+                    survey=survey, value=value, submission_key=submission_key
+                )
+        except IntegrityError:
+            # A simultaneous request spooled the same submission first
+            if submission_key is None:
+                raise
+            return None
+
+    @requires_permission("edit", obj_param="survey")
+    def accept_responses(self, user: User, survey: Survey, batch: list[list]) -> list[dict]:
+        """
+        Enter many survey submissions at once e.g. paper returns keyed in by a manager.
+
+        :returns: One report per submission saying whether it was accepted
+        """
+        return survey.accept_responses(batch)
 
     @requires_permission("edit", obj_param="survey")
     def create_invitation(self, user: User, survey: Survey) -> Invitation:
@@ -194,6 +372,7 @@ class SurveyService(BasePermissionService):
         for invite in survey.invitation_set.all():
             invite.used = True
             invite.save()
+            self._token_cache.delete(invite.token)
 
         # Add new invite token
         return Invitation.objects.create(survey=survey)
@@ -0,0 +1,106 @@
+"""
+Summary statistics of survey responses, as displayed in the survey report.
+
+These are the statistics that generateStatsFromSurveyResponses() in
+ui_components/src/lib/misc.svelte.ts works out from every response's answers, so
+that pages can be sent them instead. counted_stats() works them out from the number
+of times each option was chosen, as kept in the SurveyFieldAggregate table, and
+survey.response_index.ResponseIndex from bitmap indexes of the answers.
+"""
+
+import itertools
+import math
+import re
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from survey.layout import FieldLayout, SurveyLayout
+
+#: A decimal number, as accepted by both Number() and parseFloat() in JavaScript
+#: (but not "Infinity", which can't be sent as JSON)
+NUMBER_PATTERN = re.compile(r"\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*")
+
+
+def counted_stats(layout: SurveyLayout, counts: Mapping[tuple[int, int], int], text_values: Mapping[int, list]) -> dict:
+    """
+    Calculate the statistics of each field of a survey from totals rather than answers.
+
+    :param counts: The number of times each option was chosen, by column and option position
+    :param text_values: The answers to each free text field, by column
+    :returns: The statistics of each field of each section
+    """
+    sections = list()
+    for section in layout.sections:
+        fields = list()
+        for field in section.fields:
+            if field.type == "likert":
+                histograms = [counted_histogram(field, counts, field.column + i) for i in range(len(field.sublabels))]
+                fields.append(dict(histograms=histograms, **counted_numeric_stats(histograms)))
+            elif field.type in {"select", "radio", "checkbox"}:
+                histogram_ = counted_histogram(field, counts, field.column)
+                fields.append(dict(histogram=histogram_, **counted_numeric_stats([histogram_])))
+            elif field.type in {"text", "textarea"}:
+                fields.append(dict(values=list(text_values.get(field.column, ()))))
+            else:
+                fields.append(dict())
+        sections.append(dict(fields=fields))
+    return dict(sections=sections)
+
+
+def get_answer(answers: Any, field: FieldLayout) -> Any:
+    """
+    One answer of a response, or None if the response doesn't have it.
+    """
+    try:
+        return answers[field.section_index][field.index]
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+def as_list(answer: Any) -> list:
+    """
+    The selected options of a multiple-choice answer (wrapping a bare string).
+    """
+    if answer is None:
+        return list()
+    return answer if isinstance(answer, list) else [answer]
+
+
+def counted_histogram(field: FieldLayout, counts: Mapping[tuple[int, int], int], column: int) -> list[dict]:
+    return [
+        dict(option=option, count=counts.get((column, index), 0))
+        for index, option in enumerate(field.config.get("options", ()))
+    ]
+
+
+def as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = value
+    elif isinstance(value, str) and NUMBER_PATTERN.fullmatch(value):
+        number = float(value)
+    else:
+        return None
+    # e.g. "1e999", which is too big to be anything but infinity, and can't be sent as JSON
+    return number if math.isfinite(number) else None
+
+
+def counted_numeric_stats(histograms: list[list[dict]]) -> dict:
+    """
+    The mean, minimum and maximum of the chosen options, if they're all numbers.
+    """
+    chosen = [
+        (as_number(entry["option"]), entry["count"])
+        for entry in itertools.chain.from_iterable(histograms)
+        if entry["count"] > 0
+    ]
+    if not chosen or any(number is None for number, _ in chosen):
+        return dict()
+    numbers = [number for number, _ in chosen]
+    return dict(
+        areValuesNumeric=True,
+        mean=sum(number * count for number, count in chosen) / sum(count for _, count in chosen),
+        max=max(numbers),
+        min=min(numbers),
+    )
@@ -0,0 +1,80 @@
+import io
+import json
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from SORT.test.model_factory import SurveyFactory
+from survey import answers_codec
+from survey.layout import get_layout
+from survey.models import SurveyResponse
+
+
+class TestAnswersCodec(TestCase):
+    def setUp(self):
+        answers_codec.config_layout.cache_clear()
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.layout = self.survey.layout
+
+    def stored_value(self, survey_response: SurveyResponse):
+        """
+        The answers column, as it is in the database
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT answers FROM survey_surveyresponse WHERE id = %s", [survey_response.pk])
+            return json.loads(cursor.fetchone()[0])
+
+    def test_round_trip(self):
+        for _ in range(10):
+            answers = self.survey._generate_mock_response()
+            encoded = answers_codec.encode(answers, self.layout)
+            self.assertEqual(answers_codec.decode(encoded, self.layout), answers)
+            self.assertLess(len(json.dumps(encoded)), len(json.dumps(answers)))
+
+    def test_checkbox(self):
+        options = ["A", "B", "C"]
+        field = get_layout(dict(sections=[dict(fields=[dict(type="checkbox", label="", options=options)])])).fields[0]
+        self.assertEqual(answers_codec.encode_field(field, options[:2]), 0b11)
+        # Out of order, or not an option: stored as it is
+        self.assertEqual(answers_codec.encode_field(field, options[1::-1]), options[1::-1])
+        self.assertEqual(answers_codec.encode_field(field, ["Other"]), ["Other"])
+
+    def test_mismatched_answers(self):
+        answers = self.survey._generate_mock_response()
+        del answers[0][-1]
+        self.assertIsNone(answers_codec.encode(answers, self.layout))
+
+    @override_settings(SURVEY_ENCODE_ANSWERS=True)
+    def test_stored_encoded(self):
+        answers = self.survey._generate_mock_response()
+        survey_response = self.survey.accept_response(answers)
+
+        self.assertTrue(answers_codec.is_encoded(self.stored_value(survey_response)))
+        self.assertEqual(SurveyResponse.objects.get(pk=survey_response.pk).answers, answers)
+        self.assertEqual(list(self.survey.survey_response.values_list("answers", flat=True)), [answers])
+
+        # Invalid answers are stored as they are
+        del answers[-1]
+        survey_response = SurveyResponse.objects.create(survey=self.survey, answers=answers)
+        self.assertEqual(self.stored_value(survey_response), answers)
+
+    @override_settings(SURVEY_ENCODE_ANSWERS=True)
+    def test_export_unchanged(self):
+        self.survey.generate_mock_responses(num_responses=3)
+        csv_data = self.survey.to_csv()
+
+        call_command("encode_answers", stdout=io.StringIO())
+
+        self.assertTrue(
+            all(answers_codec.is_encoded(self.stored_value(response)) for response in self.survey.survey_response.all())
+        )
+        self.assertEqual(self.survey.to_csv(), csv_data)
+
+        call_command("encode_answers", "--decode", stdout=io.StringIO())
+        self.assertFalse(
+            any(answers_codec.is_encoded(self.stored_value(response)) for response in self.survey.survey_response.all())
+        )
+        self.assertEqual(self.survey.to_csv(), csv_data)
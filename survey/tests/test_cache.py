@@ -0,0 +1,39 @@
+"""
+Unit tests for the in-process cache used by the survey service.
+"""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from survey.services.cache import ExpiringLRUCache
+
+
+class TestExpiringLRUCache(SimpleTestCase):
+    def test_get_and_set(self):
+        cache = ExpiringLRUCache(max_size=2, timeout=60)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        cache.delete("a")
+        self.assertIsNone(cache.get("a"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ExpiringLRUCache(max_size=2, timeout=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_entries_expire(self):
+        cache = ExpiringLRUCache(max_size=2, timeout=60)
+        with patch("survey.services.cache.time.monotonic", return_value=1000):
+            cache.set("a", 1)
+        with patch("survey.services.cache.time.monotonic", return_value=1059):
+            self.assertEqual(cache.get("a"), 1)
+        with patch("survey.services.cache.time.monotonic", return_value=1061):
+            self.assertIsNone(cache.get("a"))
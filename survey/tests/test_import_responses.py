@@ -0,0 +1,67 @@
+import csv
+import io
+import tempfile
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from SORT.test.model_factory import SurveyFactory
+
+
+class TestImportResponses(TestCase):
+    """
+    Test importing responses from the survey's own CSV and Excel exports.
+    """
+
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses()
+        self.rows = self.saved_rows()
+        self.directory = Path(tempfile.mkdtemp())
+
+    def saved_rows(self) -> list[list[str]]:
+        return sorted(list(response.answers_values) for response in self.survey.survey_response.all())
+
+    def import_responses(self, data: bytes, suffix: str = ".csv", **kwargs) -> Path:
+        path = self.directory.joinpath(f"responses{suffix}")
+        path.write_bytes(data)
+        self.survey.survey_response.all().delete()
+        call_command(
+            "import_responses", self.survey.pk, str(path), stdout=io.StringIO(), stderr=io.StringIO(), **kwargs
+        )
+        return path
+
+    def test_import_csv(self):
+        self.import_responses(self.survey.to_csv().encode(), chunk_size=3)
+        self.assertEqual(self.saved_rows(), self.rows)
+
+    def test_import_excel(self):
+        self.import_responses(self.survey.to_excel(), suffix=".xlsx")
+        self.assertEqual(self.saved_rows(), self.rows)
+
+    def test_import_rejects(self):
+        # Answer a likert sub-question with something that isn't one of its options
+        likert_field = next(
+            field for section in self.survey.sections for field in section["fields"] if field["type"] == "likert"
+        )
+        column = self.survey.fields.index(likert_field["sublabels"][0])
+        rows = list(csv.reader(self.survey.to_csv().splitlines()))
+        rows[1][column] = "Not an option"
+        with io.StringIO() as buffer:
+            csv.writer(buffer).writerows(rows)
+            self.import_responses(buffer.getvalue().encode())
+
+        self.assertEqual(self.survey.survey_response.count(), len(rows) - 2)
+        with self.directory.joinpath("responses_rejects.csv").open(newline="") as file:
+            rejects = list(csv.reader(file))
+        self.assertEqual(rejects[0][:2], ["row", "errors"])
+        self.assertEqual(len(rejects), 2)
+        self.assertEqual(rejects[1][0], "1")
+        self.assertIn("Not an option", rejects[1][1])
+
+    def test_import_wrong_columns(self):
+        with self.assertRaises(CommandError):
+            self.import_responses(b"a,b,c\n1,2,3\n")
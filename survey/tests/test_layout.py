@@ -0,0 +1,63 @@
+import copy
+
+from django.test import TestCase
+
+from SORT.test.model_factory import SurveyFactory
+from survey.layout import get_layout
+
+
+class TestSurveyLayout(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.layout = get_layout(self.survey.survey_config)
+
+    def test_headers(self):
+        headers = list()
+        for section in self.survey.sections:
+            for field in section["fields"]:
+                if field["type"] == "likert":
+                    headers.extend(field["sublabels"])
+                else:
+                    headers.append(field["label"])
+        self.assertEqual(self.layout.headers, tuple(headers))
+        self.assertEqual(self.survey.fields, tuple(headers))
+
+    def test_columns(self):
+        for field in self.layout.fields:
+            self.assertEqual(
+                self.layout.headers[field.column:field.column + len(field.headers)],
+                field.headers,
+            )
+
+    def test_shared(self):
+        """
+        Surveys with the same configuration share a layout
+        """
+        self.assertIs(get_layout(copy.deepcopy(self.survey.survey_config)), self.layout)
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.layout.fields[0].config["type"] = "text"
+
+    def test_describe_path(self):
+        likert_field = next(field for field in self.layout.fields if field.type == "likert")
+        section = self.layout.sections[likert_field.section_index]
+        self.assertEqual(
+            self.layout.describe_path([likert_field.section_index, likert_field.index, 0]),
+            f"Section {section.index + 1} '{section.title}', field '{likert_field.label}' "
+            f"('{likert_field.sublabels[0]}')",
+        )
+        self.assertEqual(self.layout.describe_path([]), "Response")
+
+    def test_changed_config(self):
+        """
+        A survey's layout follows changes to its configuration
+        """
+        fields = self.survey.fields
+        self.survey.update(
+            consent_config=dict(sections=[]),
+            demography_config=self.survey.demography_config_default,
+        )
+        self.assertNotEqual(self.survey.fields, fields)
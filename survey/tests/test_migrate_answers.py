@@ -0,0 +1,121 @@
+import copy
+import io
+import json
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from SORT.test.model_factory import SurveyFactory
+from survey import answers_codec
+from survey.answer_transforms import diff_answers
+from survey.models import SurveyAnswer
+
+
+class TestMigrateAnswers(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=3)
+        # The position of the first likert field
+        self.likert_field = next(field for field in self.survey.layout.fields if field.type == "likert")
+        self.position = f"{self.likert_field.section_index}.{self.likert_field.index}"
+
+    def migrate_answers(self, *args) -> str:
+        stdout = io.StringIO()
+        call_command("migrate_answers", "--survey", str(self.survey.pk), *args, stdout=stdout, stderr=io.StringIO())
+        return stdout.getvalue()
+
+    def answers(self) -> list:
+        return list(self.survey.survey_response.order_by("pk").values_list("answers", flat=True))
+
+    def likert_answers(self) -> list:
+        return [
+            answers[self.likert_field.section_index][self.likert_field.index] for answers in self.answers()
+        ]
+
+    def test_dry_run(self):
+        answers = self.answers()
+        option = self.likert_field.config["options"][0]
+
+        output = self.migrate_answers("remap_options", self.position, f"{option}=Changed")
+
+        self.assertEqual(self.answers(), answers)
+        self.assertIn("Dry run", output)
+
+    def test_remap_options(self):
+        option = self.likert_field.config["options"][0]
+        expected = [
+            ["Changed" if value == option else value for value in values] for values in self.likert_answers()
+        ]
+
+        self.migrate_answers("--commit", "--chunk-size", "2", "remap_options", self.position, f"{option}=Changed")
+
+        self.assertEqual(self.likert_answers(), expected)
+
+    @override_settings(SURVEY_ENCODE_ANSWERS=True)
+    def test_remap_options_encoded(self):
+        call_command("encode_answers", stdout=io.StringIO())
+        answer_count = SurveyAnswer.objects.filter(survey=self.survey).count()
+        # Valid answers are still encoded once they're changed
+        option, other_option = self.likert_field.config["options"][:2]
+        expected = [
+            [other_option if value == option else value for value in values] for values in self.likert_answers()
+        ]
+
+        self.migrate_answers("--commit", "remap_options", self.position, f"{option}={other_option}")
+
+        self.assertEqual(self.likert_answers(), expected)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT answers FROM survey_surveyresponse WHERE survey_id = %s", [self.survey.pk])
+            self.assertTrue(all(answers_codec.is_encoded(json.loads(row[0])) for row in cursor.fetchall()))
+        # The answers for the report are worked out from the decoded answers
+        self.assertEqual(SurveyAnswer.objects.filter(survey=self.survey).count(), answer_count)
+
+    def test_shift_likert(self):
+        self.survey.survey_response.update(answers=[[["1", "5", "x"]]])
+
+        self.migrate_answers("--commit", "shift_likert", "--by", "-1")
+        self.assertEqual(self.answers(), [[[["0", "4", "x"]]]] * 3)
+
+        # Shifting twice would corrupt the answers
+        with self.assertRaises(CommandError):
+            self.migrate_answers("--commit", "shift_likert", "--by", "-1")
+        self.assertEqual(self.answers(), [[[["0", "4", "x"]]]] * 3)
+
+    def test_remove_and_insert_field(self):
+        answers = self.answers()
+        section_index, field_index = self.likert_field.section_index, self.likert_field.index
+        survey_config = self.survey.survey_config
+
+        # Remove the field from the survey, then its answers
+        changed_config = copy.deepcopy(survey_config)
+        del changed_config["sections"][section_index]["fields"][field_index]
+        self.survey.survey_config = changed_config
+        self.survey.save()
+        self.migrate_answers("--commit", "remove_field", self.position)
+        self.assertFalse(self.survey.survey_response.exclude(is_valid=True).exists())
+        # There's no answer left to remove
+        with self.assertRaises(CommandError):
+            self.migrate_answers("--commit", "remove_field", self.position)
+
+        # Add it back, with blank answers
+        self.survey.survey_config = survey_config
+        self.survey.save()
+        self.migrate_answers("--commit", "insert_field", self.position)
+        for old, new in zip(answers, self.answers()):
+            self.assertEqual(len(new[section_index]), len(old[section_index]))
+            self.assertEqual(new[section_index][field_index], [""] * len(self.likert_field.sublabels))
+
+    def test_resume_from_pk(self):
+        primary_keys = list(self.survey.survey_response.order_by("pk").values_list("pk", flat=True))
+        self.survey.survey_response.update(answers=[[["2"]]])
+
+        self.migrate_answers("--commit", "--min-pk", str(primary_keys[1]), "shift_likert")
+
+        self.assertEqual(self.answers(), [[[["2"]]], [[["1"]]], [[["1"]]]])
+
+    def test_diff_answers(self):
+        self.assertEqual(diff_answers([["a", ["1", "2"]]], [["a", ["1", "3"]]]), ["0.1.1: '2' -> '3'"])
+        self.assertEqual(diff_answers([["a"]], [["a", "b"]]), ["0: ['a'] -> ['a', 'b']"])
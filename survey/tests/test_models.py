@@ -1,8 +1,13 @@
+import io
+import json
+import uuid
+
+from django.core.management import call_command
 from django.db import IntegrityError
 from django.test import TestCase
 
 from SORT.test.model_factory import SurveyFactory
-from survey.models import SurveyEvidenceSection, Profession
+from survey.models import SpooledSurveyResponse, Survey, SurveyConfig, SurveyEvidenceSection, Profession
 
 
 class TestSurveyEvidenceSection(TestCase):
@@ -29,6 +34,32 @@ class TestSurveyEvidenceSection(TestCase):
         self.assertIsNotNone(self.survey.fields)
         self.assertTrue(self.survey.fields)
 
+    def test_participant_config(self):
+        participant_config = json.loads(self.survey.participant_config)
+        sections = self.survey.survey_config["sections"]
+        self.assertEqual(len(participant_config["sections"]), len(sections))
+        for section, participant_section in zip(sections, participant_config["sections"]):
+            self.assertEqual(section["title"], participant_section["title"])
+            # Each answer stays at the same position as its field
+            self.assertEqual(len(section["fields"]), len(participant_section["fields"]))
+            for field, participant_field in zip(section["fields"], participant_section["fields"]):
+                self.assertEqual(field["type"], participant_field["type"])
+                self.assertNotIn("readOnly", participant_field)
+                self.assertNotIn("name", participant_field)
+        # Minified
+        self.assertEqual(
+            self.survey.participant_config,
+            json.dumps(participant_config, separators=(",", ":"), ensure_ascii=False),
+        )
+
+    def test_participant_config_disabled_field(self):
+        self.survey.survey_config["sections"][0]["fields"][0]["disabled"] = True
+        participant_config = json.loads(self.survey.build_participant_config())
+        self.assertEqual(
+            participant_config["sections"][0]["fields"][0],
+            dict(type=self.survey.survey_config["sections"][0]["fields"][0]["type"], disabled=True),
+        )
+
     def test_generate_mock_responses(self):
         self.survey.generate_mock_responses()
 
@@ -64,3 +95,123 @@ class TestSurveyEvidenceSection(TestCase):
         # Verify fields are accessible
         self.assertIsNotNone(survey.fields)
         self.assertTrue(survey.fields)
+
+
+class TestSurveyConfig(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+
+    def test_shared_config(self):
+        """
+        Surveys with the same questions share one stored configuration
+        """
+        other_survey = SurveyFactory(survey_body_path=self.survey.survey_body_path)
+        other_survey.initialise()
+        other_survey.save()
+        self.assertEqual(other_survey.config_id, self.survey.config_id)
+        self.assertEqual(SurveyConfig.objects.count(), 1)
+
+    def test_modified_config(self):
+        """
+        Changing one survey's questions doesn't change the other surveys sharing them
+        """
+        config = self.survey.config
+        survey = Survey.objects.get(pk=self.survey.pk)
+        survey.survey_config["sections"][0]["title"] = "Changed"
+        survey.save()
+
+        self.assertNotEqual(survey.config_id, config.pk)
+        self.assertEqual(survey.config_hash, SurveyConfig.digest(survey.survey_config))
+        config.refresh_from_db()
+        self.assertNotEqual(config.value["sections"][0]["title"], "Changed")
+
+    def test_no_config(self):
+        self.survey.survey_config = None
+        self.survey.save()
+        self.assertIsNone(Survey.objects.get(pk=self.survey.pk).survey_config)
+
+
+class TestSpooledSurveyResponse(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+
+    def test_drain(self):
+        answers = self.survey._generate_mock_response()
+        SpooledSurveyResponse.objects.create(survey=self.survey, value=json.dumps(answers))
+        SpooledSurveyResponse.objects.create(survey=self.survey, value=json.dumps([]))
+        SpooledSurveyResponse.objects.create(survey=self.survey, value="not-valid-json")
+
+        accepted, rejected, duplicate = SpooledSurveyResponse.drain()
+
+        self.assertEqual((accepted, rejected, duplicate), (1, 2, 0))
+        self.assertEqual(self.survey.survey_response.get().answers, answers)
+        # Rejected submissions are kept, with the reason, and aren't processed again
+        self.assertEqual(self.survey.spooled_responses.count(), 2)
+        for spooled in self.survey.spooled_responses.all():
+            self.assertTrue(spooled.error)
+        self.assertEqual(SpooledSurveyResponse.drain(), (0, 0, 0))
+
+    def test_drain_repeated_submission(self):
+        submission_key = uuid.uuid4()
+        self.survey.accept_responses(
+            [self.survey._generate_mock_response()], submission_keys=[submission_key]
+        )
+        SpooledSurveyResponse.objects.create(
+            survey=self.survey,
+            value=json.dumps(self.survey._generate_mock_response()),
+            submission_key=submission_key,
+        )
+
+        self.assertEqual(SpooledSurveyResponse.drain(), (0, 0, 1))
+        self.assertEqual(self.survey.survey_response.count(), 1)
+        self.assertFalse(self.survey.spooled_responses.exists())
+
+    def test_drain_command_after_repeated_submission(self):
+        """
+        A batch of nothing but repeated submissions doesn't stop the command early.
+        """
+        submission_key = uuid.uuid4()
+        self.survey.accept_responses([self.survey._generate_mock_response()], submission_keys=[submission_key])
+        SpooledSurveyResponse.objects.create(
+            survey=self.survey,
+            value=json.dumps(self.survey._generate_mock_response()),
+            submission_key=submission_key,
+        )
+        for _ in range(3):
+            SpooledSurveyResponse.objects.create(
+                survey=self.survey, value=json.dumps(self.survey._generate_mock_response())
+            )
+
+        stdout = io.StringIO()
+        call_command("drain_responses", batch_size=1, stdout=stdout, stderr=io.StringIO())
+
+        self.assertIn("3 saved, 0 rejected, 1 already saved", stdout.getvalue())
+        self.assertEqual(self.survey.survey_response.count(), 4)
+        self.assertFalse(self.survey.spooled_responses.exists())
+
+    def test_drain_batch_size(self):
+        for _ in range(3):
+            SpooledSurveyResponse.objects.create(
+                survey=self.survey, value=json.dumps(self.survey._generate_mock_response())
+            )
+
+        self.assertEqual(SpooledSurveyResponse.drain(batch_size=2), (2, 0, 0))
+        self.assertEqual(SpooledSurveyResponse.drain(batch_size=2), (1, 0, 0))
+        self.assertEqual(self.survey.survey_response.count(), 3)
+        self.assertFalse(self.survey.spooled_responses.exists())
+
+    def test_drain_inactive_survey(self):
+        """
+        Submissions received before the survey was paused are still saved.
+        """
+        SpooledSurveyResponse.objects.create(
+            survey=self.survey, value=json.dumps(self.survey._generate_mock_response())
+        )
+        self.survey.is_active = False
+        self.survey.save()
+
+        self.assertEqual(SpooledSurveyResponse.drain(), (1, 0, 0))
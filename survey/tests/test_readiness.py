@@ -0,0 +1,186 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+import SORT.test.test_case
+from home.models import Project
+from home.services import organisation_service
+from SORT.test.model_factory import SurveyFactory
+from survey import readiness
+from survey.models import OrganisationReadiness, ProjectReadiness, Survey, SurveyReadiness
+from survey.readiness import readiness_columns
+from survey.response_index import ResponseIndex
+
+
+class TestReadiness(TestCase):
+    def test_maturity(self):
+        self.assertEqual(readiness.maturity(0.2)["label"], "Not yet planned")
+        self.assertEqual(readiness.maturity(2.5)["label"], "Substantial progress")
+        self.assertEqual(readiness.maturity(4)["label"], "Established")
+        self.assertEqual(readiness.maturity(None)["label"], readiness.MATURITY_LABEL_UNKNOWN)
+
+    def test_heatmap(self):
+        heatmap = readiness.heatmap([("One", "/one", {"B": 1.0}), ("Two", None, {"A": 3.0, "B": 2.0})])
+        self.assertEqual(heatmap["titles"], ["A", "B"])
+        self.assertEqual([cell["mean"] for cell in heatmap["rows"][0]["cells"]], [None, 1.0])
+        self.assertEqual(
+            [cell["label"] for cell in heatmap["rows"][1]["cells"]], ["Substantial progress", "Early progress"]
+        )
+
+
+class TestReadinessRollups(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=5)
+        self.project = self.survey.project
+        self.organisation = self.project.organisation
+
+    def refresh(self):
+        SurveyReadiness.refresh_stale(Survey.objects.all())
+
+    def expected_means(self, *surveys) -> dict[str, float]:
+        """
+        The mean score of each SORT section, as shown in the report's summary matrix.
+        """
+        answers = [
+            answers for survey in surveys for answers in survey.survey_response.values_list("answers", flat=True)
+        ]
+        index = ResponseIndex(self.survey.layout, answers)
+        stats = index.stats(index.everyone)
+        return {
+            readiness.section_title(section): next(
+                field["mean"] for field in stats["sections"][section.index]["fields"] if "mean" in field
+            )
+            for section in self.survey.layout.sections
+            if section.type == "sort"
+        }
+
+    def assertMeansEqual(self, means: dict, expected: dict):
+        self.assertEqual(means.keys(), expected.keys())
+        for title, mean in expected.items():
+            self.assertAlmostEqual(means[title], mean)
+
+    def test_readiness_columns(self):
+        columns = readiness_columns(self.survey.layout)
+        self.assertTrue(columns)
+        self.assertEqual({title for title, _ in columns.values()}, set(self.expected_means(self.survey)))
+
+    def test_marked_stale_on_save(self):
+        # Participants' submissions don't work out the totals
+        self.refresh()
+        totals = list(SurveyReadiness.objects.values_list("title", "score_total", "answer_count"))
+        self.survey.generate_mock_responses(num_responses=1)
+
+        self.assertTrue(Survey.objects.get(pk=self.survey.pk).readiness_stale)
+        self.assertEqual(list(SurveyReadiness.objects.values_list("title", "score_total", "answer_count")), totals)
+
+    def test_marked_stale_on_delete(self):
+        self.refresh()
+        self.survey.survey_response.last().delete()
+        self.assertTrue(Survey.objects.get(pk=self.survey.pk).readiness_stale)
+
+        self.refresh()
+        self.assertMeansEqual(
+            SurveyReadiness.means_for([self.survey.pk])[self.survey.pk], self.expected_means(self.survey)
+        )
+
+    def test_stale_mark_kept_on_survey_save(self):
+        # A copy of the survey loaded before a response was saved
+        self.refresh()
+        survey = Survey.objects.get(pk=self.survey.pk)
+        self.survey.generate_mock_responses(num_responses=1)
+
+        survey.name = "Renamed"
+        survey.save()
+
+        self.assertTrue(Survey.objects.get(pk=self.survey.pk).readiness_stale)
+        self.assertEqual(Survey.objects.get(pk=self.survey.pk).name, "Renamed")
+
+    def test_refreshed_once(self):
+        self.assertEqual(SurveyReadiness.refresh_stale(Survey.objects.all()), 1)
+        self.assertEqual(SurveyReadiness.refresh_stale(Survey.objects.all()), 0)
+
+    def test_added_up_on_refresh(self):
+        self.refresh()
+        expected = self.expected_means(self.survey)
+        self.assertMeansEqual(SurveyReadiness.means_for([self.survey.pk])[self.survey.pk], expected)
+        self.assertMeansEqual(ProjectReadiness.means_for([self.project.pk])[self.project.pk], expected)
+        self.assertMeansEqual(OrganisationReadiness.means_for([self.organisation.pk])[self.organisation.pk], expected)
+
+    def test_rolled_up_across_surveys(self):
+        other_survey = SurveyFactory(project=self.project)
+        other_survey.initialise()
+        other_survey.save()
+        other_survey.generate_mock_responses(num_responses=3)
+        self.refresh()
+
+        expected = self.expected_means(self.survey, other_survey)
+        self.assertMeansEqual(ProjectReadiness.means_for([self.project.pk])[self.project.pk], expected)
+        self.assertMeansEqual(OrganisationReadiness.means_for([self.organisation.pk])[self.organisation.pk], expected)
+
+    def test_deleted_survey(self):
+        other_survey = SurveyFactory(project=self.project)
+        other_survey.initialise()
+        other_survey.save()
+        other_survey.generate_mock_responses(num_responses=3)
+        self.refresh()
+
+        other_survey.delete()
+
+        expected = self.expected_means(self.survey)
+        self.assertMeansEqual(ProjectReadiness.means_for([self.project.pk])[self.project.pk], expected)
+
+    def test_rebuild(self):
+        self.refresh()
+        expected = self.expected_means(self.survey)
+        ProjectReadiness.objects.update(score_total=0)
+        OrganisationReadiness.objects.all().delete()
+
+        call_command("rebuild_field_aggregates", stdout=io.StringIO())
+
+        self.assertMeansEqual(ProjectReadiness.means_for([self.project.pk])[self.project.pk], expected)
+        self.assertMeansEqual(OrganisationReadiness.means_for([self.organisation.pk])[self.organisation.pk], expected)
+
+
+class TestReadinessViews(SORT.test.test_case.ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=2)
+        self.project = self.survey.project
+        self.user = self.project.organisation.members.first()
+
+    def test_project_heatmap(self):
+        response = self.get("project", project_id=self.project.pk)
+        heatmap = response.context["readiness_heatmap"]
+        self.assertTrue(heatmap["titles"])
+        self.assertEqual([row["name"] for row in heatmap["rows"]], [self.survey.name, "All surveys"])
+        self.assertTrue(all(cell["mean"] is not None for row in heatmap["rows"] for cell in row["cells"]))
+
+    def test_organisation_heatmap(self):
+        response = self.get("myorganisation")
+        heatmap = response.context["readiness_heatmap"]
+        self.assertEqual([row["name"] for row in heatmap["rows"]], [self.project.name, "All projects"])
+        self.assertTrue(all(cell["mean"] is not None for row in heatmap["rows"] for cell in row["cells"]))
+
+    def test_organisation_heatmap_only_counts_visible_projects(self):
+        hidden_survey = SurveyFactory(project__organisation=self.project.organisation)
+        hidden_survey.initialise()
+        hidden_survey.save()
+        hidden_survey.generate_mock_responses(num_responses=3)
+        visible_projects = Project.objects.filter(pk=self.project.pk)
+
+        with mock.patch.object(organisation_service, "get_organisation_projects", return_value=visible_projects):
+            response = self.get("myorganisation")
+
+        rows = response.context["readiness_heatmap"]["rows"]
+        self.assertEqual([row["name"] for row in rows], [self.project.name, "All projects"])
+        self.assertEqual([cell["mean"] for cell in rows[1]["cells"]], [cell["mean"] for cell in rows[0]["cells"]])
+        # The hidden project's totals aren't worked out either
+        self.assertTrue(Survey.objects.get(pk=hidden_survey.pk).readiness_stale)
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from survey.registry import DataFileRegistry, data_files
+
+
+class TestDataFileRegistry(SimpleTestCase):
+    def setUp(self):
+        self.registry = DataFileRegistry()
+        self.path = Path(tempfile.mkdtemp()).joinpath("config.json")
+        self.write(dict(sections=[]))
+
+    def write(self, value, modified: int = 1_000_000_000):
+        self.path.write_text(json.dumps(value))
+        os.utime(self.path, ns=(modified, modified))
+
+    def test_load_once(self):
+        value = self.registry.load(self.path)
+        self.assertIs(self.registry.load(self.path), value)
+
+    def test_reload_when_changed(self):
+        self.registry.load(self.path)
+        self.write(dict(sections=[dict(title="New")]), modified=2_000_000_000)
+        self.assertEqual(self.registry.load(self.path)["sections"][0]["title"], "New")
+
+    def test_invalid(self):
+        self.write(dict(questions=[]))
+        with self.assertRaises(ImproperlyConfigured):
+            self.registry.load(self.path, schema=self.registry.survey_config_schema)
+
+    def test_survey_templates_are_valid(self):
+        for filename in data_files.survey_template_filenames:
+            with self.subTest(filename=filename):
+                self.assertIn("sections", data_files.survey_template(filename))
+
+    def test_readiness_descriptions_from_any_directory(self):
+        cwd = os.getcwd()
+        os.chdir(self.path.parent)
+        try:
+            self.assertTrue(DataFileRegistry().readiness_descriptions)
+        finally:
+            os.chdir(cwd)
@@ -0,0 +1,239 @@
+import json
+from http import HTTPStatus
+from unittest import mock
+
+import django.urls
+from django.core.cache import cache
+from django.test import TestCase
+
+import SORT.test.model_factory
+import SORT.test.test_case
+from survey.layout import get_layout
+from survey.response_index import ResponseIndex
+from survey.stats import get_answer
+
+
+class TestResponseIndex(TestCase):
+    def setUp(self):
+        self.layout = get_layout(
+            dict(
+                sections=[
+                    dict(
+                        type="demographic",
+                        fields=[
+                            dict(type="radio", label="Role", options=["Nurse", "Midwife"]),
+                            dict(type="text", label="Years", textType="DECIMALS_TEXT"),
+                            dict(type="checkbox", label="Sites", options=["A", "B"], hasOtherOption=True),
+                        ],
+                    ),
+                    dict(
+                        fields=[
+                            dict(type="likert", label="", options=["1", "2", "3"], sublabels=["First", "Second"]),
+                            dict(type="textarea", label="Comments"),
+                        ]
+                    ),
+                ]
+            )
+        )
+        self.responses = [
+            [["Nurse", "2", ["A"]], [["1", "3"], "Good"]],
+            [["Midwife", "2.5", ["A", "B"]], [["2", "2"], ""]],
+            [["Nurse", "7", ["C"]], [["3", "3"], "Bad"]],
+            [["Nurse", "not a number", []], [["1", "1"], "Fine"]],
+        ]
+        self.index = ResponseIndex(self.layout, self.responses)
+
+    def matching(self, predicate) -> list:
+        return [answers for answers in self.responses if predicate(answers)]
+
+    def expected_stats(self, responses: list) -> dict:
+        """
+        The statistics of an index of only these responses.
+        """
+        index = ResponseIndex(self.layout, responses)
+        return index.stats(index.everyone)
+
+    def test_all_responses(self):
+        role, years, sites = self.index.stats(self.index.everyone)["sections"][0]["fields"]
+        likert, comments = self.index.stats(self.index.everyone)["sections"][1]["fields"]
+        self.assertEqual(role["histogram"], [dict(option="Nurse", count=3), dict(option="Midwife", count=1)])
+        self.assertEqual(years["values"], ["2", "2.5", "7", "not a number"])
+        # Including the other option, after the configured ones
+        self.assertEqual(
+            sites["histogram"], [dict(option="A", count=2), dict(option="B", count=1), dict(option="C", count=1)]
+        )
+        self.assertEqual([option["count"] for option in likert["histograms"][1]], [1, 1, 2])
+        self.assertEqual(likert["mean"], 2)
+        self.assertEqual(comments["values"], ["Good", "", "Bad", "Fine"])
+
+    def test_no_responses(self):
+        self.assertIsNone(self.index.stats(0))
+        self.assertIsNone(ResponseIndex(self.layout, []).stats(0))
+
+    def test_options(self):
+        selection = self.index.select([dict(section=0, field=0, options=["Nurse"])])
+        self.assertEqual(selection.bit_count(), 3)
+        self.assertEqual(
+            self.index.stats(selection),
+            self.expected_stats(self.matching(lambda answers: answers[0][0] == "Nurse")),
+        )
+
+    def test_checkbox(self):
+        selection = self.index.select([dict(section=0, field=2, options=["B", "C"])])
+        self.assertEqual(
+            self.index.stats(selection)["sections"][1]["fields"][1]["values"],
+            ["", "Bad"],
+        )
+
+    def test_range(self):
+        years = self.layout.sections[0].fields[1]
+        for low, high in [(2, 2.5), (2.2, 7), (0, 100), (3, 6)]:
+            with self.subTest(low=low, high=high):
+                selection = self.index.select([dict(section=0, field=1, min=low, max=high)])
+                expected = self.matching(
+                    lambda answers: get_answer(answers, years).replace(".", "").isdigit()
+                    and low <= float(get_answer(answers, years)) <= high
+                )
+                self.assertEqual(selection.bit_count(), len(expected))
+                self.assertEqual(self.index.stats(selection), self.expected_stats(expected))
+
+    def test_combined(self):
+        selection = self.index.select(
+            [dict(section=0, field=0, options=["Nurse"]), dict(section=0, field=1, min=0, max=5)]
+        )
+        self.assertEqual(selection.bit_count(), 1)
+
+    def test_invalid_filters(self):
+        for filters in [
+            ["not a filter"],
+            [dict(section=5, field=0, options=["Nurse"])],
+            [dict(section=0, field=0, options="Nurse")],
+            [dict(section=0, field=1, min="few", max=5)],
+            [dict(section=1, field=0, options=["1"])],
+            [dict(section=-1, field=0, options=["1"])],
+            [dict(section=[0], field=0, options=["Nurse"])],
+            5,
+            dict(section=0, field=0, options=["Nurse"]),
+        ]:
+            with self.subTest(filters=filters):
+                with self.assertRaises(ValueError):
+                    self.index.select(filters)
+
+    def test_infinite_number(self):
+        # Too big to be anything but infinity
+        self.responses.append([["Nurse", "1e999", []], [["1", "1"], "Huge"]])
+        index = ResponseIndex(self.layout, self.responses)
+        self.assertEqual(index.select([dict(section=0, field=1, min=0, max=1e308)]).bit_count(), 3)
+
+
+class TestFilterOptions(TestCase):
+    def test_filter_options(self):
+        survey = SORT.test.model_factory.SurveyFactory()
+        survey.survey_config = dict(
+            sections=[
+                dict(
+                    type="demographic",
+                    title="About you",
+                    fields=[
+                        dict(type="radio", label="Role", options=["Nurse", "Midwife"], hasOtherOption=True),
+                        dict(type="text", label="Years", textType="DECIMALS_TEXT"),
+                        # Without any options, every answer is an "other" answer
+                        dict(type="checkbox", label="Sites", options=[], hasOtherOption=True),
+                        dict(type="text", label="Team", disabled=True),
+                    ],
+                )
+            ]
+        )
+        survey.save()
+        survey.accept_responses(
+            [
+                [["Nurse", "2", ["A"], ""]],
+                [["Midwife", "7", ["C", "A"], ""]],
+                [["Nurse", "not a number", [], ""]],
+            ]
+        )
+        with mock.patch("survey.models.ResponseIndex") as build:
+            filter_options = survey.live_filter_options()
+            build.assert_not_called()
+        self.assertEqual(
+            filter_options,
+            [
+                dict(section=0, field=0, label="Role", options=["Nurse", "Midwife"]),
+                dict(section=0, field=1, label="Years", min=2, max=7),
+                dict(section=0, field=2, label="Sites", options=["A", "C"]),
+            ],
+        )
+
+
+class TestSurveyReportFilterView(SORT.test.test_case.ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.survey = SORT.test.model_factory.SurveyFactory()
+        self.user = self.survey.project.organisation.members.first()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=8)
+        self.demographic_field = next(
+            field
+            for section in self.survey.layout.sections
+            if section.type == "demographic"
+            for field in section.fields
+            if field.type == "radio"
+        )
+
+    def post_filters(self, body, expected_status_code=HTTPStatus.OK) -> dict:
+        self.login()
+        response = self.client.post(
+            django.urls.reverse("survey_report_filter", kwargs={"pk": self.survey.pk}),
+            data=json.dumps(body),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, expected_status_code)
+        return response.json()
+
+    def test_filter(self):
+        option = self.demographic_field.config["options"][0]
+        answers = [
+            answers
+            for answers in self.survey.survey_response.values_list("answers", flat=True)
+            if get_answer(answers, self.demographic_field) == option
+        ]
+        result = self.post_filters(
+            dict(
+                filters=[
+                    dict(
+                        section=self.demographic_field.section_index,
+                        field=self.demographic_field.index,
+                        options=[option],
+                    )
+                ]
+            )
+        )
+        self.assertEqual(result["response_count"], len(answers))
+        # The same as an index of only those responses
+        index = ResponseIndex(self.survey.layout, answers)
+        self.assertEqual(result["survey_stats"], index.stats(index.everyone))
+
+    def test_no_filters(self):
+        result = self.post_filters(dict(filters=[]))
+        self.assertEqual(result["response_count"], 8)
+        self.assertEqual(result["survey_stats"], self.survey.response_stats())
+
+    def test_index_cached(self):
+        with mock.patch("survey.models.ResponseIndex", wraps=ResponseIndex) as build:
+            self.survey.response_index()
+            index = self.survey.response_index()
+            self.assertEqual(build.call_count, 1)
+            self.assertEqual(index.stats(index.everyone), self.survey.response_stats())
+
+            self.survey.generate_mock_responses(num_responses=1)
+            self.assertEqual(self.survey.response_index().count, 9)
+            self.assertEqual(build.call_count, 2)
+
+    def test_invalid_filter(self):
+        result = self.post_filters(dict(filters=[dict(section=99, field=0)]), HTTPStatus.BAD_REQUEST)
+        self.assertIn("error", result)
+        self.post_filters(["not", "an", "object"], HTTPStatus.BAD_REQUEST)
+        self.post_filters(dict(filters=5), HTTPStatus.BAD_REQUEST)
+        self.post_filters(dict(filters=[dict(section=0, field=[0])]), HTTPStatus.BAD_REQUEST)
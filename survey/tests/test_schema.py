@@ -11,6 +11,7 @@ from survey.schema import (
     _likert_schema,
     _radio_schema,
     _text_schema,
+    compile_schema,
     field_schema,
 )
 
@@ -208,6 +209,68 @@ class TestFieldSchema(TestCase):
         self.assertEqual(schema, {})
 
 
+class TestCompileSchema(TestCase):
+    """The compiled checks must agree with a full JSON Schema validator."""
+
+    FIELD_CONFIGS = (
+        TestFieldSchema.LIKERT_CONFIG,
+        TestFieldSchema.RADIO_CONFIG,
+        {**TestFieldSchema.RADIO_CONFIG, "type": "select", "required": True},
+        {"type": "radio"},
+        TestFieldSchema.CHECKBOX_CONFIG,
+        {**TestFieldSchema.CHECKBOX_CONFIG, "required": True},
+        {"type": "checkbox"},
+        TestFieldSchema.TEXT_CONFIG,
+        {"type": "textarea", "required": True},
+        {"type": "unknown_widget"},
+    )
+    VALUES = (
+        None, 0, 1, True, "", "0", "Yes", "Other", "A",
+        [], ["0"], ["0", "2", "4"], ["0", "99", "4"], [0, 1, 2], ["A", "C"], ["A", "Z"],
+        ["0", "1", "2", "3"], {"0": "1"},
+    )
+
+    def test_field_checks_agree_with_jsonschema(self):
+        for config in self.FIELD_CONFIGS:
+            schema = field_schema(config)
+            check = compile_schema(schema)
+            self.assertIsNotNone(check)
+            for value in self.VALUES:
+                with self.subTest(config=config, value=value):
+                    self.assertEqual(
+                        check(value),
+                        jsonschema.Draft202012Validator(schema).is_valid(value),
+                    )
+
+    def test_survey_check_agrees_with_jsonschema(self):
+        survey = SurveyFactory()
+        survey.initialise()
+        survey.save()
+        check = compile_schema(survey.response_schema)
+        validator = jsonschema.Draft202012Validator(survey.response_schema)
+
+        answers = survey._generate_mock_response()
+        self.assertTrue(check(answers))
+
+        shorter = copy.deepcopy(answers)
+        shorter[0].pop()
+        longer = copy.deepcopy(answers)
+        longer.append(["extra"])
+        for invalid in (shorter, longer, answers[:-1], [], "[]", None):
+            with self.subTest(answers=invalid):
+                self.assertFalse(check(invalid))
+                self.assertFalse(validator.is_valid(invalid))
+
+    def test_compiled_check_is_shared_between_identical_schemas(self):
+        schema = _likert_schema(TestFieldSchema.LIKERT_CONFIG)
+        self.assertIs(compile_schema(schema), compile_schema(copy.deepcopy(schema)))
+
+    def test_unsupported_schema_is_not_compiled(self):
+        self.assertIsNone(compile_schema({"type": "object"}))
+        self.assertIsNone(compile_schema({"type": "string", "pattern": "^a"}))
+        self.assertIsNone(compile_schema({"enum": [["Yes", "I agree"]]}))
+
+
 class TestSurveyResponseValidate(TestCase):
     """Integration tests for SurveyResponse.validate() using minimal survey configs."""
 
@@ -0,0 +1,94 @@
+from django.test import TestCase
+
+import SORT.test.model_factory
+import SORT.test.test_case
+from survey.layout import get_layout
+from survey.models import SurveyEvidenceSection
+from survey.response_index import ResponseIndex
+
+
+class TestSurveyStats(TestCase):
+    """
+    The statistics of all the responses, worked out from their answers as the report
+    page in the browser does.
+    """
+
+    def setUp(self):
+        self.layout = get_layout(
+            dict(
+                sections=[
+                    dict(
+                        fields=[
+                            dict(type="radio", label="", options=["A", "B", "C"]),
+                            dict(type="checkbox", label="", options=["X", "Y"]),
+                            dict(
+                                type="likert",
+                                label="",
+                                options=["1", "2", "3"],
+                                sublabels=["First", "Second"],
+                            ),
+                            dict(type="text", label=""),
+                        ]
+                    )
+                ]
+            )
+        )
+
+    def survey_stats(self, responses: list) -> dict:
+        index = ResponseIndex(self.layout, responses)
+        return index.stats(index.everyone)
+
+    def test_no_responses(self):
+        self.assertIsNone(self.survey_stats([]))
+
+    def test_stats(self):
+        responses = [
+            [["A", ["X", "Y"], ["1", "3"], "Some text"]],
+            [["C", ["Y"], ["2", "3"], "More text"]],
+            [["A", [], ["3", "3"], None]],
+        ]
+        radio, checkbox, likert, text = self.survey_stats(responses)["sections"][0]["fields"]
+
+        self.assertEqual(
+            radio["histogram"],
+            [dict(option="A", count=2), dict(option="B", count=0), dict(option="C", count=1)],
+        )
+        self.assertNotIn("mean", radio)
+        self.assertEqual(checkbox["histogram"], [dict(option="X", count=1), dict(option="Y", count=2)])
+        self.assertEqual([option["count"] for option in likert["histograms"][0]], [1, 1, 1])
+        self.assertEqual([option["count"] for option in likert["histograms"][1]], [0, 0, 3])
+        self.assertTrue(likert["areValuesNumeric"])
+        self.assertEqual(likert["mean"], 15 / 6)
+        self.assertEqual((likert["min"], likert["max"]), (1, 3))
+        self.assertEqual(text["values"], ["Some text", "More text"])
+
+    def test_misaligned_answers(self):
+        """
+        Answers that don't fit the layout are skipped, and values that aren't options are counted too
+        """
+        responses = [[["D"]], [], None, [["B", ["X"], ["1", "2"], ""]]]
+        radio, checkbox, likert, _ = self.survey_stats(responses)["sections"][0]["fields"]
+        self.assertEqual([option["option"] for option in radio["histogram"]], ["A", "B", "C", "D"])
+        self.assertEqual(sum(option["count"] for option in radio["histogram"]), 2)
+        self.assertEqual(checkbox["histogram"], [dict(option="X", count=1), dict(option="Y", count=0)])
+        self.assertEqual(likert["mean"], 1.5)
+
+
+class TestSurveyStatsViews(SORT.test.test_case.ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey = SORT.test.model_factory.SurveyFactory()
+        self.user = self.survey.project.organisation.members.first()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=5)
+
+    def test_evidence_gathering(self):
+        SurveyEvidenceSection.objects.create(survey=self.survey, section_id=0)
+        response = self.get("survey_evidence_gathering", pk=self.survey.pk, section_id=0)
+        self.assertEqual(response.context["survey_stats"], self.survey.response_stats())
+        self.assertNotIn("responses", response.context)
+
+    def test_report(self):
+        response = self.get("survey_report", pk=self.survey.pk)
+        self.assertEqual(response.context["survey_stats"], self.survey.response_stats())
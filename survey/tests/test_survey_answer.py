@@ -0,0 +1,147 @@
+import io
+import statistics
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from SORT.test.model_factory import SurveyFactory
+from survey.models import SurveyAnswer
+from survey.response_index import ResponseIndex
+
+
+class TestSurveyAnswer(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=4)
+        self.likert_field = next(field for field in self.survey.layout.fields if field.type == "likert")
+        self.radio_field = next(field for field in self.survey.layout.fields if field.type == "radio")
+
+    def column_values(self, column: int) -> list[str]:
+        return [list(response.answers_values)[column] for response in self.survey.survey_response.all()]
+
+    def test_stored_on_save(self):
+        self.assertTrue(self.survey.answer_facts.exists())
+        self.assertEqual(
+            set(self.survey.answer_facts.values_list("response", flat=True)),
+            set(self.survey.survey_response.values_list("pk", flat=True)),
+        )
+
+    def test_histogram(self):
+        column = self.radio_field.column
+        histogram = {
+            row["option"]: row["count"] for row in self.survey.answer_facts.filter(column=column).histogram()
+        }
+        expected = dict()
+        for value in self.column_values(column):
+            option = self.radio_field.option_indexes[value]
+            expected[option] = expected.get(option, 0) + 1
+        self.assertEqual(histogram, expected)
+
+    def test_means(self):
+        column = self.likert_field.column
+        mean = self.survey.answer_facts.filter(column=column).means().get()["mean"]
+        self.assertAlmostEqual(mean, statistics.mean(float(value) for value in self.column_values(column)))
+
+    def test_breakdown(self):
+        response = self.survey.survey_response.first()
+        option = self.radio_field.option_indexes[list(response.answers_values)[self.radio_field.column]]
+        respondents = set(
+            self.survey.answer_facts.for_respondents_who_chose(self.radio_field.column, option).values_list(
+                "response", flat=True
+            )
+        )
+        self.assertIn(response.pk, respondents)
+        for pk in respondents:
+            self.assertTrue(
+                self.survey.answer_facts.filter(response=pk, column=self.radio_field.column, option=option).exists()
+            )
+
+    def test_invalid_response(self):
+        answers = self.survey._generate_mock_response()
+        del answers[-1]
+        response = self.survey.survey_response.create(answers=answers)
+        self.assertFalse(SurveyAnswer.objects.filter(response=response).exists())
+
+    def test_answers_changed(self):
+        # e.g. in the admin site: the answers are checked again before they're stored
+        response = self.survey.survey_response.get(pk=self.survey.survey_response.first().pk)
+        del response.answers[-1]
+        response.save()
+        response.refresh_from_db()
+        self.assertFalse(response.is_valid)
+        self.assertFalse(SurveyAnswer.objects.filter(response=response).exists())
+
+        response.answers = self.survey._generate_mock_response()
+        response.save()
+        response.refresh_from_db()
+        self.assertTrue(response.is_valid)
+        self.assertEqual(response.row, list(response.answers_values))
+        self.assertTrue(SurveyAnswer.objects.filter(response=response).exists())
+
+    def test_rebuild(self):
+        count = self.survey.answer_facts.count()
+        SurveyAnswer.objects.all().delete()
+
+        call_command("rebuild_survey_answers", stdout=io.StringIO())
+
+        self.assertEqual(self.survey.answer_facts.count(), count)
+
+
+class TestSurveyFieldAggregate(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=6)
+
+    def counts(self) -> dict:
+        return {
+            (column, option): count
+            for column, option, count in self.survey.field_aggregates.exclude(count=0).values_list(
+                "column", "option", "count"
+            )
+        }
+
+    def fact_counts(self) -> dict:
+        return {(row["column"], row["option"]): row["count"] for row in self.survey.answer_facts.histogram()}
+
+    def test_counted_on_save(self):
+        self.assertTrue(self.counts())
+        self.assertEqual(self.counts(), self.fact_counts())
+
+    def test_changed_answers(self):
+        survey_response = self.survey.survey_response.first()
+        survey_response.answers = self.survey._generate_mock_response()
+        survey_response.save()
+        SurveyAnswer.replace_for(self.survey.survey_response.all())
+
+        self.assertEqual(self.counts(), self.fact_counts())
+
+    def test_response_stats(self):
+        # The same as worked out from the answers
+        index = ResponseIndex(self.survey.layout, self.survey.survey_response.values_list("answers", flat=True))
+        self.assertEqual(self.survey.response_stats(), index.stats(index.everyone))
+
+    def test_response_stats_without_responses(self):
+        self.survey.survey_response.all().delete()
+        self.assertIsNone(self.survey.response_stats())
+
+    def test_deleted_response(self):
+        self.survey.survey_response.last().delete()
+        self.assertEqual(self.counts(), self.fact_counts())
+
+    def test_deleted_responses(self):
+        # e.g. the admin site's bulk delete
+        self.survey.survey_response.filter(pk__in=self.survey.survey_response.values("pk")[:3]).delete()
+        self.assertEqual(self.counts(), self.fact_counts())
+
+    def test_rebuild(self):
+        # Counts changed by hand are out of date
+        self.survey.field_aggregates.update(count=0)
+        self.assertNotEqual(self.counts(), self.fact_counts())
+
+        call_command("rebuild_field_aggregates", survey_id=self.survey.pk, stdout=io.StringIO())
+
+        self.assertEqual(self.counts(), self.fact_counts())
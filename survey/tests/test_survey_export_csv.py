@@ -1,10 +1,11 @@
 import csv
 import io
+from unittest import mock
 
 from django.test import TestCase
 
 from SORT.test.model_factory import SurveyFactory
-from survey.models import SurveyResponse
+from survey.models import Survey, SurveyResponse
 
 
 class TestSurveyCsvExport(TestCase):
@@ -133,3 +134,30 @@ class TestSurveyCsvExport(TestCase):
                 self.assertTrue(question)
                 self.assertIsNotNone(answer, f"missing answer for {question}")
                 self.assertTrue(answer, f"question: {question} answer: {answer}")
+
+    def test_csv_export_uses_stored_rows(self):
+        """
+        Each response's row of data is stored when it's submitted, so exporting
+        doesn't need to flatten the answers again.
+        """
+        csv_data = self.survey.to_csv()
+        with mock.patch.object(SurveyResponse, "answers_values", new_callable=mock.PropertyMock) as answers_values:
+            self.assertEqual(self.survey.to_csv(), csv_data)
+        answers_values.assert_not_called()
+
+    def test_csv_export_after_configuration_change(self):
+        """
+        Stored rows are rebuilt when the questions change.
+        """
+        self.survey.update(
+            consent_config=dict(sections=[]),
+            demography_config=self.survey.demography_config_default,
+        )
+        self.survey.save()
+
+        rows = list(csv.reader(io.StringIO(self.survey.to_csv())))
+
+        self.assertEqual(tuple(rows[0]), self.survey.fields)
+        for survey_response in self.survey.survey_response.all():
+            survey_response.survey = Survey.objects.get(pk=self.survey.pk)
+            self.assertEqual(survey_response.row, list(survey_response.answers_values))
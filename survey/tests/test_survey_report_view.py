@@ -3,11 +3,24 @@ Tests for the survey report page, which renders the data analysis of a survey's
 responses.
 """
 
+import io
 from http import HTTPStatus
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.urls import reverse
 
 import SORT.test.model_factory
 import SORT.test.test_case
-from survey.models import SurveyResponse
+from survey.models import (
+    Survey,
+    SurveyEvidenceFile,
+    SurveyEvidenceSection,
+    SurveyImprovementPlanSection,
+    SurveyReadiness,
+    SurveyResponse,
+)
 
 
 class SurveyReportViewTestCase(SORT.test.test_case.ViewTestCase):
@@ -41,8 +54,9 @@ class SurveyReportViewTestCase(SORT.test.test_case.ViewTestCase):
         response = self.get("survey_report", pk=self.survey.pk)
 
         self.assertEqual(response.context["response_count"], 3)
+        self.assertEqual(response.context["valid_response_count"], 3)
         self.assertEqual(response.context["invalid_response_count"], 0)
-        self.assertEqual(len(response.context["responses"]), 3)
+        self.assertNotIn("responses", response.context)
         self.assertNotContains(response, "Some responses could not be included in full")
 
     def test_survey_report_warns_about_responses_that_do_not_match_the_survey(self):
@@ -62,9 +76,8 @@ class SurveyReportViewTestCase(SORT.test.test_case.ViewTestCase):
 
         self.assertEqual(response.context["response_count"], 3)
         self.assertEqual(response.context["invalid_response_count"], 1)
-        # The malformed answers are still sent to the browser, which skips what it
-        # cannot use, so the other answers in that response are not lost.
-        self.assertEqual(len(response.context["responses"]), 3)
+        # The malformed answers are left out of the figures
+        self.assertEqual(response.context["valid_response_count"], 2)
         self.assertContains(response, "Some responses could not be included in full")
 
     def test_survey_report_with_a_response_missing_a_whole_section(self):
@@ -77,3 +90,171 @@ class SurveyReportViewTestCase(SORT.test.test_case.ViewTestCase):
 
         self.assertEqual(response.context["invalid_response_count"], 1)
         self.assertContains(response, "Some responses could not be included in full")
+
+    def test_survey_report_counts_recorded_validation(self):
+        """
+        Responses aren't validated again on each page view.
+        """
+        self.survey.generate_mock_responses(num_responses=3)
+        answers = self.survey._generate_mock_response()
+        del answers[-1]
+        SurveyResponse.objects.create(survey=self.survey, answers=answers)
+
+        with mock.patch.object(Survey, "response_errors") as response_errors:
+            response = self.get("survey_report", pk=self.survey.pk)
+
+        response_errors.assert_not_called()
+        self.assertEqual(response.context["invalid_response_count"], 1)
+
+    def test_survey_report_revalidates_after_configuration_change(self):
+        self.survey.generate_mock_responses(num_responses=2)
+        self.survey.update(
+            consent_config=dict(sections=[]),
+            demography_config=self.survey.demography_config_default,
+        )
+        self.survey.save()
+
+        response = self.get("survey_report", pk=self.survey.pk)
+
+        # The answers no longer line up with the sections
+        self.assertEqual(response.context["invalid_response_count"], 2)
+        self.assertFalse(
+            SurveyResponse.objects.filter(survey=self.survey).exclude(
+                validated_config_version=self.survey.config_version
+            ).exists()
+        )
+
+    def test_report_data_shared_between_pages(self):
+        """
+        The figures are worked out once for the report, evidence gathering and
+        improvement plan pages, until another response is added.
+        """
+        self.survey.generate_mock_responses(num_responses=2)
+        SurveyEvidenceSection.objects.create(survey=self.survey, section_id=0)
+        SurveyImprovementPlanSection.objects.create(survey=self.survey, section_id=0)
+
+        with mock.patch.object(Survey, "response_stats", autospec=True, return_value=None) as response_stats:
+            self.get("survey_report", pk=self.survey.pk)
+            self.get("survey_evidence_gathering", pk=self.survey.pk, section_id=0)
+            self.get("survey_improvement_plan", pk=self.survey.pk, section_id=0)
+            self.assertEqual(response_stats.call_count, 1)
+
+            self.survey.generate_mock_responses(num_responses=1)
+            response = self.get("survey_report", pk=self.survey.pk)
+            self.assertEqual(response_stats.call_count, 2)
+
+        self.assertEqual(response.context["response_count"], 3)
+
+    def test_report_data_refreshed_after_responses_changed(self):
+        """
+        Responses changed in place, rather than added or removed, are shown too.
+        """
+        self.survey.generate_mock_responses(num_responses=3)
+        self.assertEqual(self.get("survey_report", pk=self.survey.pk).context["invalid_response_count"], 0)
+
+        # e.g. in the admin site
+        survey_response = self.survey.survey_response.first()
+        del survey_response.answers[-1]
+        survey_response.save()
+        self.assertEqual(self.get("survey_report", pk=self.survey.pk).context["invalid_response_count"], 1)
+
+        # e.g. by the validate_responses command, after the answers were changed by hand
+        answers = self.survey._generate_mock_response()
+        del answers[-1]
+        SurveyResponse.objects.filter(pk=self.survey.survey_response.last().pk).update(answers=answers)
+        with self.assertRaises(SystemExit):
+            call_command("validate_responses", survey_id=self.survey.pk, stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(self.get("survey_report", pk=self.survey.pk).context["invalid_response_count"], 2)
+
+    def test_survey_only_written_once_after_report_viewed(self):
+        """
+        Submissions don't each write to the survey to record that the figures have
+        changed, only the first one after the figures were worked out.
+        """
+        self.survey.generate_mock_responses(num_responses=2)
+        SurveyReadiness.refresh(self.survey)
+        self.get("survey_report", pk=self.survey.pk)
+
+        flags = list()
+        for _ in range(2):
+            self.survey.generate_mock_responses(num_responses=1)
+            flags.append(
+                Survey.objects.filter(pk=self.survey.pk)
+                .values_list("responses_version", "report_cached", "readiness_stale")
+                .get()
+            )
+        self.assertEqual(flags, [(1, False, True), (1, False, True)])
+        self.assertEqual(self.get("survey_report", pk=self.survey.pk).context["response_count"], 4)
+
+
+class SurveyReportSnapshotTestCase(SORT.test.test_case.ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey = SORT.test.model_factory.SurveyFactory()
+        self.user = self.survey.project.organisation.members.first()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=3)
+
+    def deactivate(self):
+        self.post("survey_deactivate", data=dict(confirm="1"), expected_status_code=HTTPStatus.FOUND, pk=self.survey.pk)
+        self.survey.refresh_from_db()
+
+    def test_snapshot_stored_when_survey_closed(self):
+        self.deactivate()
+
+        snapshot = self.survey.report_snapshots.get()
+        self.assertEqual(snapshot.config_hash, self.survey.config_hash)
+        self.assertEqual(snapshot.data["response_count"], 3)
+        self.assertEqual(snapshot.data["survey_stats"], self.survey.live_report_data()["survey_stats"])
+
+        with mock.patch.object(Survey, "live_report_data") as live_report_data:
+            response = self.get("survey_report", pk=self.survey.pk)
+        live_report_data.assert_not_called()
+        self.assertEqual(response.context["response_count"], 3)
+        # Once the "Survey deactivated" message has been shown
+        self.assertIn("ETag", self.get("survey_report", pk=self.survey.pk))
+
+    def test_not_modified(self):
+        self.deactivate()
+        # The page showing the "Survey deactivated" message is only shown once
+        self.assertNotIn("ETag", self.get("survey_report", pk=self.survey.pk))
+        etag = self.get("survey_report", pk=self.survey.pk)["ETag"]
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = "x" * 32
+        url = reverse("survey_report", kwargs=dict(pk=self.survey.pk))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+        # Editing the evidence changes the page
+        evidence_section = SurveyEvidenceSection.objects.create(survey=self.survey, section_id=1, text="New evidence")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        # and so does adding an evidence file
+        etag = response["ETag"]
+        SurveyEvidenceFile.objects.create(evidence_section=evidence_section, file="evidence/plan.pdf")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_snapshot_removed_when_survey_reopened(self):
+        self.deactivate()
+        self.post("survey_activate", expected_status_code=HTTPStatus.FOUND, pk=self.survey.pk)
+
+        self.assertFalse(self.survey.report_snapshots.exists())
+        response = self.get("survey_report", pk=self.survey.pk)
+        self.assertNotIn("ETag", response)
+
+    def test_snapshot_rebuilt_after_configuration_change(self):
+        self.deactivate()
+        self.survey.update(
+            consent_config=dict(sections=[]),
+            demography_config=self.survey.demography_config_default,
+        )
+        self.survey.save()
+
+        response = self.get("survey_report", pk=self.survey.pk)
+
+        self.assertEqual(response.context["invalid_response_count"], 3)
+        self.assertEqual(self.survey.report_snapshots.get().config_hash, self.survey.config_hash)
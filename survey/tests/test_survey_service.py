@@ -7,6 +7,7 @@ import json
 import django.contrib.auth.models
 import django.core.exceptions
 import django.test
+from asgiref.sync import sync_to_async
 
 import SORT.test.model_factory
 import SORT.test.test_case
@@ -18,6 +19,7 @@ from survey.models import (
     SurveyImprovementPlanSection,
 )
 from survey.services import SurveyService
+from survey.services.survey import InvalidInviteTokenException
 
 
 class SurveyServiceTestCase(SORT.test.test_case.ServiceTestCase):
@@ -146,12 +148,145 @@ class SurveyServiceTestCase(SORT.test.test_case.ServiceTestCase):
         survey = self.service.get_survey_from_token(token=token)
         self.assertIsInstance(survey, Survey)
 
+    def test_get_survey_from_token_queries(self):
+        token = self.survey.current_invite_token()
+        with self.assertNumQueries(1):
+            self.service.get_survey_from_token(token=token)
+
+    def test_get_survey_from_unknown_token(self):
+        with self.assertNumQueries(1):
+            with self.assertRaises(InvalidInviteTokenException):
+                self.service.get_survey_from_token(token="unknown")
+        # Repeated attempts don't reach the database
+        with self.assertNumQueries(0):
+            with self.assertRaises(InvalidInviteTokenException):
+                self.service.get_survey_from_token(token="unknown")
+
+    def test_get_survey_from_token_after_rotation(self):
+        token = self.survey.current_invite_token()
+        self.service.get_survey_from_token(token=token)
+        new_invitation = self.service.create_invitation(user=self.admin, survey=self.survey)
+
+        with self.assertRaises(InvalidInviteTokenException):
+            self.service.get_survey_from_token(token=token)
+        survey = self.service.get_survey_from_token(token=new_invitation.token)
+        self.assertEqual(survey.pk, self.survey.pk)
+
+    async def test_aget_survey_from_token(self):
+        token = await sync_to_async(self.survey.current_invite_token)()
+        survey = await self.service.aget_survey_from_token(token=token)
+        self.assertEqual(survey.pk, self.survey.pk)
+        with self.assertRaises(InvalidInviteTokenException):
+            await self.service.aget_survey_from_token(token="unknown")
+
+    @django.test.override_settings(SURVEY_SIGNED_INVITATIONS=True)
+    def test_get_survey_from_signed_token(self):
+        invitation = self.service.create_invitation(user=self.admin, survey=self.survey)
+        self.assertIn(":", invitation.token)
+        # Only the survey is loaded, not the invitation
+        with self.assertNumQueries(1):
+            survey = self.service.get_survey_from_token(token=invitation.token)
+        self.assertEqual(survey.pk, self.survey.pk)
+
+    @django.test.override_settings(SURVEY_SIGNED_INVITATIONS=True)
+    def test_get_survey_from_tampered_signed_token(self):
+        invitation = self.service.create_invitation(user=self.admin, survey=self.survey)
+        value, signature = invitation.token.split(":")
+        other_survey = SORT.test.model_factory.SurveyFactory()
+        token = f"{other_survey.pk}.1:{signature}"
+        with self.assertNumQueries(0):
+            with self.assertRaises(InvalidInviteTokenException):
+                self.service.get_survey_from_token(token=token)
+
+    @django.test.override_settings(SURVEY_SIGNED_INVITATIONS=True)
+    def test_get_survey_from_signed_token_after_rotation(self):
+        token = self.service.create_invitation(user=self.admin, survey=self.survey).token
+        new_invitation = self.service.create_invitation(user=self.admin, survey=self.survey)
+
+        with self.assertRaises(InvalidInviteTokenException):
+            self.service.get_survey_from_token(token=token)
+        survey = self.service.get_survey_from_token(token=new_invitation.token)
+        self.assertEqual(survey.pk, self.survey.pk)
+
+    @django.test.override_settings(SURVEY_SIGNED_INVITATIONS=True)
+    def test_saving_older_copy_keeps_signed_tokens_revoked(self):
+        token = self.service.create_invitation(user=self.admin, survey=self.survey).token
+        older_copy = Survey.objects.get(pk=self.survey.pk)
+        new_invitation = self.service.create_invitation(user=self.admin, survey=self.survey)
+
+        # e.g. a survey manager's edit that was loaded before the new invitation
+        older_copy.save()
+
+        with self.assertRaises(InvalidInviteTokenException):
+            self.service.get_survey_from_token(token=token)
+        survey = self.service.get_survey_from_token(token=new_invitation.token)
+        self.assertEqual(survey.pk, self.survey.pk)
+
     def test_accept_response(self):
         self.service.accept_response(
             survey=self.survey, responseValues=json.dumps("[]")
         )
         self.assertTrue(self.survey.survey_response.exists())
 
+    def test_accept_response_repeated_submission_key(self):
+        submission_key = "3f1c6a52-7d0e-4b8e-9a43-1d2f5e6a7b8c"
+        first = self.service.accept_response(
+            survey=self.survey, responseValues=[], submission_key=submission_key
+        )
+        second = self.service.accept_response(
+            survey=self.survey, responseValues=[], submission_key=submission_key
+        )
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(self.survey.survey_response.count(), 1)
+
+    def test_accept_response_malformed_submission_key(self):
+        self.service.accept_response(survey=self.survey, responseValues=[], submission_key="not-a-key")
+        self.service.accept_response(survey=self.survey, responseValues=[], submission_key="not-a-key")
+        self.assertEqual(self.survey.survey_response.count(), 2)
+
+    def test_spool_response_repeated_submission_key(self):
+        submission_key = "3f1c6a52-7d0e-4b8e-9a43-1d2f5e6a7b8c"
+        self.assertIsNotNone(
+            self.service.spool_response(self.survey, "[]", submission_key=submission_key)
+        )
+        self.assertIsNone(
+            self.service.spool_response(self.survey, "[]", submission_key=submission_key)
+        )
+        self.assertEqual(self.survey.spooled_responses.count(), 1)
+
+    def test_accept_responses(self):
+        self.service.initialise_survey(self.admin, self.project, self.survey)
+        valid_answers = self.survey._generate_mock_response()
+        invalid_answers = self.survey._generate_mock_response()
+        del invalid_answers[-1]
+
+        report = self.service.accept_responses(
+            self.admin, self.survey, [valid_answers, invalid_answers, valid_answers]
+        )
+
+        self.assertEqual([row["accepted"] for row in report], [True, False, True])
+        self.assertEqual([row["index"] for row in report], [0, 1, 2])
+        self.assertTrue(report[1]["errors"])
+        self.assertEqual(self.survey.survey_response.count(), 2)
+
+    def test_accept_responses_inactive_survey(self):
+        self.service.initialise_survey(self.admin, self.project, self.survey)
+        self.survey.is_active = False
+        self.survey.save()
+
+        with self.assertRaises(django.core.exceptions.ValidationError):
+            self.service.accept_responses(
+                self.admin, self.survey, [self.survey._generate_mock_response()]
+            )
+        self.assertFalse(self.survey.survey_response.exists())
+
+    def test_accept_responses_unauthorised(self):
+        self.service.initialise_survey(self.admin, self.project, self.survey)
+        with self.assertRaises(django.core.exceptions.PermissionDenied):
+            self.service.accept_responses(
+                self.anonymous_user, self.survey, [self.survey._generate_mock_response()]
+            )
+
     def test_create_invitation(self):
         self.service.create_invitation(user=self.admin, survey=self.survey)
         self.service.create_invitation(user=self.admin, survey=self.survey)
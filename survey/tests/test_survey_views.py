@@ -2,10 +2,15 @@ import json
 from http import HTTPStatus
 from unittest.mock import patch
 
+from asgiref.sync import sync_to_async
+
+import django.core.cache
+import django.test
 import django.urls
 import SORT.test.model_factory
 import SORT.test.test_case
-from survey.models import Invitation
+from survey.models import Invitation, Survey
+from survey.views import SurveyResponseView
 from survey.services import SurveyService
 
 
@@ -19,6 +24,8 @@ class SurveyViewTestCase(SORT.test.test_case.ViewTestCase):
         self.user = self.organisation.members.first()
         self.survey.initialise()
         self.survey.save()
+        # Rendered participant pages are cached by survey ID, which may be reused
+        django.core.cache.cache.clear()
 
     def test_survey_get(self):
         self.get("survey", pk=self.survey.pk)
@@ -91,6 +98,47 @@ class SurveyViewTestCase(SORT.test.test_case.ViewTestCase):
         invitation = Invitation.objects.create(survey=self.survey)
         self.get("survey_response", token=invitation.token)
 
+    def test_survey_response_get_cached(self):
+        invitation = Invitation.objects.create(survey=self.survey)
+        response = self.get("survey_response", token=invitation.token, login=False)
+        etag = response["ETag"]
+        self.assertNotContains(response, SurveyResponseView.CSRF_PLACEHOLDER)
+        self.assertContains(response, '<script id="configData" type="application/json">{"sections":')
+
+        # The participant's browser already has the page
+        url = django.urls.reverse("survey_response", kwargs=dict(token=invitation.token))
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+        # Changing the configuration makes a new page
+        self.survey.update(
+            consent_config=dict(sections=[]),
+            demography_config=self.survey.demography_config_default,
+        )
+        self.survey.save()
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    async def test_survey_response_get_async(self):
+        invitation = await Invitation.objects.acreate(survey=self.survey)
+        url = django.urls.reverse("survey_response", kwargs=dict(token=invitation.token))
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    async def test_survey_response_get_async_without_participant_config(self):
+        # Surveys configured before the participant configuration was stored
+        await Survey.objects.filter(pk=self.survey.pk).aupdate(participant_config=None)
+        invitation = await Invitation.objects.acreate(survey=self.survey)
+        signed_token = await sync_to_async(Invitation.signed_token)(self.survey)
+        for token in (invitation.token, signed_token):
+            with self.subTest(token=token):
+                await django.core.cache.cache.aclear()
+                url = django.urls.reverse("survey_response", kwargs=dict(token=token))
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertContains(response, '<script id="configData" type="application/json">{"sections":')
+
     def test_survey_response_post(self):
         invitation = Invitation.objects.create(survey=self.survey)
         self.post(
@@ -100,6 +148,35 @@ class SurveyViewTestCase(SORT.test.test_case.ViewTestCase):
             expected_status_code=HTTPStatus.FOUND,
         )
 
+    def test_survey_response_post_twice(self):
+        invitation = Invitation.objects.create(survey=self.survey)
+        data = {
+            "value": json.dumps(self.survey._generate_mock_response()),
+            "submission_key": "3f1c6a52-7d0e-4b8e-9a43-1d2f5e6a7b8c",
+        }
+        for _ in range(2):
+            self.post(
+                "survey_response",
+                token=invitation.token,
+                data=data,
+                expected_status_code=HTTPStatus.FOUND,
+            )
+        self.assertEqual(self.survey.survey_response.count(), 1)
+
+    @django.test.override_settings(SURVEY_RESPONSE_SPOOL=True)
+    def test_survey_response_post_spool(self):
+        invitation = Invitation.objects.create(survey=self.survey)
+        value = json.dumps(self.survey._generate_mock_response())
+        self.post(
+            "survey_response",
+            token=invitation.token,
+            data={"value": value},
+            expected_status_code=HTTPStatus.FOUND,
+        )
+        # Stored as received, to be saved later by the drain_responses command
+        self.assertFalse(self.survey.survey_response.exists())
+        self.assertEqual(self.survey.spooled_responses.get().value, value)
+
     def test_survey_response_post_missing_value(self):
         invitation = Invitation.objects.create(survey=self.survey)
         url = django.urls.reverse("survey_response", kwargs={"token": invitation.token})
@@ -122,6 +199,40 @@ class SurveyViewTestCase(SORT.test.test_case.ViewTestCase):
         self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
         self.assertTemplateUsed(response, "survey/survey_response_submission_error.html")
 
+    def test_survey_bulk_responses_post(self):
+        self.login()
+        valid_answers = self.survey._generate_mock_response()
+        url = django.urls.reverse("survey_bulk_responses", kwargs={"pk": self.survey.pk})
+        response = self.client.post(
+            url,
+            data=json.dumps([valid_answers, [], valid_answers]),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        report = response.json()
+        self.assertEqual(report["accepted"], 2)
+        self.assertEqual(report["rejected"], 1)
+        self.assertFalse(report["results"][1]["accepted"])
+        self.assertEqual(self.survey.survey_response.count(), 2)
+
+    def test_survey_bulk_responses_post_invalid_json(self):
+        self.login()
+        url = django.urls.reverse("survey_bulk_responses", kwargs={"pk": self.survey.pk})
+        for body in ("not-valid-json", json.dumps({"answers": []})):
+            with self.subTest(body=body):
+                response = self.client.post(url, data=body, content_type="application/json")
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertFalse(self.survey.survey_response.exists())
+
+    def test_survey_bulk_responses_post_unauthorised(self):
+        # Redirect to login page (302)
+        self.post(
+            "survey_bulk_responses",
+            pk=self.survey.pk,
+            login=False,
+            expected_status_code=HTTPStatus.FOUND,
+        )
+
     def test_survey_link_invalid(self):
         self.get("survey_link_invalid")
 
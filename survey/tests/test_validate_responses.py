@@ -0,0 +1,102 @@
+import concurrent.futures
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase
+
+from SORT.test.model_factory import SurveyFactory
+from survey.models import SurveyResponse
+
+
+class TestValidateResponses(TestCase):
+    def setUp(self):
+        self.survey = SurveyFactory()
+        self.survey.initialise()
+        self.survey.save()
+        self.survey.generate_mock_responses(num_responses=5)
+        self.checkpoint = Path(tempfile.mkdtemp()).joinpath("checkpoint.json")
+
+    def validate_responses(self, *args, **kwargs) -> dict:
+        stdout = io.StringIO()
+        call_command(
+            "validate_responses", *args, "--json", survey_id=self.survey.pk, stdout=stdout, stderr=io.StringIO(),
+            **kwargs
+        )
+        return json.loads(stdout.getvalue())
+
+    def test_valid(self):
+        SurveyResponse.objects.update(is_valid=None, validated_config_version=None)
+
+        summary = self.validate_responses(chunk_size=2)
+
+        self.assertEqual(summary["responses"], 5)
+        self.assertEqual(summary["invalid"], 0)
+        self.assertEqual(summary["surveys"][str(self.survey.pk)], dict(responses=5, invalid=0))
+        self.assertFalse(SurveyResponse.objects.exclude(is_valid=True).exists())
+
+    def test_invalid(self):
+        answers = self.survey._generate_mock_response()
+        del answers[-1]
+        SurveyResponse.objects.create(survey=self.survey, answers=answers)
+
+        with self.assertRaises(SystemExit):
+            self.validate_responses()
+
+    def test_stale(self):
+        self.assertEqual(self.validate_responses("--stale")["responses"], 0)
+
+    def test_resume_from_checkpoint(self):
+        primary_keys = list(self.survey.survey_response.order_by("pk").values_list("pk", flat=True))
+        self.checkpoint.write_text(json.dumps(dict(surveys={str(self.survey.pk): primary_keys[1]})))
+
+        summary = self.validate_responses(chunk_size=2, checkpoint=self.checkpoint)
+
+        self.assertEqual(summary["responses"], 3)
+        self.assertEqual(
+            json.loads(self.checkpoint.read_text()),
+            dict(surveys={str(self.survey.pk): primary_keys[-1]}),
+        )
+
+    def test_workers(self):
+        SurveyResponse.objects.update(is_valid=None, validated_config_version=None)
+        events = list()
+
+        class InlineExecutor(concurrent.futures.Executor):
+            """
+            Runs each chunk as it's submitted, in place of the worker processes, which
+            can't see the test database. Like the real pool, it "forks" on the first chunk.
+            """
+
+            def __init__(self, max_workers, mp_context, initializer):
+                self.initializer = initializer
+                self.forked = False
+
+            def submit(self, fn, /, *args, **kwargs):
+                if not self.forked:
+                    events.append("fork")
+                    self.forked = True
+                    self.initializer()
+                future = concurrent.futures.Future()
+                future.set_result(fn(*args, **kwargs))
+                return future
+
+        def record_query(execute, *args):
+            events.append("query")
+            return execute(*args)
+
+        with (
+            patch("concurrent.futures.ProcessPoolExecutor", InlineExecutor),
+            patch.object(connections, "close_all", lambda: events.append("close")),
+            connection.execute_wrapper(record_query),
+        ):
+            summary = self.validate_responses(chunk_size=2, workers=2)
+
+        self.assertEqual(summary["responses"], 5)
+        self.assertFalse(SurveyResponse.objects.exclude(is_valid=True).exists())
+        # Nothing is read between closing the connections and forking the workers
+        self.assertEqual(events[events.index("fork") - 1], "close")
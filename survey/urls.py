@@ -94,6 +94,11 @@ urlpatterns = [
         views.SurveyReportView.as_view(),
         name="survey_report",
     ),
+    path(
+        "survey/<int:pk>/report/filter",
+        views.SurveyReportFilterView.as_view(),
+        name="survey_report_filter",
+    ),
     path(
         "survey/create/<int:project_id>",
         views.SurveyCreateView.as_view(),
@@ -120,6 +125,11 @@ urlpatterns = [
         views.SurveyResponseView.as_view(),
         name="survey_response",
     ),
+    path(
+        "survey/<int:pk>/responses/bulk",
+        views.SurveyBulkResponseView.as_view(),
+        name="survey_bulk_responses",
+    ),
     path(
         "survey_link_invalid/",
         views.SurveyLinkInvalidView.as_view(),
@@ -1,17 +1,27 @@
+import hashlib
 import json
 import logging
 import mimetypes
 import os.path
 
 import django.core.mail
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
 from django.core.files.uploadhandler import UploadFileException
-from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from django.db.models import Prefetch
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.context_processors import csrf
+from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
 from django.views import View
 from django.views.generic import (
@@ -33,10 +43,12 @@ from .models import (
     SurveyEvidenceFile,
     SurveyEvidenceSection,
     SurveyImprovementPlanSection,
+    SurveyReportSnapshot,
     SurveyResponse,
 )
 from .services.survey import InvalidInviteTokenException
 from .exceptions import SurveyInactiveError
+from .registry import data_files
 
 logger = logging.getLogger(__name__)
 
@@ -261,10 +273,7 @@ class SurveyEvidenceGatheringView(LoginRequiredMixin, View):
 
         context = {
             "survey": survey,
-            "responses": [
-                response.answers
-                for response in SurveyResponse.objects.filter(survey=survey)
-            ],
+            "survey_stats": survey.report_data()["survey_stats"],
             "evidence_section": evidence_section,
             "section_config": survey.survey_config["sections"][
                 evidence_section.section_id
@@ -378,10 +387,7 @@ class SurveyImprovementPlanView(LoginRequiredMixin, View):
 
         context = {
             "survey": survey,
-            "responses": [
-                response.answers
-                for response in SurveyResponse.objects.filter(survey=survey)
-            ],
+            "survey_stats": survey.report_data()["survey_stats"],
             "evidence_section": evidence_section,
             "improve_section": improve_section,
             "sections": improve_sections,
@@ -427,7 +433,9 @@ class SurveyReportView(LoginRequiredMixin, View):
             e_section.section_id: e_section
             for e_section in SurveyEvidenceSection.objects.filter(
                 survey=survey
-            ).order_by("section_id")
+            ).order_by("section_id").prefetch_related(
+                Prefetch("files", queryset=SurveyEvidenceFile.objects.order_by("pk"))
+            )
         }
         improve_sections = {
             i_section.section_id: i_section
@@ -446,6 +454,22 @@ class SurveyReportView(LoginRequiredMixin, View):
                 }
             )
 
+        # The figures of a closed survey can't change, so if the reader's browser already
+        # has this page and the evidence hasn't changed, it needn't be sent again. Flash
+        # messages are only shown once, so a page with them is always sent.
+        snapshot = survey.report_snapshot()
+        etag = None
+        if snapshot is not None and not messages.get_messages(request):
+            etag = self.snapshot_etag(request, survey, snapshot, sections)
+            if (
+                request.headers.get("If-None-Match") == etag
+                and settings.CSRF_COOKIE_NAME in request.COOKIES
+            ):
+                response = HttpResponse(status=304)
+                response["ETag"] = etag
+                response["Cache-Control"] = "private, no-cache"
+                return response
+
         # files_list = []
         # for file in evidence_section.files.all():
         #     delete_url = reverse("survey_evidence_remove_file", kwargs={"pk": file.pk})
@@ -457,58 +481,125 @@ class SurveyReportView(LoginRequiredMixin, View):
         #     })
 
         # Response descriptions
-        with open("data/readiness_descriptions/matrix.json") as file:
-            readiness_descriptions: list[list[str]] = list(json.load(file))
-
-        # Report figures are calculated in the browser from these raw answers. Answers
-        # that predate response schema validation, or that were stored before the survey
-        # configuration changed, may not line up with the questions; the front end skips
-        # what it cannot use, so warn the reader that the figures are incomplete.
-        answers = list()
-        invalid_response_count = 0
-        for response in SurveyResponse.objects.filter(survey=survey):
-            answers.append(response.answers)
-            try:
-                response.validate()
-            except ValidationError:
-                invalid_response_count += 1
-                logger.warning(
-                    "Survey %s response %s does not match the survey configuration",
-                    survey.pk,
-                    response.pk,
-                )
+        readiness_descriptions = data_files.readiness_descriptions
+
+        # Report figures for the whole survey are kept up to date as responses are saved,
+        # and figures for some of the responses are fetched from SurveyReportFilterView
+        # when the reader filters them. Answers that predate response schema validation,
+        # or that were stored before the survey configuration changed, may not line up
+        # with the questions; they are left out, so warn the reader that the figures are
+        # incomplete.
+        # The figures are cached, and shared with the evidence gathering and improvement
+        # plan pages, until responses are added or the configuration changes.
+        report_data = survey.report_data()
+        invalid_response_count = report_data["invalid_response_count"]
+        if invalid_response_count:
+            logger.warning(
+                "Survey %s has %s responses that do not match the survey configuration",
+                survey.pk,
+                invalid_response_count,
+            )
 
         context = {
             "survey": survey,
-            "responses": answers,
-            "response_count": len(answers),
+            "response_count": report_data["response_count"],
+            "valid_response_count": report_data["response_count"] - invalid_response_count,
             "invalid_response_count": invalid_response_count,
+            "survey_stats": report_data["survey_stats"],
+            "filter_options": survey.report_filter_options(),
             "sections": sections,
             "csrf": str(csrf(self.request)["csrf_token"]),
             "readiness_descriptions": readiness_descriptions,
         }
 
-        return render(request, "survey/report.html", context)
+        response = render(request, "survey/report.html", context)
+        if etag is not None:
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+    @staticmethod
+    def snapshot_etag(
+        request: HttpRequest, survey: Survey, snapshot: SurveyReportSnapshot, sections: list[dict]
+    ) -> str:
+        """
+        Identifies the report page of a closed survey, as seen by this user: its
+        figures, and the parts of the page that can still be edited, including the
+        evidence files.
+        """
+        digest = hashlib.sha256(f"{snapshot.etag}:{request.user.pk}".encode())
+        digest.update(json.dumps([survey.name, survey.description]).encode())
+        for section in sections:
+            evidence, improvement = section["evidence"], section["improvement"]
+            files = [(file.pk, file.file.name) for file in evidence.files.all()] if evidence else []
+            digest.update(
+                json.dumps([getattr(evidence, "text", None), files, getattr(improvement, "plan", None)]).encode()
+            )
+        return '"{}"'.format(digest.hexdigest()[:32])
+
+
+class SurveyReportFilterView(LoginRequiredMixin, View):
+    """
+    The report statistics of only the responses that match some filters.
+
+    The request body is a JSON object with a list of filters, as described in
+    ResponseIndex.select(), which must all match.
+    """
+
+    def post(self, request: HttpRequest, pk: int):
+        survey = survey_service.get_survey(request.user, pk)
+
+        try:
+            filters = json.loads(request.body).get("filters", [])
+        except (json.JSONDecodeError, AttributeError):
+            return JsonResponse(
+                dict(error="Request body must be a JSON object"), status=400
+            )
+
+        response_index = survey.response_index()
+        try:
+            selection = response_index.select(filters)
+        except ValueError as error:
+            return JsonResponse(dict(error=str(error)), status=400)
+
+        return JsonResponse(
+            dict(
+                response_count=selection.bit_count(),
+                survey_stats=response_index.stats(selection),
+            )
+        )
 
 
 class SurveyResponseView(View):
     """
     Participant's view of the survey. This view renders the survey configuration
     allowing participant to fill in the survey form and send it for processing.
+
+    Every participant gets the same page for a given survey configuration, so it is
+    rendered once per configuration version and cached, with each participant's CSRF
+    token filled in afterwards.
+
+    The view is asynchronous, so under ASGI (see SORT/asgi.py) a worker can wait on
+    many slow participant connections at once.
     """
 
-    def get(self, request: HttpRequest, token: str):
-        return self.render_survey_response_page(request, token, is_post=False)
+    #: Seconds to keep a rendered participant page
+    PAGE_CACHE_TIMEOUT = 60 * 60
+    #: Stands in for the CSRF token in a cached page
+    CSRF_PLACEHOLDER = "__sort_csrf_token__"
+
+    async def get(self, request: HttpRequest, token: str):
+        return await self.render_survey_response_page(request, token, is_post=False)
 
-    def post(self, request: HttpRequest, token: str):
-        return self.render_survey_response_page(request, token, is_post=True)
+    async def post(self, request: HttpRequest, token: str):
+        return await self.render_survey_response_page(request, token, is_post=True)
 
-    def render_survey_response_page(
+    async def render_survey_response_page(
             self, request: HttpRequest, token: str, is_post: bool
     ):
 
         try:
-            survey = survey_service.get_survey_from_token(token)
+            survey = await survey_service.aget_survey_from_token(token)
             if not survey.is_active:
                 raise SurveyInactiveError("Survey is not active.")
 
@@ -521,7 +612,7 @@ class SurveyResponseView(View):
                         "Survey submission missing 'value' field: token=%s survey_id=%s",
                         token, survey.pk,
                     )
-                    return render(
+                    return await sync_to_async(render)(
                         request,
                         "survey/survey_response_submission_error.html",
                         status=400,
@@ -534,20 +625,28 @@ class SurveyResponseView(View):
                         "Survey submission contained invalid JSON: token=%s survey_id=%s",
                         token, survey.pk,
                     )
-                    return render(
+                    return await sync_to_async(render)(
                         request,
                         "survey/survey_response_submission_error.html",
                         status=400,
                     )
 
+                submission_key = request.POST.get("submission_key")
                 try:
-                    survey_service.accept_response(survey, responseValues)
+                    if settings.SURVEY_RESPONSE_SPOOL:
+                        await sync_to_async(survey_service.spool_response)(
+                            survey, request.POST["value"], submission_key=submission_key
+                        )
+                    else:
+                        await sync_to_async(survey_service.accept_response)(
+                            survey, responseValues, submission_key=submission_key
+                        )
                 except Exception:
                     logger.exception(
                         "Failed to save survey response: token=%s survey_id=%s",
                         token, survey.pk,
                     )
-                    return render(
+                    return await sync_to_async(render)(
                         request,
                         "survey/survey_response_submission_error.html",
                         status=500,
@@ -555,10 +654,14 @@ class SurveyResponseView(View):
 
                 return redirect("completion_page")
 
+            # Flash messages are specific to this participant
+            if not await sync_to_async(self.has_messages)(request):
+                return await self.cached_survey_response_page(request, survey)
+
             context["survey"] = survey
             context["csrf"] = str(csrf(self.request)["csrf_token"])
 
-            return render(
+            return await sync_to_async(render)(
                 request=request,
                 template_name="survey/survey_response.html",
                 context=context,
@@ -570,6 +673,82 @@ class SurveyResponseView(View):
         except SurveyInactiveError:
             return redirect("survey_response_inactive")
 
+    @staticmethod
+    def has_messages(request: HttpRequest) -> bool:
+        """
+        Are there flash messages to show? These are stored in the session.
+        """
+        return bool(messages.get_messages(request))
+
+    async def cached_survey_response_page(self, request: HttpRequest, survey: Survey):
+        """
+        Serve the participant page from the cache, or a 304 Not Modified response if
+        the participant's browser already has it.
+        """
+        key = f"survey_response_page:{survey.pk}:{survey.config_version}"
+        page = await cache.aget(key)
+        if page is None:
+            # Loading and rendering the template blocks, and may touch the database
+            body = await sync_to_async(render_to_string)(
+                "survey/survey_response.html",
+                context=dict(survey=survey, csrf=self.CSRF_PLACEHOLDER),
+            )
+            etag = '"{}"'.format(hashlib.sha256(body.encode()).hexdigest()[:32])
+            page = (etag, body)
+            await cache.aset(key, page, timeout=self.PAGE_CACHE_TIMEOUT)
+        etag, body = page
+
+        # A cached page holds a CSRF token that only matches the participant's own cookie
+        if (
+            request.headers.get("If-None-Match") == etag
+            and settings.CSRF_COOKIE_NAME in request.COOKIES
+        ):
+            response = HttpResponse(status=304)
+        else:
+            csrf_token = str(csrf(request)["csrf_token"])
+            response = HttpResponse(body.replace(self.CSRF_PLACEHOLDER, csrf_token))
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class SurveyBulkResponseView(LoginRequiredMixin, View):
+    """
+    Submit many responses to a survey at once, such as paper returns or replayed
+    kiosk submissions.
+
+    The request body is a JSON array with the answers of one response per item. The
+    reply lists, for each item in order, whether it was accepted and why not.
+    """
+
+    def post(self, request: HttpRequest, pk: int):
+        survey = survey_service.get_survey(request.user, pk)
+
+        try:
+            batch = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse(
+                dict(error="Request body is not valid JSON"), status=400
+            )
+        if not isinstance(batch, list):
+            return JsonResponse(
+                dict(error="Request body must be a list of responses"), status=400
+            )
+
+        try:
+            report = survey_service.accept_responses(request.user, survey, batch)
+        except SurveyInactiveError as error:
+            return JsonResponse(dict(error=error.message), status=400)
+
+        accepted = sum(1 for row in report if row["accepted"])
+        logger.info(
+            "Bulk submission to survey %s: %s accepted, %s rejected",
+            survey.pk, accepted, len(report) - accepted,
+        )
+        return JsonResponse(
+            dict(accepted=accepted, rejected=len(report) - accepted, results=report)
+        )
+
 
 class SurveyLinkInvalidView(View):
     """
@@ -649,6 +828,7 @@ class SurveyActivateView(LoginRequiredMixin, DetailView):
         """
         self.object.is_active = True
         self.object.save()
+        self.object.report_snapshots.all().delete()
 
     def post(self, request, *args, **kwargs):
         """
@@ -674,6 +854,8 @@ class SurveyDeactivateView(LoginRequiredMixin, DetailView):
     def deactivate(self):
         self.object.is_active = False
         self.object.save()
+        # The report can't change until the survey is reopened
+        self.object.freeze_report()
 
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
@@ -130,3 +130,31 @@ export type SurveyStats = {
 
 
 
+
+/**
+ * Chooses responses by their answer to a demographic question: those that chose any of
+ * the options, or those with a number between min and max
+ */
+export type ResponseFilter = {
+    section: number;
+    field: number;
+    options?: string[];
+    min?: number;
+    max?: number;
+}
+
+/**
+ * A demographic question that the report can be filtered by, as listed by the server,
+ * with the options to choose from or the range of numbers given
+ */
+export type FilterOption = ResponseFilter & {
+    label: string;
+}
+
+/**
+ * The report statistics of only the responses that match some filters
+ */
+export type FilteredStats = {
+    response_count: number;
+    survey_stats: SurveyStats | null;
+}
@@ -1,5 +1,11 @@
 import {mount} from 'svelte'
-import {type FileDescriptionType, type SurveyConfig, type SurveyResponseBatch} from "./lib/interfaces.ts"
+import {
+    type FileDescriptionType,
+    type FilterOption,
+    type SurveyConfig,
+    type SurveyResponseBatch,
+    type SurveyStats
+} from "./lib/interfaces.ts"
 import {generateStatsFromSurveyResponses, getDataInElem} from "./lib/misc.svelte.js";
 import SmartTable from "./lib/components/SmartTable.svelte";
 import SurveyConfigConsentDemographyApp from "./SurveyConfigConsentDemographyApp.svelte";
@@ -124,8 +130,11 @@ mapMatchedElement(".sort-response-section-viewer", (elem) => {
     // Readiness descriptions for just this section (levels 0 to 4)
     const readinessDescriptions = readinessDescriptionsAllSections[sectionIndex - 1];
     const config = getDataInElem(configId, EMPTY_SURVEY_CONFIG) as SurveyConfig;
-    const responses: SurveyResponseBatch = getDataInElem(responsesId, []) as [];
-    const surveyStats = generateStatsFromSurveyResponses(config, responses);
+    // Statistics calculated by the server, if given, otherwise from the responses
+    const statsId = elem.dataset.jsonStatsId;
+    const surveyStats = statsId ?
+        getDataInElem(statsId, null) as SurveyStats | null :
+        generateStatsFromSurveyResponses(config, getDataInElem(responsesId, []) as SurveyResponseBatch);
     const useBarChart = elem.dataset.useBarChart === 'true'; // Convert string to boolean
     mount(SurveySectionDataView, {
         target: elem,
@@ -156,16 +165,18 @@ mapMatchedElement(".sort-response-summary-matrix", (elem) => {
 
 mapMatchedElement(".sort-report-app", (elem) => {
     const configId = elem.dataset.jsonConfigId;
-    const responsesId = elem.dataset.jsonResponsesId;
-    const csvUrl = elem.dataset.csvUrl ?? "";
-    const excelUrl = elem.dataset.excelUrl ?? "";
     const config = getDataInElem(configId, EMPTY_SURVEY_CONFIG) as SurveyConfig;
-    const responses: SurveyResponseBatch = getDataInElem(responsesId, []) as [];
+    const surveyStats = getDataInElem(elem.dataset.jsonStatsId, null) as SurveyStats | null;
+    const filterOptions = getDataInElem(elem.dataset.jsonFilterOptionsId, []) as FilterOption[];
     mount(SurveyReportApp, {
         target: elem,
         props: {
             config: config,
-            responses: responses
+            surveyStats: surveyStats,
+            responseCount: Number(elem.dataset.responseCount ?? 0),
+            filterOptions: filterOptions,
+            filterUrl: elem.dataset.filterUrl ?? "",
+            csrf: csrf
         }
     });
 });